@@ -3,14 +3,25 @@ OpenTestability - Gate-Level Testability Analysis Framework
 
 A comprehensive Python framework for analyzing testability in gate-level digital designs.
 Supports SCOAP metrics, reconvergent fanout detection, and visualization.
+
+Submodules are imported on first access, so importing the package (or a
+light module such as utils.file_utils) does not load networkx, numpy or
+pygraphviz.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "OpenTestability Contributors"
 
-from .core import scoap, dag_builder, reconvergence
-from .parsers import verilog_parser, json_converter
-from .visualization import graph_renderer
+_SUBMODULES = {
+    'scoap': '.core.scoap',
+    'dag_builder': '.core.dag_builder',
+    'reconvergence': '.core.reconvergence',
+    'verilog_parser': '.parsers.verilog_parser',
+    'json_converter': '.parsers.json_converter',
+    'graph_renderer': '.visualization.graph_renderer',
+}
 
 __all__ = [
     'scoap',
@@ -19,4 +30,16 @@ __all__ = [
     'verilog_parser',
     'json_converter',
     'graph_renderer'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module = importlib.import_module(_SUBMODULES[name], __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,18 +3,59 @@ Core testability analysis algorithms.
 
 This module contains the main algorithms for:
 - SCOAP (Sandia Controllability/Observability Analysis Program)
+- Incremental SCOAP updates after netlist edits (ECO)
 - DAG construction and manipulation
-- Reconvergent fanout detection
+- Reconvergent fanout detection, optionally sharded over worker processes
+- Compact integer-indexed netlist representation
+- Compiled cell-library gate models
+- Memory-mapped binary SCOAP result store
+- Top-K and predicate queries over SCOAP metrics
+
+Names are resolved on first access, so reconvergence (networkx) and
+scoap_query (numpy) are only imported when used.
 """
 
-from .scoap import run as run_scoap
-from .dag_builder import build_dag, save_dag_json
-from .reconvergence import find_reconvergences, save_reconvergence
+import importlib
+
+_EXPORTS = {
+    'run_scoap': ('.scoap', 'run'),
+    'IncrementalScoap': ('.incremental_scoap', 'IncrementalScoap'),
+    'build_dag': ('.dag_builder', 'build_dag'),
+    'save_dag_json': ('.dag_builder', 'save_dag_json'),
+    'find_reconvergences': ('.reconvergence', 'find_reconvergences'),
+    'iter_reconvergences': ('.reconvergence', 'iter_reconvergences'),
+    'save_reconvergence': ('.reconvergence', 'save_reconvergence'),
+    'CompactNetlist': ('.netlist', 'CompactNetlist'),
+    'CompactGraph': ('.netlist', 'CompactGraph'),
+    'CellLibrary': ('.cell_library', 'CellLibrary'),
+    'ScoapStore': ('.scoap_store', 'ScoapStore'),
+    'MetricTable': ('.scoap_query', 'MetricTable'),
+}
 
 __all__ = [
     'run_scoap',
+    'IncrementalScoap',
     'build_dag',
     'save_dag_json', 
     'find_reconvergences',
-    'save_reconvergence'
-]
\ No newline at end of file
+    'iter_reconvergences',
+    'save_reconvergence',
+    'CompactNetlist',
+    'CompactGraph',
+    'CellLibrary',
+    'ScoapStore',
+    'MetricTable'
+]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module, attr = _EXPORTS[name]
+        value = getattr(importlib.import_module(module, __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
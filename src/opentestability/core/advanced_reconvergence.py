@@ -9,6 +9,12 @@ This is a CORRECTED implementation that properly follows the paper's methodology
 - Accurate RFOBL (Reconvergent Fanout Branch List) with intersection
 - Algorithm I: Basic reconvergence detection with topological processing
 - Algorithm II: RFOBL reduction for false positive elimination
+
+Two FOBL encodings are available (FOBL_ENCODINGS): 'object' keeps one
+FOBLEntry per branch and node, and 'bitset' (the default) maps every branch
+to a bit of a Python int, so unions are bitwise ORs and path counts are only
+computed for branches that end up in a reconvergent pair. Both produce
+identical results.
 """
 
 import json
@@ -19,6 +25,10 @@ import networkx as nx
 from pathlib import Path
 
 from ..utils.file_utils import get_project_paths, ensure_directory
+from ..utils import profiling
+from .netlist import CompactGraph
+
+FOBL_ENCODINGS = ('bitset', 'object')
 
 
 class FanoutBranch:
@@ -234,6 +244,47 @@ class RFOBL:
         return f"RFOBL({', '.join(str(p) for p in self.pairs.values())})"
 
 
+class BitsetFOBL:
+    """
+    Fanout Branch List encoded as bit sets.
+
+    Entries inherited from predecessors are the bits of `inherited`; the
+    entries added at the node itself (fanout branches targeting it, or the
+    node name for a primary input) are listed in `added` as (bit, source)
+    in insertion order, where source is what FOBL.add_entry would receive.
+    As with FOBL.union, an inherited entry's stem is its own branch id, and
+    only entries added at the node keep the stem of their fanout branch.
+    Path counts live outside the list (see BitsetReconvergenceDetector).
+    """
+
+    __slots__ = ('inherited', 'added', 'bits')
+
+    def __init__(self, inherited: int = 0, added: Tuple = ()):
+        self.inherited = inherited
+        self.added = added
+        self.bits = inherited
+        for bit, _ in added:
+            self.bits |= 1 << bit
+
+    def has_bit(self, bit: int) -> bool:
+        """Check if the entry with this bit is in the list."""
+        return self.bits >> bit & 1 == 1
+
+    def direct(self) -> List[Tuple[int, Union[FanoutBranch, str]]]:
+        """Entries added at this node that were not also inherited."""
+        return [(bit, source) for bit, source in self.added if not self.inherited >> bit & 1]
+
+    def is_empty(self) -> bool:
+        """Check if FOBL is empty."""
+        return self.bits == 0
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __repr__(self):
+        return f"BitsetFOBL({len(self)} entries, {len(self.added)} added)"
+
+
 class AdvancedReconvergenceDetector:
     """
     Complete implementation of the Xu & Edirisuriya (2004) reconvergent fanout detection algorithm.
@@ -254,10 +305,12 @@ class AdvancedReconvergenceDetector:
     - Circuits with sophisticated fanout structures
     """
     
-    def __init__(self, dag_data: dict):
+    def __init__(self, dag_data: dict, compact: CompactGraph = None):
         self.dag_data = dag_data
+        self.compact = compact or CompactGraph.from_dag_data(dag_data)
         self.graph = self._build_graph()
         self.fanout_branches: Dict[str, FanoutBranch] = {}
+        self.branch_by_edge: Dict[Tuple[str, str], FanoutBranch] = {}
         self.fobl: Dict[str, FOBL] = {}
         self.rfobl: Dict[str, RFOBL] = {}
         self.reach_count: Dict[str, int] = {}
@@ -266,10 +319,8 @@ class AdvancedReconvergenceDetector:
         self._initialize_reach_counts()
     
     def _build_graph(self) -> nx.DiGraph:
-        """Build NetworkX graph from DAG data."""
-        G = nx.DiGraph()
-        G.add_edges_from(self.dag_data['edges'])
-        return G
+        """Build NetworkX graph from the compact graph."""
+        return self.compact.to_networkx()
     
     def _identify_fanout_branches(self):
         """
@@ -278,14 +329,16 @@ class AdvancedReconvergenceDetector:
         """
         print("[DEBUG] Identifying fanout branches...")
         
-        for node in self.graph.nodes:
-            successors = list(self.graph.successors(node))
-            if len(successors) > 1:
-                # This is a fanout point - create branches for each output
-                for i, successor in enumerate(successors):
-                    branch = FanoutBranch(node, i, successor)
-                    self.fanout_branches[branch.branch_id] = branch
-                    print(f"[DEBUG] Created fanout branch: {branch.branch_id} ({node} -> {successor})")
+        names = self.compact.node_names
+        for n in self.compact.fanout_points():
+            node = names[n]
+            # This is a fanout point - create branches for each output
+            for i, s in enumerate(self.compact.successors(n)):
+                successor = names[s]
+                branch = FanoutBranch(node, i, successor)
+                self.fanout_branches[branch.branch_id] = branch
+                self.branch_by_edge[(node, successor)] = branch
+                print(f"[DEBUG] Created fanout branch: {branch.branch_id} ({node} -> {successor})")
         
         print(f"[DEBUG] Total fanout branches identified: {len(self.fanout_branches)}")
     
@@ -315,6 +368,7 @@ class AdvancedReconvergenceDetector:
         # Union all input FOBLs
         for input_node in input_nodes:
             self.fobl[node] = self.fobl[node].union(self.fobl[input_node])
+        profiling.add('advanced.fobl_unions', len(input_nodes))
         
         # CRITICAL CORRECTION: Add fanout branches that TARGET this node
         # A fanout branch should appear in FOBL of its target node
@@ -329,10 +383,7 @@ class AdvancedReconvergenceDetector:
     
     def _find_fanout_branch(self, source_node: str, target_node: str) -> Optional[FanoutBranch]:
         """Find the fanout branch that connects source to target."""
-        for branch in self.fanout_branches.values():
-            if branch.stem_node == source_node and branch.target_node == target_node:
-                return branch
-        return None
+        return self.branch_by_edge.get((source_node, target_node))
     
     def build_rfobls(self, node: str):
         """
@@ -348,6 +399,7 @@ class AdvancedReconvergenceDetector:
             return
         
         # Find intersections between all pairs of input FOBLs
+        profiling.add('advanced.fobl_intersections', len(input_nodes) * (len(input_nodes) - 1) // 2)
         for i in range(len(input_nodes)):
             for j in range(i + 1, len(input_nodes)):
                 intersection_result = RFOBL().intersection(
@@ -405,10 +457,12 @@ class AdvancedReconvergenceDetector:
         print("[🔬] Running Complete Paper Algorithm...")
         
         # Execute Algorithm I
-        self.run_algorithm_i()
+        with profiling.span('advanced.algorithm_i'):
+            self.run_algorithm_i()
         
         # Collect results
-        results = self._collect_results()
+        with profiling.span('advanced.collect'):
+            results = self._collect_results()
         
         print(f"[✅] Complete algorithm finished. Found {len(results['reconvergences'])} reconvergent sites.")
         return results
@@ -456,7 +510,190 @@ class AdvancedReconvergenceDetector:
         }
 
 
-def analyze_with_advanced_reconvergence(dag_filename: str, output_filename: str = None, output_directory: Path = None) -> str:
+class BitsetReconvergenceDetector(AdvancedReconvergenceDetector):
+    """
+    Xu & Edirisuriya detector with bitset-encoded FOBLs.
+
+    Branch ids and primary input names are numbered in sorted order, so a
+    FOBL union is an OR of Python ints and no per-entry objects are created
+    while Algorithm I walks the circuit. Path counts are computed on demand,
+    and memoized per node, only for entries that take part in a reconvergent
+    pair. Entry order and the RFOBL overwrite behaviour of the object-based
+    FOBL are reproduced, so the results are identical.
+    """
+
+    def _initialize_reach_counts(self):
+        """Initialize reach counters, bit numbering and empty lists for each node."""
+        ids = set(self.fanout_branches)
+        ids.update(n for n in self.graph.nodes if self.graph.in_degree(n) == 0)
+        self.entry_ids = sorted(ids)
+        self.bit_of = {entry_id: bit for bit, entry_id in enumerate(self.entry_ids)}
+        self.predecessors: Dict[str, List[str]] = {}
+        self.path_counts: Dict[str, Dict[int, int]] = {}
+        for node in self.graph.nodes:
+            self.predecessors[node] = list(self.graph.predecessors(node))
+            self.reach_count[node] = len(self.predecessors[node])
+            self.fobl[node] = BitsetFOBL()
+            self.rfobl[node] = RFOBL()
+            self.path_counts[node] = {}
+
+    def build_fobls(self, node: str):
+        """Build the FOBL of a node: OR of the input FOBLs plus branches targeting it."""
+        input_nodes = self.predecessors[node]
+        if not input_nodes:
+            self.fobl[node] = BitsetFOBL(0, ((self.bit_of[node], node),))
+            return
+
+        inherited = 0
+        added = []
+        for input_node in input_nodes:
+            inherited |= self.fobl[input_node].bits
+            fanout_branch = self.branch_by_edge.get((input_node, node))
+            if fanout_branch:
+                added.append((self.bit_of[fanout_branch.branch_id], fanout_branch))
+        profiling.add('advanced.fobl_unions', len(input_nodes))
+        self.fobl[node] = BitsetFOBL(inherited, tuple(added))
+
+    def build_rfobls(self, node: str):
+        """Build the RFOBL of a node from the pairwise intersections of its input FOBLs."""
+        input_nodes = self.predecessors[node]
+        if len(input_nodes) < 2:
+            return
+
+        profiling.add('advanced.fobl_intersections', len(input_nodes) * (len(input_nodes) - 1) // 2)
+        rfobl = self.rfobl[node]
+        for i in range(len(input_nodes)):
+            for j in range(i + 1, len(input_nodes)):
+                for entry1, entry2 in self._intersection(input_nodes[i], input_nodes[j]):
+                    rfobl.add_pair(entry1, entry2)
+
+        if not rfobl.is_empty():
+            print(f"[DEBUG] Node {node}: RFOBL = {rfobl}")
+        else:
+            print(f"[DEBUG] Node {node}: No reconvergences found despite {len(input_nodes)} inputs")
+
+    def _intersection(self, node1: str, node2: str) -> List[Tuple[FOBLEntry, FOBLEntry]]:
+        """
+        Pairs RFOBL.intersection finds between the FOBLs of two nodes.
+
+        Inherited entries have their own id as stem, so two of them never
+        pair; every pair has an entry added at node1 or node2 whose stem is
+        either the stem of an added entry or the id of an inherited one.
+
+        Returns:
+            (entry from node1, entry from node2) pairs in the order the
+            object-based intersection visits them
+        """
+        fobl1, fobl2 = self.fobl[node1], self.fobl[node2]
+        direct1, direct2 = fobl1.direct(), fobl2.direct()
+        if not direct1 and not direct2:
+            return []
+
+        found = []
+        for bit2, source2 in direct2:
+            stem = _stem(source2)
+            for bit1, source1 in direct1:
+                if bit1 != bit2 and _stem(source1) == stem:
+                    found.append((bit1, bit2, source1, source2))
+            bit1 = self.bit_of.get(stem)
+            if bit1 is not None and bit1 != bit2 and fobl1.inherited >> bit1 & 1:
+                found.append((bit1, bit2, stem, source2))
+        for bit1, source1 in direct1:
+            stem = _stem(source1)
+            bit2 = self.bit_of.get(stem)
+            if bit2 is not None and bit2 != bit1 and fobl2.inherited >> bit2 & 1:
+                found.append((bit1, bit2, source1, stem))
+        if not found:
+            return []
+
+        order1 = self._entry_order(node1, {f[0] for f in found})
+        order2 = self._entry_order(node2, {f[1] for f in found})
+        found.sort(key=lambda f: (order1[f[0]], order2[f[1]]))
+        return [(FOBLEntry(source1, self._path_count(node1, bit1)),
+                 FOBLEntry(source2, self._path_count(node2, bit2)))
+                for bit1, bit2, source1, source2 in found]
+
+    def _entry_order(self, node: str, bits: Set[int]) -> Dict[int, int]:
+        """
+        Rank some entries of a node's FOBL in object-based FOBL order.
+
+        FOBL.union keeps first-appearance order, so inherited entries come
+        first, grouped by the first input that carries them and ordered as
+        in that input, followed by the entries added at the node.
+        """
+        order = []
+        stack = [(node, list(bits))]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, int):
+                order.append(item)
+                continue
+            current, group = item
+            if len(group) == 1:
+                order.append(group[0])
+                continue
+            fobl = self.fobl[current]
+            rank = {bit: k for k, (bit, _) in enumerate(fobl.added)}
+            inherited = [b for b in group if fobl.inherited >> b & 1]
+            work = []
+            for input_node in self.predecessors[current]:
+                if not inherited:
+                    break
+                bits_in = self.fobl[input_node].bits
+                carried = [b for b in inherited if bits_in >> b & 1]
+                if carried:
+                    work.append((input_node, carried))
+                    inherited = [b for b in inherited if not bits_in >> b & 1]
+            work.extend(sorted((b for b in group if not fobl.inherited >> b & 1), key=rank.__getitem__))
+            stack.extend(reversed(work))
+        return {bit: k for k, bit in enumerate(order)}
+
+    def _path_count(self, node: str, bit: int) -> int:
+        """Path count of an entry in a node's FOBL: the sum over inputs carrying it, plus additions."""
+        memo = self.path_counts
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if bit in memo[current]:
+                stack.pop()
+                continue
+            carriers = [q for q in self.predecessors[current] if self.fobl[q].bits >> bit & 1]
+            pending = [q for q in carriers if bit not in memo[q]]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            memo[current][bit] = (sum(memo[q][bit] for q in carriers) +
+                                  sum(1 for b, _ in self.fobl[current].added if b == bit))
+        return memo[node][bit]
+
+
+def _stem(source: Union[FanoutBranch, str]) -> str:
+    """Stem of a FOBL entry source (a primary input is its own stem)."""
+    return source if isinstance(source, str) else source.stem_node
+
+
+def create_detector(dag_data: dict, encoding: str = 'bitset', compact: CompactGraph = None) -> AdvancedReconvergenceDetector:
+    """
+    Create an advanced reconvergence detector.
+
+    Args:
+        dag_data: DAG dictionary (see load_dag_json)
+        encoding: FOBL encoding, one of FOBL_ENCODINGS
+        compact: Prebuilt CompactGraph of dag_data (optional)
+
+    Returns:
+        BitsetReconvergenceDetector or AdvancedReconvergenceDetector
+    """
+    if encoding not in FOBL_ENCODINGS:
+        raise ValueError(f"Unknown FOBL encoding '{encoding}', expected one of {FOBL_ENCODINGS}")
+    if encoding == 'bitset':
+        return BitsetReconvergenceDetector(dag_data, compact)
+    return AdvancedReconvergenceDetector(dag_data, compact)
+
+
+def analyze_with_advanced_reconvergence(dag_filename: str, output_filename: str = None, output_directory: Path = None,
+                                        encoding: str = 'bitset') -> str:
     """
     Perform reconvergence analysis using the Xu & Edirisuriya (2004) algorithm.
     
@@ -465,31 +702,36 @@ def analyze_with_advanced_reconvergence(dag_filename: str, output_filename: str
     
     Args:
         dag_filename: Name of DAG JSON file in data/dag_output/
+        encoding: FOBL encoding, one of FOBL_ENCODINGS (results are identical)
         
     Returns:
         Path to the generated results file
     """
     from .reconvergence import load_dag_json  # Import current loader
     
-    # Load DAG data
-    dag_data = load_dag_json(dag_filename)
-    
-    # Create detector and run algorithm
-    detector = AdvancedReconvergenceDetector(dag_data)
-    results = detector.run_complete_algorithm()
-    
-    # Save results
-    paths = get_project_paths()
-    output_dir = output_directory or paths['reconvergence_output']
-    ensure_directory(output_dir)
-    
-    if output_filename is None:
-        base = Path(dag_filename).stem
-        output_filename = f"{base}_advanced_reconv.json"
-    output_path = output_dir / output_filename
-    
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    with profiling.span('reconvergence.advanced'):
+        # Load DAG data
+        with profiling.span('advanced.load'):
+            dag_data = load_dag_json(dag_filename)
+            detector = create_detector(dag_data, encoding)
+        
+        # Run algorithm
+        with profiling.span('advanced.detect'):
+            results = detector.run_complete_algorithm()
+        
+        # Save results
+        paths = get_project_paths()
+        output_dir = output_directory or paths['reconvergence_output']
+        ensure_directory(output_dir)
+        
+        if output_filename is None:
+            base = Path(dag_filename).stem
+            output_filename = f"{base}_advanced_reconv.json"
+        output_path = output_dir / output_filename
+        
+        with profiling.span('advanced.save'):
+            with open(output_path, 'w') as f:
+                json.dump(results, f, indent=2)
     
     print(f"[✓] Advanced reconvergence results saved to {output_path}")
     return str(output_path)
@@ -0,0 +1,430 @@
+"""
+Compiled cell-library gate model.
+
+Every cell type name is resolved once to an integer opcode plus the role of
+each input pin, so SCOAP, graph building and logic simulation can dispatch
+on integers instead of matching substrings of cell names on every visit.
+
+Cells come from a simple library file with one cell per line:
+
+    # cell      function   input pins      -> output pins
+    NAND2X1     NAND       A B             -> Y
+    AOI21X1     AOI21      A0 A1 B0        -> Y
+    ADDFX1      ADDF       A B CI          -> CO S
+    DFFRX1      DFFR       RN CK D         -> Q QN
+
+Cells not listed in a file are inferred from common standard-cell naming
+(optional CLK prefix, function, input count, drive-strength suffix), e.g.
+NAND2X1, CLKXOR2X1, OAI221X1, MX2X1, DFFRX1 or TIEHI.
+
+Input pins are positional in the parsed netlist format: inputs appear in
+instance connection order. A multi-output cell (adders, flip-flops) is
+written as one gate line per connected output pin, and each line records
+that pin by name (`pin(QN)`), so it is bound to the matching output model.
+Lines written without a pin name fall back to library order: consecutive
+lines of the same multi-output cell with identical inputs are bound to
+successive output pins.
+"""
+
+import re
+import sys
+from collections import namedtuple
+
+
+# Opcodes
+OP_UNKNOWN = 0
+OP_BUF = 1
+OP_INV = 2
+OP_AND = 3
+OP_NAND = 4
+OP_OR = 5
+OP_NOR = 6
+OP_XOR = 7
+OP_XNOR = 8
+OP_MUX2 = 9      # Y = S ? B : A
+OP_MUXI2 = 10    # Y = !(S ? B : A)
+OP_AO = 11       # OR of AND groups
+OP_AOI = 12
+OP_OA = 13       # AND of OR groups
+OP_OAI = 14
+OP_MAJ = 15      # Majority of three (full-adder carry)
+OP_DFF = 16      # Flip-flop Q, evaluated as a combinational D -> Q path
+OP_DFFN = 17     # Flip-flop QN
+OP_TIE0 = 18
+OP_TIE1 = 19
+
+OPCODE_NAMES = (
+    'UNKNOWN', 'BUF', 'INV', 'AND', 'NAND', 'OR', 'NOR', 'XOR', 'XNOR',
+    'MUX2', 'MUXI2', 'AO', 'AOI', 'OA', 'OAI', 'MAJ', 'DFF', 'DFFN',
+    'TIE0', 'TIE1',
+)
+
+# Input pin roles for OP_MUX2/OP_MUXI2
+ROLE_DATA0 = 0
+ROLE_DATA1 = 1
+ROLE_SELECT = 2
+
+# Input pin roles for OP_DFF/OP_DFFN
+ROLE_D = 0
+ROLE_CLOCK = 1
+ROLE_RESET_N = 2   # Active-low asynchronous reset
+ROLE_SET_N = 3     # Active-low asynchronous set
+ROLE_RESET = 4
+ROLE_SET = 5
+ROLE_OTHER = 6     # Not modelled (scan, enable, ...)
+
+DFF_PIN_ROLES = {
+    'D': ROLE_D,
+    'CK': ROLE_CLOCK, 'CLK': ROLE_CLOCK, 'C': ROLE_CLOCK, 'CP': ROLE_CLOCK, 'G': ROLE_CLOCK,
+    'RN': ROLE_RESET_N, 'RB': ROLE_RESET_N, 'CDN': ROLE_RESET_N, 'CLRN': ROLE_RESET_N,
+    'SN': ROLE_SET_N, 'SB': ROLE_SET_N, 'SDN': ROLE_SET_N, 'PRN': ROLE_SET_N,
+    'R': ROLE_RESET, 'CD': ROLE_RESET, 'CLR': ROLE_RESET,
+    'S': ROLE_SET, 'SD': ROLE_SET, 'PRE': ROLE_SET,
+}
+
+# Library functions -> (opcode, default input pins, default output pins).
+# Input pins of None mean any number of equivalent inputs.
+FUNCTIONS = {
+    'BUF': (OP_BUF, ('A',), ('Y',)),
+    'INV': (OP_INV, ('A',), ('Y',)),
+    'AND': (OP_AND, None, ('Y',)),
+    'NAND': (OP_NAND, None, ('Y',)),
+    'OR': (OP_OR, None, ('Y',)),
+    'NOR': (OP_NOR, None, ('Y',)),
+    'XOR': (OP_XOR, None, ('Y',)),
+    'XNOR': (OP_XNOR, None, ('Y',)),
+    'MUX2': (OP_MUX2, ('A', 'B', 'S0'), ('Y',)),
+    'MUXI2': (OP_MUXI2, ('A', 'B', 'S0'), ('Y',)),
+    'AO': (OP_AO, None, ('Y',)),
+    'AOI': (OP_AOI, None, ('Y',)),
+    'OA': (OP_OA, None, ('Y',)),
+    'OAI': (OP_OAI, None, ('Y',)),
+    'MAJ': (OP_MAJ, ('A', 'B', 'C'), ('Y',)),
+    'ADDH': (None, ('A', 'B'), ('CO', 'S')),
+    'ADDF': (None, ('A', 'B', 'CI'), ('CO', 'S')),
+    'DFF': (OP_DFF, ('CK', 'D'), ('Q', 'QN')),
+    'DFFR': (OP_DFF, ('RN', 'CK', 'D'), ('Q', 'QN')),
+    'DFFS': (OP_DFF, ('SN', 'CK', 'D'), ('Q', 'QN')),
+    'DFFRS': (OP_DFF, ('RN', 'SN', 'CK', 'D'), ('Q', 'QN')),
+    'TIE0': (OP_TIE0, (), ('Y',)),
+    'TIE1': (OP_TIE1, (), ('Y',)),
+}
+
+# Alternative spellings used by common libraries
+FUNCTION_ALIASES = {
+    'NOT': 'INV', 'MX': 'MUX2', 'MUX': 'MUX2', 'MXI': 'MUXI2', 'MUXI': 'MUXI2',
+    'TIELO': 'TIE0', 'TIEHI': 'TIE1', 'ASSIGN': 'BUF', 'DFFSR': 'DFFRS',
+}
+
+# Function at the start of a cell name, after an optional CLK prefix.
+# Longer names come first so XNOR is not taken for XOR or NOR, AOI for AO, ...
+CELL_NAME_RE = re.compile(
+    r'^(?:CLK)?(TIEHI|TIELO|ASSIGN|ADDF|ADDH|DFFRS|DFFSR|DFFR|DFFS|DFF|MUXI|MXI|MUX|MX|'
+    r'XNOR|XOR|NAND|AND|NOR|OR|INV|NOT|BUF|AOI|OAI|AO|OA|MAJ)(\d*)'
+)
+
+CARRY_PINS = {'CO', 'C', 'COUT', 'CARRY'}
+INVERTED_OUTPUT_PINS = {'QN', 'QB', 'ZN', 'YN'}
+
+
+class GateModel(namedtuple('GateModel', ['opcode', 'roles'])):
+    """
+    Compiled model of one cell output.
+
+    Attributes:
+        opcode: OP_* constant
+        roles: Per-input role tuple (AND-group index for AO/AOI, OR-group
+               index for OA/OAI, ROLE_* for muxes and flip-flops), or None
+               when all inputs are equivalent
+    """
+
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return OPCODE_NAMES[self.opcode]
+
+    def evaluate(self, values):
+        """
+        Evaluate the cell output for 0/1 input values in pin order.
+
+        Flip-flops are evaluated as their D -> Q path with asynchronous
+        set/reset applied; unknown cells evaluate to None.
+        """
+        op = self.opcode
+        if op == OP_BUF:
+            return values[0]
+        if op == OP_INV:
+            return 1 - values[0]
+        if op in (OP_AND, OP_NAND):
+            return int(all(values)) ^ (op == OP_NAND)
+        if op in (OP_OR, OP_NOR):
+            return int(any(values)) ^ (op == OP_NOR)
+        if op in (OP_XOR, OP_XNOR):
+            return (sum(values) & 1) ^ (op == OP_XNOR)
+        if op in (OP_MUX2, OP_MUXI2):
+            pins = dict(zip(self.roles, values))
+            out = pins[ROLE_DATA1] if pins[ROLE_SELECT] else pins[ROLE_DATA0]
+            return out ^ (op == OP_MUXI2)
+        if op in (OP_AO, OP_AOI, OP_OA, OP_OAI):
+            groups = {}
+            for role, v in zip(self.roles, values):
+                groups.setdefault(role, []).append(v)
+            if op in (OP_AO, OP_AOI):
+                out = int(any(all(g) for g in groups.values()))
+            else:
+                out = int(all(any(g) for g in groups.values()))
+            return out ^ (op in (OP_AOI, OP_OAI))
+        if op == OP_MAJ:
+            return int(sum(values) >= 2)
+        if op in (OP_DFF, OP_DFFN):
+            q = 0
+            for role, v in zip(self.roles, values):
+                if role == ROLE_D:
+                    q = v
+            for role, v in zip(self.roles, values):
+                if (role == ROLE_RESET_N and not v) or (role == ROLE_RESET and v):
+                    q = 0
+                elif (role == ROLE_SET_N and not v) or (role == ROLE_SET and v):
+                    q = 1
+            return q ^ (op == OP_DFFN)
+        if op == OP_TIE0:
+            return 0
+        if op == OP_TIE1:
+            return 1
+        return None
+
+
+UNKNOWN_MODEL = GateModel(OP_UNKNOWN, None)
+
+
+def _group_roles(digits, arity):
+    """AND/OR group index per input for AOI/OAI-style group counts like '221'."""
+    sizes = [int(d) for d in digits] if digits else [1] * arity
+    if sum(sizes) != arity:
+        return None
+    return tuple(k for k, size in enumerate(sizes) for _ in range(size))
+
+
+class Cell:
+    """
+    A library cell: function, pins and compiled per-output gate models.
+
+    Attributes:
+        name: Cell type name
+        function: Library function name (see FUNCTIONS), or None if unknown
+        inputs: Input pin names, or None for any number of inputs
+        outputs: Output pin names
+    """
+
+    def __init__(self, name, function, inputs=None, outputs=None, groups=''):
+        self.name = name
+        self.function = function
+        default_inputs, default_outputs = (None, ('Y',))
+        if function is not None:
+            _, default_inputs, default_outputs = FUNCTIONS[function]
+        self.inputs = tuple(inputs) if inputs is not None else default_inputs
+        self.outputs = tuple(outputs) if outputs else default_outputs
+        self.groups = groups
+        self._models = {}
+
+    def output_index(self, pin):
+        """Index of a named output pin (case-insensitive), or None if unknown."""
+        pin = pin.upper()
+        for k, name in enumerate(self.outputs):
+            if name.upper() == pin:
+                return k
+        return None
+
+    def model(self, pin, arity):
+        """Compiled GateModel of output pin index `pin` for `arity` inputs."""
+        key = (pin, arity)
+        model = self._models.get(key)
+        if model is None:
+            model = self._models[key] = self._compile(pin, arity)
+        return model
+
+    def _compile(self, pin, arity):
+        function = self.function
+        if function is None:
+            return UNKNOWN_MODEL
+        opcode = FUNCTIONS[function][0]
+        out_pin = self.outputs[pin].upper() if pin < len(self.outputs) else ''
+        pins = self.inputs
+        if pins is not None and len(pins) != arity:
+            # Fewer connected pins than the library declares: the positional
+            # mapping is ambiguous
+            if opcode in (OP_MUX2, OP_MUXI2, OP_DFF, OP_AO, OP_AOI, OP_OA, OP_OAI) or function in ('ADDH', 'ADDF'):
+                return UNKNOWN_MODEL
+            pins = None
+
+        if function == 'ADDH':
+            return GateModel(OP_AND if out_pin in CARRY_PINS else OP_XOR, None)
+        if function == 'ADDF':
+            return GateModel(OP_MAJ if out_pin in CARRY_PINS else OP_XOR, None)
+        if opcode in (OP_AO, OP_AOI, OP_OA, OP_OAI):
+            roles = _group_roles(self.groups, arity)
+            return GateModel(opcode, roles) if roles is not None else UNKNOWN_MODEL
+        if opcode in (OP_MUX2, OP_MUXI2):
+            upper = [p.upper() for p in pins]
+            select = next((k for k, p in enumerate(upper) if p.startswith('S')), len(upper) - 1)
+            data = [k for k in range(len(upper)) if k != select]
+            roles = [ROLE_SELECT] * arity
+            roles[data[0]], roles[data[1]] = ROLE_DATA0, ROLE_DATA1
+            return GateModel(opcode, tuple(roles))
+        if opcode == OP_DFF:
+            roles = tuple(DFF_PIN_ROLES.get(p.upper(), ROLE_OTHER) for p in pins)
+            if ROLE_D not in roles:
+                return UNKNOWN_MODEL
+            return GateModel(OP_DFFN if out_pin in INVERTED_OUTPUT_PINS else OP_DFF, roles)
+        if opcode == OP_MAJ and arity != 3:
+            return UNKNOWN_MODEL
+        return GateModel(opcode, None)
+
+
+class CellLibrary:
+    """
+    Cell name -> Cell table with built-in inference for standard names.
+
+    Cells are compiled on first use and cached, so every distinct cell
+    type is resolved once per library.
+    """
+
+    def __init__(self, cells=()):
+        self.cells = {}
+        self.warned = set()
+        for cell in cells:
+            self.cells[cell.name] = cell
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a library file on top of the built-in defaults.
+
+        Raises:
+            ValueError: On malformed lines or unknown functions
+        """
+        library = cls()
+        with open(path) as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                library.add(*parse_cell_line(line, lineno))
+        return library
+
+    def add(self, name, function, inputs=None, outputs=None):
+        """Define or redefine a cell; `function` may carry AOI/OAI group digits."""
+        base, groups = split_function(function)
+        if base is None:
+            raise ValueError(f"Unknown cell function '{function}' for cell '{name}'")
+        self.cells[name] = Cell(name, base, inputs, outputs, groups)
+
+    def cell(self, name):
+        """Return the Cell for a cell type name, inferring it if needed."""
+        cell = self.cells.get(name)
+        if cell is None:
+            cell = self.cells[name] = infer_cell(name)
+            if cell.function is None and name not in self.warned:
+                self.warned.add(name)
+                print(f"[WARN] Unknown cell '{name}'; using a generic gate model", file=sys.stderr)
+        return cell
+
+    def model(self, gtype, arity, pin=0):
+        """Compiled GateModel for one output pin of a cell type."""
+        return self.cell(gtype).model(pin, arity)
+
+    def bind(self, gates):
+        """
+        Compile a gate list.
+
+        Gates carrying an output pin name are bound to that pin; an unknown
+        name binds the first output. Gates without one are bound by position
+        (see the module docstring).
+
+        Args:
+            gates: Iterable of (gate_type, output, inputs[, pin]) tuples
+
+        Returns:
+            List of GateModel aligned with the gates
+        """
+        models = []
+        prev = None
+        pin = 0
+        for gtype, _, ins, *name in gates:
+            cell = self.cell(gtype)
+            key = (gtype, tuple(ins))
+            if len(cell.outputs) < 2:
+                pin = 0
+            elif name and name[0] is not None:
+                pin = cell.output_index(name[0]) or 0
+            elif key == prev:
+                pin = (pin + 1) % len(cell.outputs)
+            else:
+                pin = 0
+            prev = key
+            models.append(cell.model(pin, len(ins)))
+        return models
+
+    def bind_netlist(self, netlist):
+        """Compile every gate of a CompactNetlist; returns models by gate ID."""
+        offsets, fanin, pins = netlist.fanin_offsets, netlist.fanin_nets, netlist.gate_pins
+        gates = ((netlist.gate_types[netlist.gate_opcode[g]], None,
+                  fanin[offsets[g]:offsets[g + 1]], pins[g]) for g in range(netlist.num_gates))
+        return self.bind(gates)
+
+
+def split_function(function):
+    """Split a function name like 'AOI21' into ('AOI', '21'); None if unknown."""
+    m = re.fullmatch(r'([A-Z]+?)(\d*)', function.upper())
+    if m is None:
+        return None, ''
+    base, digits = m.groups()
+    if base + digits in FUNCTIONS or base + digits in FUNCTION_ALIASES:
+        base, digits = base + digits, ''
+    base = FUNCTION_ALIASES.get(base, base)
+    if base not in FUNCTIONS:
+        return None, ''
+    if base not in ('AO', 'AOI', 'OA', 'OAI'):
+        digits = ''
+    return base, digits
+
+
+def parse_cell_line(line, lineno=0):
+    """
+    Parse one library file line: `CELL FUNCTION PIN... [-> OUTPIN...]`.
+
+    Returns:
+        Tuple of (name, function, inputs, outputs)
+    """
+    left, _, right = line.partition('->')
+    fields = left.split()
+    if len(fields) < 2:
+        raise ValueError(f"Malformed cell library line {lineno}: '{line}'")
+    name, function, inputs = fields[0], fields[1], fields[2:]
+    outputs = right.split() or None
+    if split_function(function)[0] is None:
+        raise ValueError(f"Unknown cell function '{function}' on cell library line {lineno}")
+    return name, function, inputs or None, outputs
+
+
+def infer_cell(name):
+    """Infer a Cell from standard-cell naming; unknown names get no function."""
+    m = CELL_NAME_RE.match(name.upper())
+    if m is None:
+        return Cell(name, None)
+    token, digits = m.groups()
+    base, groups = split_function(token + (digits if token in ('AO', 'AOI', 'OA', 'OAI') else ''))
+    return Cell(name, base, groups=groups)
+
+
+DEFAULT_LIBRARY = CellLibrary()
+
+
+def get_library(library=None):
+    """Resolve a CellLibrary, a library file path or None (built-in defaults)."""
+    if library is None:
+        return DEFAULT_LIBRARY
+    if isinstance(library, CellLibrary):
+        return library
+    return CellLibrary.load(library)
@@ -12,6 +12,8 @@ import re
 from pathlib import Path
 
 from ..utils.file_utils import get_project_paths, ensure_directory
+from ..utils.artifact_cache import cached_stage
+from .netlist import CompactNetlist
 
 
 def load_parsed_netlist(json_filename):
@@ -73,6 +75,41 @@ def build_dag(gates):
     return edges, labels
 
 
+def build_dag_from_netlist(netlist):
+    """
+    Build DAG edges and labels from a CompactNetlist.
+    
+    Produces the same edges and labels as build_dag on the equivalent
+    gate dictionaries.
+    
+    Args:
+        netlist: CompactNetlist
+        
+    Returns:
+        Tuple of (edges, labels) as returned by build_dag
+    """
+    names = netlist.net_names
+    edges = []
+    labels = {}
+    
+    for g in range(netlist.num_gates):
+        output = names[netlist.gate_output[g]]
+        
+        # Skip UNCONNECTED nets
+        if not output or output.startswith('UNCONNECTED'):
+            continue
+        
+        labels[output] = f"{output} ({netlist.gate_type(g)})"
+        
+        for i in netlist.fanin(g):
+            inp = names[i]
+            edges.append([inp, output])
+            if inp not in labels:
+                labels[inp] = inp
+    
+    return edges, labels
+
+
 def flatten_signal(signal):
     """
     Flatten vector signals like A[7:0] into individual bit signals.
@@ -119,6 +156,28 @@ def create_dag_from_netlist(json_filename):
     """
     Create a complete DAG from a parsed netlist JSON file.
     
+    Unchanged inputs are restored from the artifact cache.
+    
+    Args:
+        json_filename: Name of the JSON file in data/parsed/
+        
+    Returns:
+        Path to the generated DAG JSON file
+    """
+    paths = get_project_paths()
+    json_path = paths['parsed'] / json_filename
+    if not json_path.exists():
+        raise FileNotFoundError(f"Parsed netlist not found: {json_path}")
+    output_path = paths['dag_output'] / f"{Path(json_filename).stem}_dag.json"
+    
+    cached_stage('dag', [json_path], [output_path], lambda: build_dag_json(json_filename))
+    return str(output_path)
+
+
+def build_dag_json(json_filename):
+    """
+    Build the DAG of a parsed netlist JSON file and save it (uncached).
+    
     Args:
         json_filename: Name of the JSON file in data/parsed/
         
@@ -126,12 +185,25 @@ def create_dag_from_netlist(json_filename):
         Path to the generated DAG JSON file
     """
     data = load_parsed_netlist(json_filename)
-    gates = data.get('gates')
+    return save_dag_json(build_dag_data(data), json_filename)
+
+
+def build_dag_data(data):
+    """
+    Build DAG data from a parsed netlist dictionary.
     
-    if gates is None:
+    Args:
+        data: Parsed netlist (primary_inputs, primary_outputs, gates), as
+              loaded from a json_converter output file
+        
+    Returns:
+        Dictionary with DAG edges, labels and flattened primary inputs/outputs
+    """
+    if data.get('gates') is None:
         raise ValueError("'gates' key not found in parsed netlist")
 
-    edges, labels = build_dag(gates)
+    netlist = CompactNetlist.from_json(data)
+    edges, labels = build_dag_from_netlist(netlist)
 
     # Handle primary inputs/outputs
     raw_inputs = data.get('primary_inputs', [])
@@ -145,15 +217,13 @@ def create_dag_from_netlist(json_filename):
     for sig in raw_outputs:
         flat_outputs.extend(flatten_signal(sig))
 
-    dag_data = {
+    return {
         'edges': edges,
         'labels': labels,
         'primary_inputs': flat_inputs,
         'primary_outputs': flat_outputs
     }
 
-    return save_dag_json(dag_data, json_filename)
-
 
 def main():
     """CLI entry point for DAG builder."""
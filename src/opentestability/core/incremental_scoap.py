@@ -0,0 +1,270 @@
+"""
+Incremental SCOAP recomputation for ECO and test-point exploration.
+
+A design is loaded and solved once; gates can then be inserted, deleted or
+retyped and only the metrics that actually change are recomputed:
+- CC changes propagate forward through the fan-out cone of the edited gate
+- CO changes propagate backward through the fan-in cone, including the
+  cone of nets whose side-input controllability changed
+
+Every SCOAP rule yields a value strictly greater than the inputs that
+determine it, so the metric equations have a unique fixed point even with
+feedback loops. Updates use the Ramalingam-Reps dynamic algorithm for such
+systems: inconsistent nets are processed in increasing key order, lowered
+values are settled immediately and raised values are reset and re-derived,
+which avoids counting up around loops. Results match a full recompute.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from pathlib import Path
+
+from ..utils.file_utils import get_project_paths, ensure_directory
+from .netlist import CompactNetlist
+from .cell_library import get_library
+from .scoap import (
+    read_netlist, parse_sections, extract_wires, compute_controllability,
+    compute_observability, _gate_controllability, _gate_observability,
+    write_scoap, dump_json,
+)
+
+
+class IncrementalScoap:
+    """
+    SCOAP metrics for a mutable netlist.
+
+    Gates are addressed by integer IDs: the index in the original gate list
+    for loaded gates, and the value returned by insert_gate for new ones.
+    Each edit returns the set of nets whose CC0, CC1 or CO changed.
+    """
+
+    def __init__(self, inputs, outputs, gates, library=None):
+        self.library = get_library(library)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.input_set = set(self.inputs)
+        self.output_set = set(self.outputs)
+        self.gates = {}
+        self.models = {}
+        self.drivers = defaultdict(set)
+        self.readers = defaultdict(set)
+        self.next_gate_id = 0
+        models = self.library.bind(gates)
+        for (gtype, o, ins, *_), model in zip(gates, models):
+            self._attach(gtype, o, ins, model)
+
+        netlist = CompactNetlist.from_gates(self.inputs, self.outputs, gates)
+        CC0, CC1 = compute_controllability(netlist, models=models)
+        CO = compute_observability(netlist, CC0, CC1, models=models)
+        names = netlist.net_names
+        self.CC0 = defaultdict(lambda: math.inf, zip(names, CC0))
+        self.CC1 = defaultdict(lambda: math.inf, zip(names, CC1))
+        self.CO = defaultdict(lambda: math.inf, zip(names, CO))
+
+    @classmethod
+    def load(cls, input_filename, library=None):
+        """Load a parsed netlist from data/parsed/ and solve it once."""
+        paths = get_project_paths()
+        lines = read_netlist(paths['parsed'] / input_filename)
+        inputs, outputs, _, gates = parse_sections(lines)
+        return cls(inputs, outputs, gates, library)
+
+    # Netlist edits
+
+    def insert_gate(self, gtype, output, inputs, pin=0):
+        """
+        Add a gate driving `output` from `inputs`.
+
+        Args:
+            pin: Index of the cell output pin driving `output`
+
+        Returns:
+            Tuple of (gate_id, changed_nets)
+        """
+        model = self.library.model(gtype, len(inputs), pin)
+        gid = self._attach(gtype, output, inputs, model)
+        changed = self._propagate({output}, set(inputs))
+        return gid, changed
+
+    def delete_gate(self, gid):
+        """Remove a gate; returns the set of nets whose metrics changed."""
+        _, o, ins = self.gates.pop(gid)
+        del self.models[gid]
+        self.drivers[o].discard(gid)
+        for i in set(ins):
+            self.readers[i].discard(gid)
+        return self._propagate({o}, set(ins))
+
+    def retype_gate(self, gid, gtype, pin=0):
+        """Change the cell type of a gate; returns the set of changed nets."""
+        gate = self.gates[gid]
+        gate[0] = gtype
+        self.models[gid] = self.library.model(gtype, len(gate[2]), pin)
+        return self._propagate({gate[1]}, set(gate[2]))
+
+    def _attach(self, gtype, o, ins, model):
+        gid = self.next_gate_id
+        self.next_gate_id += 1
+        self.gates[gid] = [gtype, o, list(ins)]
+        self.models[gid] = model
+        self.drivers[o].add(gid)
+        for i in ins:
+            self.readers[i].add(gid)
+        return gid
+
+    # Metric equations
+
+    def _cc_rhs(self, net, polarity):
+        """Recompute CC0 (polarity 0) or CC1 (polarity 1) of a net from its drivers."""
+        best = 1 if net in self.input_set else math.inf
+        CC0, CC1 = self.CC0, self.CC1
+        for gid in self.drivers[net]:
+            ins = self.gates[gid][2]
+            new = _gate_controllability(self.models[gid], [CC0[i] for i in ins], [CC1[i] for i in ins])
+            if new is not None and new[polarity] < best:
+                best = new[polarity]
+        return best
+
+    def _co_rhs(self, net):
+        """Recompute the CO of a net from the gates reading it."""
+        best = 1 if net in self.output_set else math.inf
+        for gid in self.readers[net]:
+            _, o, ins = self.gates[gid]
+            for i, v in _gate_observability(self.models[gid], ins, self.CO[o], self.CC0, self.CC1):
+                if i == net and v < best:
+                    best = v
+        return best
+
+    def _observed_inputs(self, gid):
+        """Inputs of a gate whose CO may depend on the gate (see _gate_observability)."""
+        return self.gates[gid][2]
+
+    # Propagation
+
+    @staticmethod
+    def _solve(seeds, get, put, rhs, dependents):
+        """
+        Restore consistency of a metric after the equations of `seeds` changed.
+
+        Args:
+            seeds: Keys whose right-hand side may have changed
+            get: Function returning the current value of a key
+            put: Function storing a new value for a key
+            rhs: Function recomputing the right-hand side of a key
+            dependents: Function yielding keys whose rhs reads a key
+
+        Returns:
+            Dictionary of touched key -> original value
+        """
+        changed = {}
+        pending = {}
+        heap = []
+
+        def update(key):
+            r = rhs(key)
+            pending[key] = r
+            if r != get(key):
+                heapq.heappush(heap, (min(r, get(key)), key))
+
+        def assign(key, v):
+            changed.setdefault(key, get(key))
+            put(key, v)
+
+        for key in seeds:
+            update(key)
+
+        while heap:
+            k, key = heapq.heappop(heap)
+            r, cur = pending[key], get(key)
+            if r == cur or k != min(r, cur):
+                continue
+            if r < cur:
+                assign(key, r)
+                for dep in dependents(key):
+                    update(dep)
+            else:
+                assign(key, math.inf)
+                update(key)
+                for dep in dependents(key):
+                    update(dep)
+        return changed
+
+    def _propagate(self, cc_seeds, co_seeds):
+        """Propagate CC forward from cc_seeds, then CO backward; return changed nets."""
+        tables = (self.CC0, self.CC1)
+
+        def cc_get(key):
+            return tables[key[1]][key[0]]
+
+        def cc_put(key, v):
+            tables[key[1]][key[0]] = v
+
+        def cc_dependents(key):
+            for gid in self.readers[key[0]]:
+                o = self.gates[gid][1]
+                yield (o, 0)
+                yield (o, 1)
+
+        cc_changed = self._solve([(n, p) for n in cc_seeds for p in (0, 1)], cc_get, cc_put,
+                                 lambda key: self._cc_rhs(*key), cc_dependents)
+
+        # Side-input controllability feeds the CO of the other observed input
+        co_seeds = set(co_seeds)
+        for net, _ in cc_changed:
+            for gid in self.readers[net]:
+                co_seeds.update(self._observed_inputs(gid))
+
+        def co_dependents(net):
+            for gid in self.drivers[net]:
+                yield from self._observed_inputs(gid)
+
+        co_changed = self._solve(co_seeds, self.CO.__getitem__, self.CO.__setitem__,
+                                 self._co_rhs, co_dependents)
+
+        changed = {n for (n, p), old in cc_changed.items() if tables[p][n] != old}
+        changed.update(n for n, old in co_changed.items() if self.CO[n] != old)
+        return changed
+
+    # Results
+
+    def gate_list(self):
+        """Current gates as (gate_type, output, inputs) tuples in gate ID order."""
+        return [(g[0], g[1], list(g[2])) for _, g in sorted(self.gates.items())]
+
+    def metrics(self, net):
+        """Return (CC0, CC1, CO) of a net."""
+        return self.CC0[net], self.CC1[net], self.CO[net]
+
+    def results(self):
+        """
+        Current metrics in the format returned by scoap's build functions.
+
+        Returns:
+            Tuple of (ctrl, obs) keyed CC0_<net>/CC1_<net> and CO_<net>
+        """
+        nets = extract_wires(self.inputs, self.outputs, self.gate_list())
+        ctrl = {f"CC0_{n}": self.CC0[n] for n in nets}
+        ctrl.update({f"CC1_{n}": self.CC1[n] for n in nets})
+        obs = {f"CO_{n}": self.CO[n] for n in nets}
+        return ctrl, obs
+
+    def write(self, output_filename, json_flag=False):
+        """
+        Write the current metrics to data/results/ like scoap.run.
+
+        Returns:
+            Path to the generated text output file
+        """
+        paths = get_project_paths()
+        ensure_directory(paths['results'])
+        output_path_txt = paths['results'] / output_filename
+        ctrl, obs = self.results()
+        write_scoap(ctrl, obs, output_path_txt)
+
+        if json_flag:
+            base = Path(output_filename).stem
+            dump_json(ctrl, obs, self.inputs, self.outputs, self.gate_list(),
+                      paths['results'] / f"{base}.json")
+
+        return str(output_path_txt)
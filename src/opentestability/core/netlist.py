@@ -0,0 +1,466 @@
+"""
+Compact integer-indexed netlist representation.
+
+This module interns net names to dense integer IDs once and stores the
+connectivity in CSR (compressed sparse row) arrays, so SCOAP, DAG
+construction and reconvergence analysis can work on integers instead of
+net-name strings:
+- CompactNetlist: gate-level view (gate opcodes, fan-in, fan-out, drivers)
+- CompactGraph: node-level view (net -> net edges) used by the DAG stages
+"""
+
+import re
+import sys
+from array import array
+from collections import deque
+
+
+VECTOR_RE = re.compile(r'^(\w+)\[(\d+):(\d+)\]$')
+GATE_RE = re.compile(r'^\s*(\w+)\s+out\(\s*([^)]+)\)\s+in\(\s*([^)]+)\)'
+                     r'(?:\s+pin\(\s*(\w+)\s*\))?\s*$')
+ID_TYPECODE = 'i'
+
+
+def expand_vector(signal):
+    """Expand vector notation like A[7:0] into individual signals."""
+    m = VECTOR_RE.match(signal)
+    if not m:
+        return [signal]
+    base, msb, lsb = m.group(1), int(m.group(2)), int(m.group(3))
+    step = -1 if msb >= lsb else 1
+    return [f"{base}[{i}]" for i in range(msb, lsb - step, step)]
+
+
+def iter_sections(lines):
+    """
+    Stream a parsed netlist as (section, item) events.
+
+    Lines are consumed lazily, so an open file handle can be passed directly
+    and nothing but the current line is held in memory. Unparseable lines
+    in the gate section are reported on stderr and skipped; line numbers
+    count non-blank lines, as in scoap.read_netlist. The output pin name is
+    None for gate lines written without a pin(...) field.
+
+    Args:
+        lines: Iterable of netlist text lines
+
+    Yields:
+        ('INPUT', net), ('OUTPUT', net) or
+        ('GATES', (gate_type, output, inputs, pin))
+    """
+    section = None
+    lineno = 0
+
+    for line in lines:
+        if not line.strip():
+            continue
+        line = line.rstrip()
+        lineno += 1
+
+        if line.startswith('#'):
+            if 'Primary Inputs' in line:
+                section = 'INPUT'
+            elif 'Primary Outputs' in line:
+                section = 'OUTPUT'
+            elif 'Complete Paths' in line:
+                section = 'GATES'
+            else:
+                section = None
+            continue
+
+        if section == 'INPUT' or section == 'OUTPUT':
+            for tok in line.split():
+                for net in expand_vector(tok):
+                    yield section, net
+        elif section == 'GATES':
+            m = GATE_RE.match(line)
+            if m:
+                gtype = m.group(1)
+                ins = m.group(3).split()
+                pin = m.group(4)
+                for o in m.group(2).split():
+                    yield section, (gtype, o, ins, pin)
+            else:
+                print(f"[WARN] skipped @{lineno}: {line}", file=sys.stderr)
+
+
+def zeros(n):
+    """Zero-filled ID array of length n."""
+    return array(ID_TYPECODE, bytes(n * array(ID_TYPECODE).itemsize))
+
+
+def build_csr(num_rows, rows, values):
+    """
+    Group values by row into CSR arrays, preserving their original order.
+
+    Args:
+        num_rows: Number of rows
+        rows: Row index of every value
+        values: Values to group
+
+    Returns:
+        Tuple of (offsets, items) where the items of row r are
+        items[offsets[r]:offsets[r + 1]]
+    """
+    counts = zeros(num_rows + 1)
+    for r in rows:
+        counts[r + 1] += 1
+    for r in range(num_rows):
+        counts[r + 1] += counts[r]
+
+    items = zeros(len(values))
+    pos = counts[:-1]
+    for r, v in zip(rows, values):
+        items[pos[r]] = v
+        pos[r] += 1
+    return counts, items
+
+
+class NetlistBuilder:
+    """
+    Incremental builder for CompactNetlist.
+
+    Parsers feed primary inputs, primary outputs and gates one at a time;
+    net names are interned on first sight so each name is stored once.
+    """
+
+    def __init__(self):
+        self.net_names = []
+        self.net_ids = {}
+        self.gate_types = []
+        self.type_ids = {}
+        self.gate_opcode = array(ID_TYPECODE)
+        self.gate_output = array(ID_TYPECODE)
+        self.gate_pins = []
+        self.fanin_offsets = array(ID_TYPECODE, [0])
+        self.fanin_nets = array(ID_TYPECODE)
+        self.inputs = array(ID_TYPECODE)
+        self.outputs = array(ID_TYPECODE)
+
+    def intern(self, name):
+        """Return the net ID for a name, allocating one if needed."""
+        nid = self.net_ids.get(name)
+        if nid is None:
+            nid = len(self.net_names)
+            self.net_ids[name] = nid
+            self.net_names.append(name)
+        return nid
+
+    def add_input(self, name):
+        """Add a primary input net."""
+        self.inputs.append(self.intern(name))
+
+    def add_output(self, name):
+        """Add a primary output net."""
+        self.outputs.append(self.intern(name))
+
+    def add_gate(self, gtype, output, inputs, pin=None):
+        """Add a single-output gate and return its gate ID.
+
+        `pin` names the cell output pin driving `output`, if known.
+        """
+        opcode = self.type_ids.get(gtype)
+        if opcode is None:
+            opcode = len(self.gate_types)
+            self.type_ids[gtype] = opcode
+            self.gate_types.append(gtype)
+        self.gate_opcode.append(opcode)
+        self.gate_output.append(self.intern(output))
+        self.gate_pins.append(pin)
+        for i in inputs:
+            self.fanin_nets.append(self.intern(i))
+        self.fanin_offsets.append(len(self.fanin_nets))
+        return len(self.gate_output) - 1
+
+    def build(self):
+        """Freeze the collected data into a CompactNetlist."""
+        return CompactNetlist(self)
+
+
+class CompactNetlist:
+    """
+    Gate-level netlist with interned net IDs and CSR connectivity.
+
+    Attributes:
+        net_names: Net name per net ID
+        net_ids: Net name -> net ID
+        gate_types: Distinct cell type names
+        gate_opcode: Index into gate_types per gate
+        gate_output: Output net ID per gate
+        gate_pins: Cell output pin name per gate (None if not recorded)
+        fanin_offsets, fanin_nets: CSR gate -> input net IDs
+        fanout_offsets, fanout_gates: CSR net -> reading gate IDs (one per pin)
+        driver_offsets, driver_gates: CSR net -> driving gate IDs
+        inputs, outputs: Primary input/output net IDs
+    """
+
+    def __init__(self, builder):
+        self.net_names = builder.net_names
+        self.net_ids = builder.net_ids
+        self.gate_types = builder.gate_types
+        self.gate_opcode = builder.gate_opcode
+        self.gate_output = builder.gate_output
+        self.gate_pins = builder.gate_pins
+        self.fanin_offsets = builder.fanin_offsets
+        self.fanin_nets = builder.fanin_nets
+        self.inputs = builder.inputs
+        self.outputs = builder.outputs
+
+        pin_gates = array(ID_TYPECODE)
+        for g in range(self.num_gates):
+            pin_gates.extend([g] * (self.fanin_offsets[g + 1] - self.fanin_offsets[g]))
+        self.fanout_offsets, self.fanout_gates = build_csr(
+            self.num_nets, self.fanin_nets, pin_gates)
+        self.driver_offsets, self.driver_gates = build_csr(
+            self.num_nets, self.gate_output, range(self.num_gates))
+        self._order = None
+
+    @classmethod
+    def from_gates(cls, inputs, outputs, gates, nets=()):
+        """
+        Build from the (gate_type, output, inputs[, pin]) tuples used by scoap.
+
+        Args:
+            inputs: Primary input names
+            outputs: Primary output names
+            gates: List of (gate_type, output, inputs[, pin]) tuples
+            nets: Extra net names to intern (e.g. unconnected ports)
+        """
+        builder = NetlistBuilder()
+        for n in inputs:
+            builder.add_input(n)
+        for n in outputs:
+            builder.add_output(n)
+        for gate in gates:
+            builder.add_gate(*gate)
+        for n in nets:
+            builder.intern(n)
+        return builder.build()
+
+    @classmethod
+    def from_sections(cls, events):
+        """Build from the (section, item) events produced by iter_sections."""
+        builder = NetlistBuilder()
+        for section, item in events:
+            if section == 'GATES':
+                builder.add_gate(*item)
+            elif section == 'INPUT':
+                builder.add_input(item)
+            else:
+                builder.add_output(item)
+        return builder.build()
+
+    @classmethod
+    def from_parsed_file(cls, path):
+        """
+        Stream a parsed netlist text file straight into a CompactNetlist.
+
+        Peak memory stays close to the size of the result: the file is read
+        line by line and every net name is interned on first sight.
+        """
+        with open(path) as f:
+            return cls.from_sections(iter_sections(f))
+
+    @classmethod
+    def from_json(cls, data):
+        """Build from a parsed netlist JSON dictionary (json_converter format)."""
+        builder = NetlistBuilder()
+        for sig in data.get('primary_inputs', []):
+            for n in expand_vector(sig):
+                builder.add_input(n)
+        for sig in data.get('primary_outputs', []):
+            for n in expand_vector(sig):
+                builder.add_output(n)
+        for gate in data.get('gates', []):
+            builder.add_gate(gate.get('type'), gate.get('output'), gate.get('inputs', []),
+                             gate.get('pin'))
+        return builder.build()
+
+    @property
+    def num_nets(self):
+        return len(self.net_names)
+
+    @property
+    def num_gates(self):
+        return len(self.gate_output)
+
+    def gate_type(self, g):
+        """Cell type name of a gate."""
+        return self.gate_types[self.gate_opcode[g]]
+
+    def fanin(self, g):
+        """Input net IDs of a gate."""
+        return self.fanin_nets[self.fanin_offsets[g]:self.fanin_offsets[g + 1]]
+
+    def fanout(self, n):
+        """IDs of the gates reading a net (once per connected pin)."""
+        return self.fanout_gates[self.fanout_offsets[n]:self.fanout_offsets[n + 1]]
+
+    def drivers(self, n):
+        """IDs of the gates driving a net."""
+        return self.driver_gates[self.driver_offsets[n]:self.driver_offsets[n + 1]]
+
+    def gates(self):
+        """Iterate (gate_type, output, inputs, pin) tuples with net names."""
+        names = self.net_names
+        for g in range(self.num_gates):
+            yield (self.gate_type(g), names[self.gate_output[g]],
+                   [names[i] for i in self.fanin(g)], self.gate_pins[g])
+
+    def levelize(self):
+        """
+        Order gates so that every gate comes after all drivers of its inputs.
+
+        Kahn's algorithm over net drivers: a net is final once every gate
+        driving it has been placed, and a gate is ready once all of its
+        driven inputs are final. Gates on a feedback loop, and everything
+        downstream of one, never become ready; they are returned separately
+        in netlist order so the engines can fall back to fixed-point
+        iteration for just that part. The result is cached.
+
+        Returns:
+            Tuple of (order, feedback) arrays of gate IDs
+        """
+        if self._order is not None:
+            return self._order
+
+        offsets, fanin = self.fanin_offsets, self.fanin_nets
+        driver_offsets = self.driver_offsets
+        remaining = array(ID_TYPECODE, (driver_offsets[n + 1] - driver_offsets[n]
+                                        for n in range(self.num_nets)))
+
+        pending = zeros(self.num_gates)
+        ready = deque()
+        for g in range(self.num_gates):
+            count = 0
+            for k in range(offsets[g], offsets[g + 1]):
+                if remaining[fanin[k]]:
+                    count += 1
+            pending[g] = count
+            if count == 0:
+                ready.append(g)
+
+        order = array(ID_TYPECODE)
+        fanout_offsets, fanout_gates = self.fanout_offsets, self.fanout_gates
+        gate_output = self.gate_output
+        while ready:
+            g = ready.popleft()
+            order.append(g)
+            o = gate_output[g]
+            remaining[o] -= 1
+            if remaining[o] == 0:
+                for k in range(fanout_offsets[o], fanout_offsets[o + 1]):
+                    r = fanout_gates[k]
+                    pending[r] -= 1
+                    if pending[r] == 0:
+                        ready.append(r)
+
+        feedback = array(ID_TYPECODE, (g for g in range(self.num_gates) if pending[g] > 0))
+        self._order = (order, feedback)
+        return self._order
+
+    def to_graph(self):
+        """
+        Node-level graph with one edge per gate input -> gate output.
+
+        Gates driving UNCONNECTED nets are skipped, matching
+        dag_builder.build_dag.
+        """
+        names = self.net_names
+        src, dst = [], []
+        for g in range(self.num_gates):
+            o = self.gate_output[g]
+            if names[o].startswith('UNCONNECTED'):
+                continue
+            for i in self.fanin(g):
+                src.append(names[i])
+                dst.append(names[o])
+        return CompactGraph.from_edges(zip(src, dst))
+
+
+class CompactGraph:
+    """
+    Directed node graph in CSR form.
+
+    Node IDs follow first appearance in the edge list and duplicate edges
+    are dropped, so node, successor and predecessor order match a
+    networkx.DiGraph built from the same edges.
+
+    Attributes:
+        node_names: Node name per node ID
+        node_ids: Node name -> node ID
+        edge_src, edge_dst: Unique edges in insertion order
+        succ_offsets, succ: CSR node -> successor IDs
+        pred_offsets, pred: CSR node -> predecessor IDs
+    """
+
+    def __init__(self, node_names, node_ids, edge_src, edge_dst):
+        self.node_names = node_names
+        self.node_ids = node_ids
+        self.edge_src = edge_src
+        self.edge_dst = edge_dst
+        n = len(node_names)
+        self.succ_offsets, self.succ = build_csr(n, edge_src, edge_dst)
+        self.pred_offsets, self.pred = build_csr(n, edge_dst, edge_src)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Build from an iterable of (source, target) name pairs."""
+        node_names, node_ids = [], {}
+        edge_src, edge_dst = array(ID_TYPECODE), array(ID_TYPECODE)
+        seen = set()
+        for u, v in edges:
+            ids = []
+            for name in (u, v):
+                nid = node_ids.get(name)
+                if nid is None:
+                    nid = len(node_names)
+                    node_ids[name] = nid
+                    node_names.append(name)
+                ids.append(nid)
+            key = (ids[0], ids[1])
+            if key in seen:
+                continue
+            seen.add(key)
+            edge_src.append(ids[0])
+            edge_dst.append(ids[1])
+        return cls(node_names, node_ids, edge_src, edge_dst)
+
+    @classmethod
+    def from_dag_data(cls, dag_data):
+        """Build from a DAG JSON dictionary (dag_builder format)."""
+        return cls.from_edges(dag_data['edges'])
+
+    @property
+    def num_nodes(self):
+        return len(self.node_names)
+
+    @property
+    def num_edges(self):
+        return len(self.edge_src)
+
+    def successors(self, n):
+        return self.succ[self.succ_offsets[n]:self.succ_offsets[n + 1]]
+
+    def predecessors(self, n):
+        return self.pred[self.pred_offsets[n]:self.pred_offsets[n + 1]]
+
+    def out_degree(self, n):
+        return self.succ_offsets[n + 1] - self.succ_offsets[n]
+
+    def in_degree(self, n):
+        return self.pred_offsets[n + 1] - self.pred_offsets[n]
+
+    def fanout_points(self):
+        """Node IDs with more than one successor."""
+        return [n for n in range(self.num_nodes) if self.out_degree(n) > 1]
+
+    def to_networkx(self):
+        """Equivalent networkx.DiGraph with the same node and edge order."""
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(self.node_names)
+        names = self.node_names
+        G.add_edges_from((names[u], names[v]) for u, v in zip(self.edge_src, self.edge_dst))
+        return G
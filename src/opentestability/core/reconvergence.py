@@ -3,6 +3,18 @@ Reconvergent fanout detection for testability analysis.
 
 This module identifies reconvergent fanout structures in digital circuits,
 which are critical for understanding fault propagation and test coverage.
+
+A ReachabilityIndex built in one topological pass answers which fanout
+points reach a node, and path searches keep parent pointers instead of
+copying partial paths, so large DAGs are handled without per-pair
+reachability queries. Sites are independent, so find_reconvergences() can
+shard them over worker processes (see parallel_reconvergence).
+
+Results are written as one JSON document by default. The 'lines' format
+(RECONV_FORMATS) streams them instead: every record becomes a line of a
+.jsonl file as soon as it is found, and a final {"summary": {...}} line
+holds the totals, so complete results of large designs never have to be
+held in memory.
 """
 
 import json
@@ -14,6 +26,9 @@ from collections import deque
 from pathlib import Path
 
 from ..utils.file_utils import get_project_paths, ensure_directory
+from ..utils import profiling
+
+RECONV_FORMATS = ('json', 'lines')
 
 
 def load_dag_json(dag_filename):
@@ -87,7 +102,71 @@ def find_fanout_points(G):
     return [n for n in G.nodes if G.out_degree(n) > 1]
 
 
-def bfs_path(G, source, target, max_depth=20):
+class ReachabilityIndex:
+    """
+    Which fanout points reach each node of a DAG.
+
+    Fanout points are numbered in graph node order and every node gets an
+    int bitset of the fanout points that reach it (itself included), built
+    in one topological pass as the OR of its predecessors' sets.
+
+    Args:
+        G: Acyclic NetworkX DiGraph
+        fanouts: Fanout points (default: find_fanout_points(G))
+    """
+
+    def __init__(self, G, fanouts=None):
+        self.fanouts = find_fanout_points(G) if fanouts is None else list(fanouts)
+        self.bit = {f: k for k, f in enumerate(self.fanouts)}
+        self.reach = {}
+        for node in nx.topological_sort(G):
+            bits = 1 << self.bit[node] if node in self.bit else 0
+            for pred in G.predecessors(node):
+                bits |= self.reach[pred]
+            self.reach[node] = bits
+
+    def reaches(self, fanout, node):
+        """True if there is a path from fanout to node."""
+        return self.reach[node] >> self.bit[fanout] & 1 == 1
+
+    def fanouts_reaching(self, node):
+        """Fanout points that reach node, in graph node order."""
+        bits = self.reach[node]
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.fanouts[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+
+def distances_to(G, target, max_edges):
+    """
+    Edge distance to target from every node within max_edges of it.
+
+    Args:
+        G: NetworkX DiGraph
+        target: Target node
+        max_edges: Search bound
+
+    Returns:
+        Dictionary node -> number of edges on a shortest path to target
+    """
+    dist = {target: 0}
+    queue = deque([target])
+    while queue:
+        node = queue.popleft()
+        d = dist[node] + 1
+        if d > max_edges:
+            continue
+        for pred in G.predecessors(node):
+            if pred not in dist:
+                dist[pred] = d
+                queue.append(pred)
+    return dist
+
+
+def bfs_path(G, source, target, max_depth=20, distance=None):
     """
     Find a path from source to target using BFS.
     
@@ -96,34 +175,117 @@ def bfs_path(G, source, target, max_depth=20):
         source: Source node
         target: Target node
         max_depth: Maximum path length to search
+        distance: Optional distances_to(G, target, max_depth - 1) result;
+                  the search then only visits nodes on shortest paths, which
+                  returns the same path as the unrestricted search
         
     Returns:
         List representing the path, or None if no path found
     """
-    queue = deque([[source]])
+    if source == target:
+        return [source]
+    limit = max_depth - 1
+    if distance is not None:
+        limit = distance.get(source, max_depth)
+        if limit > max_depth - 1:
+            return None
+    parent = {source: None}
+    frontier = [source]
+    for level in range(1, limit + 1):
+        next_frontier = []
+        for node in frontier:
+            for nxt in G.successors(node):
+                if nxt in parent:
+                    continue
+                if distance is not None and level + distance.get(nxt, max_depth) > limit:
+                    continue
+                parent[nxt] = node
+                if nxt == target:
+                    path = [target]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    return path[::-1]
+                next_frontier.append(nxt)
+        frontier = next_frontier
+    return None
+
+
+def reconvergences_at(state, site):
+    """
+    Reconvergent fanout pairs closing at one site.
+
+    Args:
+        state: Tuple of (G, index, max_depth): the acyclic graph, its
+               ReachabilityIndex and the maximum path length in nodes
+        site: Candidate reconvergence site
+
+    Returns:
+        List of reconvergence dictionaries (see find_reconvergences)
+    """
+    G, index, max_depth = state
+    # Find all fanout points that can reach this site
+    sources = index.fanouts_reaching(site)
+    profiling.add('baseline.source_pairs', len(sources) * (len(sources) - 1) // 2)
     
-    while queue:
-        path = queue.popleft()
+    # One shortest path per source; pairs without both paths are skipped
+    distance = distances_to(G, site, max_depth - 1)
+    paths = []
+    searches = 0
+    for source in sources:
+        if source in distance:
+            searches += 1
+            path = bfs_path(G, source, site, max_depth, distance)
+            if path:
+                paths.append((source, path, set(path[1:-1])))
+    profiling.add('baseline.path_searches', searches)
+    
+    # Check all pairs of sources for reconvergence
+    results = []
+    for (a, p1, inner1), (b, p2, inner2) in combinations(paths, 2):
+        # Check if paths are disjoint (true reconvergence)
+        if inner1.isdisjoint(inner2):
+            results.append({
+                'site': site,
+                'branch1': a,
+                'branch2': b,
+                'path1': p1,
+                'path2': p2
+            })
+    return results
+
+
+def iter_reconvergences(G, max_depth=20, jobs=1):
+    """
+    Yield reconvergent fanout structures of the graph as they are found.
+    
+    Args:
+        G: Acyclic NetworkX DiGraph (see break_cycles)
+        max_depth: Maximum path length (nodes) searched from a fanout point
+        jobs: Worker processes the candidate sites are sharded over
+              (0: CPU count); the result does not depend on it
         
-        if path[-1] == target:
-            return path
-            
-        if len(path) >= max_depth:
-            continue
-            
-        for nxt in G.successors(path[-1]):
-            if nxt not in path:
-                queue.append(path + [nxt])
+    Yields:
+        Reconvergence dictionaries (see find_reconvergences), site by site
+    """
+    from .parallel_reconvergence import detect_sharded
     
-    return None
+    index = ReachabilityIndex(G)
+    profiling.add('baseline.reachability_queries', G.number_of_nodes())
+    # Candidate sites are reached by at least two fanout points
+    sites = [node for node in G.nodes if index.reach[node] & (index.reach[node] - 1)]
+    for records in detect_sharded(reconvergences_at, (G, index, max_depth), sites, jobs):
+        yield from records
 
 
-def find_reconvergences(G):
+def find_reconvergences(G, max_depth=20, jobs=1):
     """
     Find all reconvergent fanout structures in the graph.
     
     Args:
-        G: NetworkX DiGraph
+        G: Acyclic NetworkX DiGraph (see break_cycles)
+        max_depth: Maximum path length (nodes) searched from a fanout point
+        jobs: Worker processes the candidate sites are sharded over
+              (0: CPU count); the result does not depend on it
         
     Returns:
         List of reconvergence dictionaries, each containing:
@@ -131,30 +293,7 @@ def find_reconvergences(G):
         - branch1, branch2: The two fanout sources
         - path1, path2: The reconvergent paths
     """
-    fanouts = find_fanout_points(G)
-    results = []
-    
-    for site in G.nodes:
-        # Find all fanout points that can reach this site
-        sources = [f for f in fanouts if nx.has_path(G, f, site)]
-        
-        # Check all pairs of sources for reconvergence
-        for a, b in combinations(sources, 2):
-            p1 = bfs_path(G, a, site)
-            p2 = bfs_path(G, b, site)
-            
-            if p1 and p2:
-                # Check if paths are disjoint (true reconvergence)
-                if set(p1[1:-1]).isdisjoint(p2[1:-1]):
-                    results.append({
-                        'site': site,
-                        'branch1': a,
-                        'branch2': b,
-                        'path1': p1,
-                        'path2': p2
-                    })
-    
-    return results
+    return list(iter_reconvergences(G, max_depth, jobs))
 
 
 def save_reconvergence(data, output_filename):
@@ -179,25 +318,74 @@ def save_reconvergence(data, output_filename):
     return str(output_path)
 
 
-def analyze_reconvergence(dag_filename):
+def write_reconvergence_lines(records, output_path, summary=None):
+    """
+    Stream reconvergence records to a JSON Lines file.
+    
+    Each record is written as soon as `records` yields it. The last line is
+    {"summary": {...}}: the given summary fields plus total_reconvergences
+    and reconvergent_sites.
+    
+    Args:
+        records: Iterable of reconvergence dictionaries with a 'site' key
+        output_path: Path of the .jsonl file
+        summary: Extra summary fields (optional)
+        
+    Returns:
+        The summary dictionary
+    """
+    total = 0
+    sites = set()
+    with open(output_path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+            total += 1
+            sites.add(record['site'])
+        summary = dict(summary or {}, total_reconvergences=total, reconvergent_sites=len(sites))
+        f.write(json.dumps({'summary': summary}) + "\n")
+    return summary
+
+
+def analyze_reconvergence(dag_filename, jobs=1, output_format='json'):
     """
     Perform complete reconvergence analysis on a DAG.
     
     Args:
         dag_filename: Name of DAG JSON file in data/dag_output/
+        jobs: Worker processes for the site loop (0: CPU count)
+        output_format: One of RECONV_FORMATS; 'lines' streams the records
+                       to <design>_reconv.jsonl
         
     Returns:
-        Path to the generated reconvergence JSON file
+        Path to the generated reconvergence JSON or JSON Lines file
     """
-    dag_data = load_dag_json(dag_filename)
-    G = build_dag_graph(dag_data)
-    break_cycles(G)
-    reconvergences = find_reconvergences(G)
-    
-    base = Path(dag_filename).stem
-    output_filename = f"{base}_reconv.json"
+    if output_format not in RECONV_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {RECONV_FORMATS}")
     
-    return save_reconvergence(reconvergences, output_filename)
+    with profiling.span('reconvergence.baseline'):
+        with profiling.span('baseline.load'):
+            dag_data = load_dag_json(dag_filename)
+            G = build_dag_graph(dag_data)
+            break_cycles(G)
+        
+        base = Path(dag_filename).stem
+        if output_format == 'lines':
+            paths = get_project_paths()
+            ensure_directory(paths['reconvergence_output'])
+            output_path = paths['reconvergence_output'] / f"{base}_reconv.jsonl"
+            # Detection and writing interleave, so they share one span
+            with profiling.span('baseline.stream'):
+                summary = write_reconvergence_lines(iter_reconvergences(G, jobs=jobs), output_path)
+            print(f"[✓] Streamed {summary['total_reconvergences']} reconvergences to {output_path}")
+            return str(output_path)
+        
+        with profiling.span('baseline.detect'):
+            reconvergences = find_reconvergences(G, jobs=jobs)
+        
+        output_filename = f"{base}_reconv.json"
+        
+        with profiling.span('baseline.save'):
+            return save_reconvergence(reconvergences, output_filename)
 
 
 def main():
@@ -6,35 +6,46 @@ This module computes testability metrics for combinational circuits:
 - CC0: Controllability to logic 0
 - CC1: Controllability to logic 1  
 - CO: Observability
+
+Gate rules dispatch on the opcodes of a compiled cell library
+(see cell_library.py) rather than on cell type names.
 """
 
 import os
 import sys
-import re
 import math
 import json
-from collections import defaultdict
+import csv
+import glob
+import io
+import time
+import contextlib
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from ..utils.file_utils import get_project_paths, ensure_directory
+from ..utils.artifact_cache import cached_stage
+from ..utils import profiling
+from .netlist import CompactNetlist, iter_sections
+from .cell_library import (
+    CellLibrary, get_library, OPCODE_NAMES, OP_UNKNOWN, OP_BUF, OP_INV, OP_AND, OP_NAND, OP_OR,
+    OP_NOR, OP_XOR, OP_XNOR, OP_MUX2, OP_MUXI2, OP_AO, OP_AOI, OP_OA, OP_OAI,
+    OP_MAJ, OP_DFF, OP_DFFN, OP_TIE0, OP_TIE1, ROLE_DATA0, ROLE_DATA1,
+    ROLE_SELECT, ROLE_D, ROLE_CLOCK, ROLE_RESET_N, ROLE_SET_N, ROLE_RESET,
+    ROLE_SET, ROLE_OTHER,
+)
 
 
 # Regex & constants
-VECTOR_RE = re.compile(r'^(\w+)\[(\d+):(\d+)\]$')
-GATE_RE = re.compile(r'^\s*(\w+)\s+out\(\s*([^)]+)\)\s+in\(\s*([^)]+)\)\s*$')
+SCOAP_MODES = ('iterative', 'levelized', 'vectorized')
+JSON_FORMATS = ('indented', 'compact', 'lines')
+MANIFEST_SUFFIXES = ('.f', '.lst')
+BATCH_SUMMARY_FIELDS = ('design', 'status', 'seconds', 'gates', 'nets', 'worst_cc0',
+                        'worst_cc1', 'worst_co', 'unreachable', 'error')
 OUTPUT_PORT_NAMES = {'Z', 'ZN', 'Q', 'QN', 'Y', 'S', 'CO'}
 
 
-def expand_vector(signal):
-    """Expand vector notation like A[7:0] into individual signals."""
-    m = VECTOR_RE.match(signal)
-    if not m:
-        return [signal]
-    base, msb, lsb = m.group(1), int(m.group(2)), int(m.group(3))
-    step = -1 if msb >= lsb else 1
-    return [f"{base}[{i}]" for i in range(msb, lsb - step, step)]
-
-
 def read_netlist(path):
     """Read and parse netlist file."""
     try:
@@ -45,45 +56,32 @@ def read_netlist(path):
         sys.exit(1)
 
 
+def load_netlist(path):
+    """Stream a parsed netlist file into a CompactNetlist."""
+    try:
+        return CompactNetlist.from_parsed_file(path)
+    except FileNotFoundError:
+        print(f"Error: cannot open '{path}'", file=sys.stderr)
+        sys.exit(1)
+
+
 def parse_sections(lines):
     """Parse netlist sections: inputs, outputs, gates."""
     inputs = []
     outputs = []
     gates = []
-    section = None
     
-    for lineno, line in enumerate(lines, start=1):
-        if line.startswith('#'):
-            if 'Primary Inputs' in line:
-                section = 'INPUT'
-            elif 'Primary Outputs' in line:
-                section = 'OUTPUT'
-            elif 'Complete Paths' in line:
-                section = 'GATES'
-            else:
-                section = None
-            continue
-            
+    for section, item in iter_sections(lines):
         if section == 'INPUT':
-            for tok in line.split():
-                inputs.extend(expand_vector(tok))
+            inputs.append(item)
         elif section == 'OUTPUT':
-            for tok in line.split():
-                outputs.extend(expand_vector(tok))
-        elif section == 'GATES':
-            m = GATE_RE.match(line)
-            if m:
-                gtype = m.group(1)
-                outs = m.group(2).split()
-                ins = m.group(3).split()
-                for o in outs:
-                    gates.append((gtype, o, ins))
-            else:
-                print(f"[WARN] skipped @{lineno}: {line}", file=sys.stderr)
+            outputs.append(item)
+        else:
+            gates.append(item)
     
     # Reconstruct fanouts for observability
     fanouts = defaultdict(list)
-    for _, o, ins in gates:
+    for _, o, ins, *_ in gates:
         for i in ins:
             fanouts[i].append(o)
     fanout_list = list(fanouts.items())
@@ -94,152 +92,816 @@ def parse_sections(lines):
 def extract_wires(inputs, outputs, gates):
     """Extract all wire names from the netlist."""
     nets = set(inputs) | set(outputs)
-    for _, o, ins in gates:
+    for _, o, ins, *_ in gates:
         nets.add(o)
         nets.update(ins)
     return sorted(nets)
 
 
-def build_controllability(nets, inputs, gates):
-    """Compute SCOAP controllability metrics (CC0, CC1)."""
-    CC0 = {n: (1 if n in inputs else math.inf) for n in nets}
-    CC1 = {n: (1 if n in inputs else math.inf) for n in nets}
-    
+def _others(costs):
+    """For every position, the sum of the costs at all other positions."""
+    n = len(costs)
+    prefix = [0] * (n + 1)
+    suffix = [0] * (n + 1)
+    for k in range(n):
+        prefix[k + 1] = prefix[k] + costs[k]
+        suffix[n - 1 - k] = suffix[n - k] + costs[n - 1 - k]
+    return [prefix[k] + suffix[k + 1] for k in range(n)]
+
+
+def _groups(roles):
+    """Group input positions by role, e.g. the AND groups of an AOI cell."""
+    groups = {}
+    for k, role in enumerate(roles):
+        groups.setdefault(role, []).append(k)
+    return list(groups.values())
+
+
+def _pins(roles, *wanted):
+    """Position of the first input with each wanted role."""
+    return [roles.index(role) for role in wanted]
+
+
+def _flop_costs(roles, c0, c1):
+    """
+    Clock and asynchronous-control costs of a flip-flop.
+
+    Returns:
+        Tuple of (clock, hold, reset, set): the cost of a clock pulse, of
+        keeping every asynchronous control inactive, and of asserting a
+        reset or set (infinity if the cell has none)
+    """
+    clock = hold = 0
+    reset = set_ = math.inf
+    for k, role in enumerate(roles):
+        if role == ROLE_CLOCK:
+            clock += c0[k] + c1[k]
+        elif role in (ROLE_RESET_N, ROLE_SET_N):
+            hold += c1[k]
+            if role == ROLE_RESET_N:
+                reset = min(reset, c0[k])
+            else:
+                set_ = min(set_, c0[k])
+        elif role in (ROLE_RESET, ROLE_SET):
+            hold += c0[k]
+            if role == ROLE_RESET:
+                reset = min(reset, c1[k])
+            else:
+                set_ = min(set_, c1[k])
+    return clock, hold, reset, set_
+
+
+# Controllability rules: (roles, c0, c1) -> (cc0, cc1) before the +1 of the cell
+
+def _cc_xor(roles, c0, c1):
+    e0, e1 = c0[0], c1[0]
+    for a0, a1 in zip(c0[1:], c1[1:]):
+        e0, e1 = min(e0 + a0, e1 + a1), min(e0 + a1, e1 + a0)
+    return e0, e1
+
+
+def _cc_mux(roles, c0, c1):
+    a, b, sel = _pins(roles, ROLE_DATA0, ROLE_DATA1, ROLE_SELECT)
+    return (min(c0[a] + c0[sel], c0[b] + c1[sel]),
+            min(c1[a] + c0[sel], c1[b] + c1[sel]))
+
+
+def _cc_ao(roles, c0, c1):
+    groups = _groups(roles)
+    return (sum(min(c0[k] for k in g) for g in groups),
+            min(sum(c1[k] for k in g) for g in groups))
+
+
+def _cc_oa(roles, c0, c1):
+    groups = _groups(roles)
+    return (min(sum(c0[k] for k in g) for g in groups),
+            sum(min(c1[k] for k in g) for g in groups))
+
+
+def _cc_maj(roles, c0, c1):
+    return (min(c0[0] + c0[1], c0[0] + c0[2], c0[1] + c0[2]),
+            min(c1[0] + c1[1], c1[0] + c1[2], c1[1] + c1[2]))
+
+
+def _cc_dff(roles, c0, c1):
+    d = roles.index(ROLE_D)
+    clock, hold, reset, set_ = _flop_costs(roles, c0, c1)
+    return (min(c0[d] + clock + hold, reset),
+            min(c1[d] + clock + hold, set_))
+
+
+def _cc_unknown(roles, c0, c1):
+    if not c0:
+        raise ValueError("no inputs")
+    cost = sum(min(a, b) for a, b in zip(c0, c1))
+    return cost, cost
+
+
+def _swap(rule):
+    """Rule for the inverted cell: CC0 and CC1 exchanged."""
+    def inverted(roles, c0, c1):
+        cc0, cc1 = rule(roles, c0, c1)
+        return cc1, cc0
+    return inverted
+
+
+CC_RULES = [None] * len(OPCODE_NAMES)
+CC_RULES[OP_UNKNOWN] = _cc_unknown
+CC_RULES[OP_BUF] = lambda roles, c0, c1: (c0[0], c1[0])
+CC_RULES[OP_INV] = lambda roles, c0, c1: (c1[0], c0[0])
+CC_RULES[OP_AND] = lambda roles, c0, c1: (min(c0), sum(c1))
+CC_RULES[OP_NAND] = lambda roles, c0, c1: (sum(c1), min(c0))
+CC_RULES[OP_OR] = lambda roles, c0, c1: (sum(c0), min(c1))
+CC_RULES[OP_NOR] = lambda roles, c0, c1: (min(c1), sum(c0))
+CC_RULES[OP_XOR] = _cc_xor
+CC_RULES[OP_XNOR] = _swap(_cc_xor)
+CC_RULES[OP_MUX2] = _cc_mux
+CC_RULES[OP_MUXI2] = _swap(_cc_mux)
+CC_RULES[OP_AO] = _cc_ao
+CC_RULES[OP_AOI] = _swap(_cc_ao)
+CC_RULES[OP_OA] = _cc_oa
+CC_RULES[OP_OAI] = _swap(_cc_oa)
+CC_RULES[OP_MAJ] = _cc_maj
+CC_RULES[OP_DFF] = _cc_dff
+CC_RULES[OP_DFFN] = _swap(_cc_dff)
+CC_RULES[OP_TIE0] = lambda roles, c0, c1: (0, math.inf)
+CC_RULES[OP_TIE1] = lambda roles, c0, c1: (math.inf, 0)
+
+
+def _gate_controllability(model, c0, c1):
+    """
+    Evaluate the CC0/CC1 rule for a single gate.
+
+    Args:
+        model: Compiled GateModel of the gate
+        c0: CC0 values of the gate inputs
+        c1: CC1 values of the gate inputs
+
+    Returns:
+        Tuple of (cc0, cc1), or None if the rule does not apply to the pins
+    """
+    try:
+        cc0, cc1 = CC_RULES[model.opcode](model.roles, c0, c1)
+    except (ValueError, IndexError):
+        return None
+    return cc0 + 1, cc1 + 1
+
+
+def _update_controllability(gate, CC0, CC1):
+    """Relax the output of one gate; return True if CC0 or CC1 improved."""
+    model, o, ins = gate
+    new = _gate_controllability(model, [CC0[i] for i in ins], [CC1[i] for i in ins])
+    if new is None:
+        return False
+    changed = False
+    if new[0] < CC0[o]:
+        CC0[o] = new[0]
+        changed = True
+    if new[1] < CC1[o]:
+        CC1[o] = new[1]
+        changed = True
+    return changed
+
+
+def _sweep_controllability(gates, CC0, CC1):
+    """Sweep the gate list repeatedly until no CC value improves."""
     changed = True
+    sweeps = 0
     while changed:
         changed = False
-        for gtype, o, ins in gates:
-            c0 = [CC0[i] for i in ins]
-            c1 = [CC1[i] for i in ins]
-            gt = gtype.upper()
-            
-            try:
-                if 'NAND' in gt:
-                    new0, new1 = 1 + min(c0), 1 + sum(c1)
-                elif 'AND' in gt:
-                    new0, new1 = 1 + sum(c0), 1 + min(c1)
-                elif 'NOR' in gt:
-                    new0, new1 = 1 + sum(c1), 1 + min(c0)
-                elif 'OR' in gt:
-                    new0, new1 = 1 + min(c0), 1 + sum(c1)
-                elif 'XOR' in gt:
-                    a0, b0 = c0
-                    a1, b1 = c1
-                    new0 = 1 + min(a0 + b1, a1 + b0)
-                    new1 = 1 + min(a0 + b0, a1 + b1)
-                elif 'INV' in gt or 'NOT' in gt:
-                    new0, new1 = 1 + c1[0], 1 + c0[0]
-                elif 'BUF' in gt:
-                    new0, new1 = 1 + c0[0], 1 + c1[0]
-                else:
-                    new0, new1 = 1 + c1[0], 1 + c0[0]
-            except:
-                continue
-                
-            if new0 < CC0[o]:
-                CC0[o] = new0
+        sweeps += 1
+        for gate in gates:
+            if _update_controllability(gate, CC0, CC1):
                 changed = True
-            if new1 < CC1[o]:
-                CC1[o] = new1
-                changed = True
-    
+    profiling.add('scoap.cc_sweeps', sweeps)
+
+
+def _worklist_controllability(netlist, gate_ids, models, CC0, CC1):
+    """
+    Solve CC0/CC1 for a set of gates with an event-driven worklist.
+
+    Every gate is evaluated once; afterwards a gate is re-queued only when
+    the CC of the net it reads improves, so the work is bounded by the
+    number of actual updates rather than sweeps x gates.
+
+    Args:
+        netlist: CompactNetlist
+        gate_ids: Gates to solve (e.g. the feedback part of levelize())
+        models: GateModel per gate ID
+        CC0: CC0 list indexed by net ID, updated in place
+        CC1: CC1 list indexed by net ID, updated in place
+
+    Returns:
+        Dictionary of solver statistics: gates, evaluations, updates and
+        peak_queue
+    """
+    member = bytearray(netlist.num_gates)
+    for g in gate_ids:
+        member[g] = 1
+    queued = bytearray(member)
+    queue = deque(gate_ids)
+    fanout_offsets, fanout_gates = netlist.fanout_offsets, netlist.fanout_gates
+    gate_output = netlist.gate_output
+    evaluations = updates = 0
+    peak = len(queue)
+
+    while queue:
+        g = queue.popleft()
+        queued[g] = 0
+        evaluations += 1
+        o = gate_output[g]
+        if _update_controllability((models[g], o, netlist.fanin(g)), CC0, CC1):
+            updates += 1
+            for k in range(fanout_offsets[o], fanout_offsets[o + 1]):
+                r = fanout_gates[k]
+                if member[r] and not queued[r]:
+                    queued[r] = 1
+                    queue.append(r)
+            if len(queue) > peak:
+                peak = len(queue)
+
+    return {'gates': len(gate_ids), 'evaluations': evaluations,
+            'updates': updates, 'peak_queue': peak}
+
+
+def _init_controllability(nets, inputs):
+    """Initial CC0/CC1 tables: 1 for primary inputs, infinity elsewhere."""
+    input_set = set(inputs)
+    CC0 = {n: (1 if n in input_set else math.inf) for n in nets}
+    CC1 = {n: (1 if n in input_set else math.inf) for n in nets}
+    return CC0, CC1
+
+
+def _pack_controllability(nets, CC0, CC1):
+    """Flatten CC0/CC1 tables into the CC0_<net>/CC1_<net> result dict."""
     ctrl = {f"CC0_{n}": CC0[n] for n in nets}
     ctrl.update({f"CC1_{n}": CC1[n] for n in nets})
     return ctrl
 
 
-def build_observability(nets, outputs, fanout_list, ctrl, gates):
-    """Compute SCOAP observability metrics (CO)."""
-    CO = {n: (1 if n in outputs else math.inf) for n in nets}
-    
+def _bind_gates(gates, library=None):
+    """Pair a gate list with its compiled models: (model, output, inputs) tuples."""
+    models = get_library(library).bind(gates)
+    return [(model, gate[1], gate[2]) for model, gate in zip(models, gates)]
+
+
+def _indexed_gates(netlist, gate_ids, models):
+    """Yield (model, output_id, input_ids) tuples for the given gate IDs."""
+    for g in gate_ids:
+        yield models[g], netlist.gate_output[g], netlist.fanin(g)
+
+
+def levelize_gates(gates):
+    """
+    Order gates so that every gate comes after all drivers of its inputs.
+
+    See CompactNetlist.levelize; gate IDs are indices into the gate list.
+
+    Args:
+        gates: List of (gate_type, output, inputs) tuples
+
+    Returns:
+        Tuple of (order, feedback) arrays of gate indices
+    """
+    return CompactNetlist.from_gates((), (), gates).levelize()
+
+
+def compute_controllability(netlist, order=None, models=None, stats=None):
+    """
+    Compute CC0/CC1 over a CompactNetlist in a single levelized forward pass.
+
+    Gates reported as feedback by CompactNetlist.levelize are solved with
+    an event-driven worklist after the acyclic part, whose values are final
+    by then.
+
+    Args:
+        netlist: CompactNetlist
+        order: Optional (order, feedback) to use instead of netlist.levelize()
+        models: Optional GateModel per gate ID (default: built-in library)
+        stats: Optional dictionary; receives the feedback solver
+               statistics under 'cc' (see _worklist_controllability)
+
+    Returns:
+        Tuple of (CC0, CC1) lists indexed by net ID
+    """
+    ordered, feedback = order if order is not None else netlist.levelize()
+    models = models if models is not None else get_library().bind_netlist(netlist)
+
+    CC0 = [math.inf] * netlist.num_nets
+    CC1 = [math.inf] * netlist.num_nets
+    for n in netlist.inputs:
+        CC0[n] = CC1[n] = 1
+
+    for gate in _indexed_gates(netlist, ordered, models):
+        _update_controllability(gate, CC0, CC1)
+    solver = _worklist_controllability(netlist, feedback, models, CC0, CC1)
+    if stats is not None:
+        stats['cc'] = solver
+    return CC0, CC1
+
+
+def build_controllability(nets, inputs, gates, library=None):
+    """Compute SCOAP controllability metrics (CC0, CC1)."""
+    CC0, CC1 = _init_controllability(nets, inputs)
+    _sweep_controllability(_bind_gates(gates, library), CC0, CC1)
+    return _pack_controllability(nets, CC0, CC1)
+
+
+def build_controllability_levelized(nets, inputs, gates, order=None, library=None):
+    """
+    Compute SCOAP controllability in a single levelized forward pass.
+
+    Produces the same values as build_controllability.
+
+    Args:
+        nets: All net names
+        inputs: Primary input names
+        gates: List of (gate_type, output, inputs) tuples
+        order: Optional result of levelize_gates(gates) to reuse
+        library: Optional CellLibrary or library file
+
+    Returns:
+        Dictionary of CC0_<net>/CC1_<net> values
+    """
+    netlist = CompactNetlist.from_gates(inputs, (), gates, nets)
+    CC0, CC1 = compute_controllability(netlist, order, get_library(library).bind(gates))
+    names = netlist.net_names
+    return _pack_controllability(nets, dict(zip(names, CC0)), dict(zip(names, CC1)))
+
+
+# Observability rules: (roles, c0, c1) -> [(input position, side cost)], where
+# the side cost sensitizes the cell to that input
+
+def _co_first(roles, c0, c1):
+    return [(0, 0)] if c0 else []
+
+
+def _co_sides(costs):
+    return list(enumerate(_others(costs)))
+
+
+def _co_mux(roles, c0, c1):
+    a, b, sel = _pins(roles, ROLE_DATA0, ROLE_DATA1, ROLE_SELECT)
+    return [(a, c0[sel]), (b, c1[sel]),
+            (sel, min(c0[a] + c1[b], c1[a] + c0[b]))]
+
+
+def _co_grouped(roles, inner, outer):
+    """
+    Side costs for AO/OA-style cells.
+
+    Args:
+        inner: Per-input cost of holding the other inputs of its group
+               non-controlling
+        outer: Per-input cost of making a whole group non-controlling
+    """
+    groups = _groups(roles)
+    group_cost = [min(outer[k] for k in g) for g in groups]
+    rest = _others(group_cost)
+    sides = []
+    for gi, g in enumerate(groups):
+        for k, side in zip(g, _others([inner[k] for k in g])):
+            sides.append((k, side + rest[gi]))
+    return sides
+
+
+def _co_maj(roles, c0, c1):
+    sides = []
+    for i, (j, k) in enumerate(((1, 2), (0, 2), (0, 1))):
+        sides.append((i, min(c0[j] + c1[k], c1[j] + c0[k])))
+    return sides
+
+
+def _co_dff(roles, c0, c1):
+    d = roles.index(ROLE_D)
+    clock, hold, _, _ = _flop_costs(roles, c0, c1)
+    sides = []
+    for k, role in enumerate(roles):
+        if role == ROLE_D:
+            sides.append((k, clock + hold))
+        elif role == ROLE_CLOCK:
+            sides.append((k, min(c0[d], c1[d]) + hold))
+        elif role != ROLE_OTHER:
+            # Observe an asynchronous control against the opposite data value
+            others = [(c1[j] if r in (ROLE_RESET_N, ROLE_SET_N) else c0[j])
+                      for j, r in enumerate(roles) if j != k and r not in (ROLE_D, ROLE_CLOCK, ROLE_OTHER)]
+            data = c1[d] if role in (ROLE_RESET_N, ROLE_RESET) else c0[d]
+            sides.append((k, data + clock + sum(others)))
+    return sides
+
+
+CO_RULES = [None] * len(OPCODE_NAMES)
+CO_RULES[OP_UNKNOWN] = lambda roles, c0, c1: _co_sides([min(a, b) for a, b in zip(c0, c1)])
+CO_RULES[OP_BUF] = CO_RULES[OP_INV] = _co_first
+CO_RULES[OP_AND] = CO_RULES[OP_NAND] = lambda roles, c0, c1: _co_sides(c1)
+CO_RULES[OP_OR] = CO_RULES[OP_NOR] = lambda roles, c0, c1: _co_sides(c0)
+CO_RULES[OP_XOR] = CO_RULES[OP_XNOR] = CO_RULES[OP_UNKNOWN]
+CO_RULES[OP_MUX2] = CO_RULES[OP_MUXI2] = _co_mux
+CO_RULES[OP_AO] = CO_RULES[OP_AOI] = lambda roles, c0, c1: _co_grouped(roles, c1, c0)
+CO_RULES[OP_OA] = CO_RULES[OP_OAI] = lambda roles, c0, c1: _co_grouped(roles, c0, c1)
+CO_RULES[OP_MAJ] = _co_maj
+CO_RULES[OP_DFF] = CO_RULES[OP_DFFN] = _co_dff
+CO_RULES[OP_TIE0] = CO_RULES[OP_TIE1] = lambda roles, c0, c1: []
+
+
+def _gate_observability(model, ins, coo, CC0, CC1):
+    """
+    Evaluate the CO rule for the inputs of a single gate.
+
+    Args:
+        model: Compiled GateModel of the gate
+        ins: Gate input nets
+        coo: CO of the gate output
+        CC0: Final CC0 table
+        CC1: Final CC1 table
+
+    Returns:
+        List of (input_net, co) candidates
+    """
+    c0 = [CC0[i] for i in ins]
+    c1 = [CC1[i] for i in ins]
+    return [(ins[k], coo + side + 1) for k, side in CO_RULES[model.opcode](model.roles, c0, c1)]
+
+
+def _update_observability(gate, CO, CC0, CC1):
+    """Relax the inputs of one gate; return True if any CO improved."""
+    model, o, ins = gate
+    changed = False
+    for i, v in _gate_observability(model, ins, CO[o], CC0, CC1):
+        if v < CO[i]:
+            CO[i] = v
+            changed = True
+    return changed
+
+
+def _sweep_observability(gates, CO, CC0, CC1):
+    """Sweep the gate list repeatedly until no CO value improves."""
     changed = True
+    sweeps = 0
     while changed:
         changed = False
-        for gtype, o, ins in gates:
-            coo = CO[o]
-            gt = gtype.upper()
-            
-            try:
-                if len(ins) == 1:
-                    v = coo + 1
-                    if v < CO[ins[0]]:
-                        CO[ins[0]] = v
-                        changed = True
-                else:
-                    i1, i2 = ins[0], ins[1]
-                    c0_i1, c1_i1 = ctrl[f"CC0_{i1}"], ctrl[f"CC1_{i1}"]
-                    c0_i2, c1_i2 = ctrl[f"CC0_{i2}"], ctrl[f"CC1_{i2}"]
-                    
-                    if 'AND' in gt or 'NAND' in gt:
-                        n1 = coo + c1_i2 + 1
-                        n2 = coo + c1_i1 + 1
-                    elif 'OR' in gt or 'NOR' in gt:
-                        n1 = coo + c0_i2 + 1
-                        n2 = coo + c0_i1 + 1
-                    elif 'XOR' in gt or 'XNOR' in gt:
-                        m = min(c0_i2 + c1_i2, c0_i1 + c1_i1)
-                        n1 = n2 = coo + m + 1
-                    else:
-                        n1 = n2 = coo + 1
-                        
-                    if n1 < CO[i1]:
-                        CO[i1] = n1
-                        changed = True
-                    if n2 < CO[i2]:
-                        CO[i2] = n2
-                        changed = True
-            except:
-                continue
-    
+        sweeps += 1
+        for gate in gates:
+            if _update_observability(gate, CO, CC0, CC1):
+                changed = True
+    profiling.add('scoap.co_sweeps', sweeps)
+
+
+def _worklist_observability(netlist, gate_ids, models, CO, CC0, CC1):
+    """
+    Solve CO for a set of gates with an event-driven worklist.
+
+    A gate is re-queued only when the CO of its output improves, i.e. the
+    drivers of a net are revisited when one of its readers makes it more
+    observable.
+
+    Args:
+        netlist: CompactNetlist
+        gate_ids: Gates to solve (e.g. the feedback part of levelize())
+        models: GateModel per gate ID
+        CO: CO list indexed by net ID, updated in place
+        CC0: Final CC0 list indexed by net ID
+        CC1: Final CC1 list indexed by net ID
+
+    Returns:
+        Dictionary of solver statistics: gates, evaluations, updates and
+        peak_queue
+    """
+    member = bytearray(netlist.num_gates)
+    for g in gate_ids:
+        member[g] = 1
+    queued = bytearray(member)
+    queue = deque(gate_ids)
+    driver_offsets, driver_gates = netlist.driver_offsets, netlist.driver_gates
+    gate_output = netlist.gate_output
+    evaluations = updates = 0
+    peak = len(queue)
+
+    while queue:
+        g = queue.popleft()
+        queued[g] = 0
+        evaluations += 1
+        for i, v in _gate_observability(models[g], netlist.fanin(g), CO[gate_output[g]], CC0, CC1):
+            if v < CO[i]:
+                CO[i] = v
+                updates += 1
+                for k in range(driver_offsets[i], driver_offsets[i + 1]):
+                    d = driver_gates[k]
+                    if member[d] and not queued[d]:
+                        queued[d] = 1
+                        queue.append(d)
+        if len(queue) > peak:
+            peak = len(queue)
+
+    return {'gates': len(gate_ids), 'evaluations': evaluations,
+            'updates': updates, 'peak_queue': peak}
+
+
+def _init_observability(nets, outputs):
+    """Initial CO table: 1 for primary outputs, infinity elsewhere."""
+    output_set = set(outputs)
+    return {n: (1 if n in output_set else math.inf) for n in nets}
+
+
+def _unpack_controllability(nets, ctrl):
+    """Split a CC0_<net>/CC1_<net> result dict back into per-net tables."""
+    CC0 = {n: ctrl[f"CC0_{n}"] for n in nets}
+    CC1 = {n: ctrl[f"CC1_{n}"] for n in nets}
+    return CC0, CC1
+
+
+def build_observability(nets, outputs, fanout_list, ctrl, gates, library=None):
+    """Compute SCOAP observability metrics (CO)."""
+    CO = _init_observability(nets, outputs)
+    CC0, CC1 = _unpack_controllability(nets, ctrl)
+    _sweep_observability(_bind_gates(gates, library), CO, CC0, CC1)
     return {f"CO_{n}": CO[n] for n in nets}
 
 
-def write_scoap(ctrl, obs, filename):
-    """Write SCOAP results to text file."""
+def compute_observability(netlist, CC0, CC1, order=None, models=None, stats=None):
+    """
+    Compute CO over a CompactNetlist in a single reverse-levelized pass.
+
+    Readers of a feedback gate's output are always feedback gates
+    themselves, so the feedback part is solved first with an event-driven
+    worklist; the acyclic gates are then visited exactly once, from the
+    primary outputs backwards, when the CO of their output is already final.
+
+    Args:
+        netlist: CompactNetlist
+        CC0: Final CC0 list indexed by net ID
+        CC1: Final CC1 list indexed by net ID
+        order: Optional (order, feedback) to use instead of netlist.levelize()
+        models: Optional GateModel per gate ID (default: built-in library)
+        stats: Optional dictionary; receives the feedback solver
+               statistics under 'co' (see _worklist_observability)
+
+    Returns:
+        CO list indexed by net ID
+    """
+    ordered, feedback = order if order is not None else netlist.levelize()
+    models = models if models is not None else get_library().bind_netlist(netlist)
+
+    CO = [math.inf] * netlist.num_nets
+    for n in netlist.outputs:
+        CO[n] = 1
+
+    solver = _worklist_observability(netlist, feedback, models, CO, CC0, CC1)
+    if stats is not None:
+        stats['co'] = solver
+    for gate in _indexed_gates(netlist, reversed(ordered), models):
+        _update_observability(gate, CO, CC0, CC1)
+    return CO
+
+
+def build_observability_levelized(nets, outputs, ctrl, gates, order=None, library=None):
+    """
+    Compute SCOAP observability in a single reverse-levelized pass.
+
+    Produces the same values as build_observability.
+
+    Args:
+        nets: All net names
+        outputs: Primary output names
+        ctrl: Controllability results (CC0_<net>/CC1_<net>)
+        gates: List of (gate_type, output, inputs) tuples
+        order: Optional result of levelize_gates(gates) to reuse
+        library: Optional CellLibrary or library file
+
+    Returns:
+        Dictionary of CO_<net> values
+    """
+    netlist = CompactNetlist.from_gates((), outputs, gates, nets)
+    CC0 = [ctrl[f"CC0_{n}"] for n in netlist.net_names]
+    CC1 = [ctrl[f"CC1_{n}"] for n in netlist.net_names]
+    CO = compute_observability(netlist, CC0, CC1, order, get_library(library).bind(gates))
+    return {f"CO_{n}": CO[netlist.net_ids[n]] for n in nets}
+
+
+def format_solver_stats(stats):
+    """One-line summary of the feedback worklist statistics from compute_*."""
+    parts = []
+    for key, label in (('cc', 'CC'), ('co', 'CO')):
+        st = stats.get(key)
+        if st:
+            parts.append(f"{label} {st['evaluations']} evaluations / {st['updates']} updates "
+                         f"(peak queue {st['peak_queue']})")
+    gates = max(st['gates'] for st in stats.values())
+    return f"[✓] Feedback worklist over {gates} gates converged: " + ", ".join(parts)
+
+
+def pack_results(netlist, CC0, CC1, CO):
+    """
+    Convert per-net-ID metric lists into the ctrl/obs result dictionaries.
+
+    Returns:
+        Tuple of (ctrl, obs) keyed CC0_<net>/CC1_<net> and CO_<net>
+    """
+    names = netlist.net_names
+    ctrl = {f"CC0_{n}": v for n, v in zip(names, CC0)}
+    ctrl.update({f"CC1_{n}": v for n, v in zip(names, CC1)})
+    obs = {f"CO_{n}": v for n, v in zip(names, CO)}
+    return ctrl, obs
+
+
+def write_scoap_columns(names, CC0, CC1, CO, filename):
+    """
+    Stream SCOAP results to a text file.
+
+    The net order is computed once and each section is written as it is
+    walked, so no per-section key lists or strings are built in memory.
+
+    Args:
+        names: Net names
+        CC0, CC1, CO: Metric sequences aligned with names
+        filename: Output path
+    """
+    order = sorted(range(len(names)), key=names.__getitem__)
     with open(filename, 'w') as f:
-        f.write("--- SCOAP CONTROLLABILITY (CC0) ---\n")
-        for k in sorted(ctrl):
-            if k.startswith("CC0_"):
-                f.write(f"{k}: {ctrl[k]}\n")
-        f.write("\n--- SCOAP CONTROLLABILITY (CC1) ---\n")
-        for k in sorted(ctrl):
-            if k.startswith("CC1_"):
-                f.write(f"{k}: {ctrl[k]}\n")
-        f.write("\n--- SCOAP OBSERVABILITY (CO) ---\n")
-        for k in sorted(obs):
-            f.write(f"{k}: {obs[k]}\n")
+        for label, prefix, values in (("CONTROLLABILITY (CC0)", "CC0", CC0),
+                                      ("CONTROLLABILITY (CC1)", "CC1", CC1),
+                                      ("OBSERVABILITY (CO)", "CO", CO)):
+            if prefix != "CC0":
+                f.write("\n")
+            f.write(f"--- SCOAP {label} ---\n")
+            for i in order:
+                f.write(f"{prefix}_{names[i]}: {values[i]}\n")
     print(f"[✓] SCOAP results written to: {filename}")
 
 
-def dump_json(ctrl, obs, inputs, outputs, gates, filename):
-    """Write SCOAP results to JSON file."""
-    data = {
-        "primary_inputs": inputs,
-        "primary_outputs": outputs,
-        "metrics": []
-    }
-    
-    for idx, (gtype, o, ins) in enumerate(gates):
-        entry = {
-            "gate": f"{gtype}_{idx}",
-            "output": o,
-            "inputs": ins,
-            "cc0": ctrl.get(f"CC0_{o}", None),
-            "cc1": ctrl.get(f"CC1_{o}", None),
-            "co": obs.get(f"CO_{o}", None)
-        }
-        
-        for key in ("cc0", "cc1", "co"):
-            if entry[key] is None or (isinstance(entry[key], float) and math.isinf(entry[key])):
-                entry[key] = "Infinity"
-        data["metrics"].append(entry)
-    
+def write_scoap(ctrl, obs, filename):
+    """Write SCOAP results (as returned by the build functions) to text file."""
+    names = [k[3:] for k in obs]
+    write_scoap_columns(names,
+                        _KeyedColumn(ctrl, "CC0_", names),
+                        _KeyedColumn(ctrl, "CC1_", names),
+                        _KeyedColumn(obs, "CO_", names),
+                        filename)
+
+
+class _KeyedColumn:
+    """Index-addressed view of one metric in a ctrl/obs result dictionary."""
+
+    def __init__(self, results, prefix, names):
+        self.results = results
+        self.prefix = prefix
+        self.names = names
+
+    def __getitem__(self, i):
+        return self.results.get(self.prefix + self.names[i])
+
+
+def _json_metric(v):
+    if v is None or (isinstance(v, float) and math.isinf(v)):
+        return "Infinity"
+    return v
+
+
+def _indent_json(obj, indent, level):
+    """json.dumps(obj) as it appears nested `level` deep in an indented document."""
+    text = json.dumps(obj, indent=indent)
+    return text.replace("\n", "\n" + " " * (indent * level))
+
+
+def dump_json_columns(net_ids, CC0, CC1, CO, inputs, outputs, gates, filename,
+                      json_format='indented'):
+    """
+    Stream SCOAP results to a JSON or JSON Lines file.
+
+    Metric entries are serialized one gate at a time as `gates` is
+    iterated; only the names of the driven nets are kept. Nets that no
+    gate drives (primary inputs and floating nets) follow as
+    {"net", "cc0", "cc1", "co"} records under "input_metrics", so the file
+    covers the same nets as the text and .scoap results.
+
+    Args:
+        net_ids: Mapping of net name -> index into the metric sequences
+        CC0, CC1, CO: Per-net metric sequences
+        inputs, outputs: Primary input and output names
+        gates: Iterable of (gate_type, output, inputs) tuples
+        filename: Output path
+        json_format: One of JSON_FORMATS: 'indented' (the 4-space layout of
+                     json.dump(..., indent=4)), 'compact' (a single line) or
+                     'lines' (JSON Lines: a header record with the primary
+                     inputs and outputs, one record per gate, then one
+                     record per undriven net)
+    """
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+
+    driven = set()
+
+    def entries():
+        for idx, (gtype, o, ins, *_) in enumerate(gates):
+            driven.add(o)
+            i = net_ids.get(o)
+            yield {
+                "gate": f"{gtype}_{idx}",
+                "output": o,
+                "inputs": ins,
+                "cc0": _json_metric(None if i is None else CC0[i]),
+                "cc1": _json_metric(None if i is None else CC1[i]),
+                "co": _json_metric(None if i is None else CO[i]),
+            }
+
+    def input_entries():
+        # Only valid once entries() has been consumed
+        for n, i in net_ids.items():
+            if n not in driven:
+                yield {"net": n, "cc0": _json_metric(CC0[i]), "cc1": _json_metric(CC1[i]),
+                       "co": _json_metric(CO[i])}
+
+    def write_compact(f, records):
+        sep = ""
+        for entry in records:
+            f.write(sep + json.dumps(entry))
+            sep = ", "
+
+    def write_indented(f, records):
+        sep = "\n"
+        for entry in records:
+            f.write(sep + "        " + _indent_json(entry, 4, 2))
+            sep = ",\n"
+        f.write("\n    ]" if sep == ",\n" else "]")
+
     with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
+        if json_format == 'lines':
+            f.write(json.dumps({"primary_inputs": inputs, "primary_outputs": outputs}) + "\n")
+            for entry in entries():
+                f.write(json.dumps(entry) + "\n")
+            for entry in input_entries():
+                f.write(json.dumps(entry) + "\n")
+        elif json_format == 'compact':
+            f.write(f'{{"primary_inputs": {json.dumps(inputs)}, '
+                    f'"primary_outputs": {json.dumps(outputs)}, "metrics": [')
+            write_compact(f, entries())
+            f.write('], "input_metrics": [')
+            write_compact(f, input_entries())
+            f.write("]}")
+        else:
+            f.write('{\n'
+                    f'    "primary_inputs": {_indent_json(inputs, 4, 1)},\n'
+                    f'    "primary_outputs": {_indent_json(outputs, 4, 1)},\n'
+                    '    "metrics": [')
+            write_indented(f, entries())
+            f.write(',\n    "input_metrics": [')
+            write_indented(f, input_entries())
+            f.write("\n}")
     print(f"[✓] JSON SCOAP written to: {filename}")
 
 
-def run(input_filename, output_filename, json_flag=False):
+def dump_json(ctrl, obs, inputs, outputs, gates, filename, json_format='indented'):
+    """Write SCOAP results (as returned by the build functions) to JSON file."""
+    names = [k[3:] for k in obs]
+    net_ids = {n: i for i, n in enumerate(names)}
+    dump_json_columns(net_ids,
+                      _KeyedColumn(ctrl, "CC0_", names),
+                      _KeyedColumn(ctrl, "CC1_", names),
+                      _KeyedColumn(obs, "CO_", names),
+                      inputs, outputs, gates, filename, json_format)
+
+
+def solve_netlist(netlist, mode='levelized', library=None):
+    """
+    Compute per-net SCOAP metrics of a CompactNetlist.
+
+    Args:
+        netlist: CompactNetlist
+        mode: 'levelized' or 'vectorized' (falls back to levelized when
+              values overflow the NumPy representation)
+        library: Optional CellLibrary or cell library file
+
+    Returns:
+        Tuple of (CC0, CC1, CO) lists indexed by net ID
+    """
+    with profiling.span('scoap.bind'):
+        models = get_library(library).bind_netlist(netlist)
+    if mode == 'vectorized':
+        from . import scoap_vectorized as vectorized
+        try:
+            with profiling.span('scoap.controllability'):
+                vn = vectorized.VectorNetlist(netlist, models)
+                CC0, CC1 = vectorized.compute_controllability(netlist, vn)
+            with profiling.span('scoap.observability'):
+                CO = vectorized.compute_observability(netlist, CC0, CC1, vn)
+            return tuple(map(vectorized.to_metric_list, (CC0, CC1, CO)))
+        except OverflowError as e:
+            print(f"[WARN] {e}; falling back to levelized mode", file=sys.stderr)
+    stats = {}
+    with profiling.span('scoap.controllability'):
+        CC0, CC1 = compute_controllability(netlist, models=models, stats=stats)
+    with profiling.span('scoap.observability'):
+        CO = compute_observability(netlist, CC0, CC1, models=models, stats=stats)
+    if stats['cc']['gates']:
+        print(format_solver_stats(stats))
+        for key in ('cc', 'co'):
+            profiling.add(f"scoap.{key}_worklist_evaluations", stats[key]['evaluations'])
+            profiling.add(f"scoap.{key}_worklist_updates", stats[key]['updates'])
+    return CC0, CC1, CO
+
+
+def run(input_filename, output_filename, json_flag=False, mode='levelized', library=None,
+        store_flag=False, json_format='indented', summary=None):
     """
     Main SCOAP analysis function.
     
@@ -247,42 +909,304 @@ def run(input_filename, output_filename, json_flag=False):
         input_filename: Name of parsed netlist file 
         output_filename: Name of output file
         json_flag: Whether to also generate JSON output
+        mode: SCOAP engine, one of SCOAP_MODES ('levelized' computes
+              CC in one forward pass and CO in one reverse pass over a
+              gate order computed once and solves feedback loops with an
+              event-driven worklist, 'vectorized' evaluates each level
+              with NumPy array operations, 'iterative' uses the original
+              repeated full sweeps)
+        library: Optional CellLibrary or cell library file; cells not
+                 listed are inferred from standard-cell names
+        store_flag: Whether to also write a memory-mapped binary store
+                    (<output>.scoap, see scoap_store.ScoapStore)
+        json_format: JSON layout, one of JSON_FORMATS ('lines' writes
+                     <output>.jsonl)
+        summary: Optional dictionary filled with the gate count and the
+                 summarize_metrics() figures of the design
     
     Returns:
         Path to the generated text output file
     """
+    if mode not in SCOAP_MODES:
+        raise ValueError(f"Unknown SCOAP mode '{mode}', expected one of {SCOAP_MODES}")
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+    
     paths = get_project_paths()
     input_path = paths['parsed'] / input_filename
     ensure_directory(paths['results'])
+    base = Path(output_filename).stem
     output_path_txt = paths['results'] / output_filename
+    suffix = 'jsonl' if json_format == 'lines' else 'json'
+    json_path = paths['results'] / f"{base}.{suffix}" if json_flag else None
+    store_path = paths['results'] / f"{base}.scoap" if store_flag else None
     
-    lines = read_netlist(input_path)
-    inputs, outputs, fanout_list, gates = parse_sections(lines)
-    nets = extract_wires(inputs, outputs, gates)
-    ctrl = build_controllability(nets, inputs, gates)
-    obs = build_observability(nets, outputs, fanout_list, ctrl, gates)
-    write_scoap(ctrl, obs, output_path_txt)
+    def build():
+        _run_scoap(input_path, output_path_txt, json_path, store_path, mode, library,
+                   json_format, state)
     
-    if json_flag:
-        base = Path(output_filename).stem
-        json_path = paths['results'] / f"{base}.json"
-        dump_json(ctrl, obs, inputs, outputs, gates, json_path)
+    state = {}
+    if isinstance(library, CellLibrary):
+        with profiling.span('scoap'):
+            build()
+    else:
+        # Results only depend on the netlist, the library and the options
+        inputs = [input_path] + ([library] if library is not None else [])
+        outputs = [p for p in (output_path_txt, json_path, store_path) if p is not None]
+        cached_stage('scoap', inputs, outputs, build,
+                     {'mode': mode, 'json': json_flag, 'format': json_format, 'store': store_flag},
+                     state)
+    if summary is not None:
+        summary.update(state)
     
     return str(output_path_txt)
 
 
+def _run_scoap(input_path, output_path_txt, json_path, store_path, mode, library, json_format,
+               summary):
+    """Compute SCOAP for one parsed netlist and write the requested outputs (see run)."""
+    library = get_library(library)
+    
+    if mode == 'iterative':
+        with profiling.span('scoap.load'):
+            lines = read_netlist(input_path)
+            inputs, outputs, fanout_list, gates = parse_sections(lines)
+            nets = extract_wires(inputs, outputs, gates)
+        with profiling.span('scoap.controllability'):
+            ctrl = build_controllability(nets, inputs, gates, library)
+        with profiling.span('scoap.observability'):
+            obs = build_observability(nets, outputs, fanout_list, ctrl, gates, library)
+        names = [k[3:] for k in obs]
+        net_ids = {n: i for i, n in enumerate(names)}
+        CC0 = _KeyedColumn(ctrl, "CC0_", names)
+        CC1 = _KeyedColumn(ctrl, "CC1_", names)
+        CO = _KeyedColumn(obs, "CO_", names)
+        num_gates = len(gates)
+    else:
+        # Stream the file straight into the compact netlist
+        with profiling.span('scoap.load'):
+            netlist = load_netlist(input_path)
+        inputs = [netlist.net_names[n] for n in netlist.inputs]
+        outputs = [netlist.net_names[n] for n in netlist.outputs]
+        gates = netlist.gates()
+        CC0, CC1, CO = solve_netlist(netlist, mode, library)
+        names, net_ids = netlist.net_names, netlist.net_ids
+        num_gates = netlist.num_gates
+    summary['gates'] = num_gates
+    summary.update(summarize_metrics(names, CC0, CC1, CO))
+    with profiling.span('scoap.write'):
+        write_scoap_columns(names, CC0, CC1, CO, output_path_txt)
+        
+        if json_path is not None:
+            dump_json_columns(net_ids, CC0, CC1, CO, inputs, outputs, gates, json_path, json_format)
+        
+        if store_path is not None:
+            from .scoap_store import write_store
+            write_store(names, CC0, CC1, CO, store_path)
+
+
+def summarize_metrics(names, CC0, CC1, CO):
+    """
+    Worst-case figures of a design's SCOAP results.
+
+    Returns:
+        Dictionary with the net count, the largest finite CC0, CC1 and CO
+        (None if every value is unreachable) and the number of nets with
+        at least one unreachable metric
+    """
+    worst = [None, None, None]
+    unreachable = 0
+    for i in range(len(names)):
+        row = (CC0[i], CC1[i], CO[i])
+        if math.inf in row:
+            unreachable += 1
+        for k, v in enumerate(row):
+            if v != math.inf and (worst[k] is None or v > worst[k]):
+                worst[k] = v
+    return {'nets': len(names), 'worst_cc0': worst[0], 'worst_cc1': worst[1],
+            'worst_co': worst[2], 'unreachable': unreachable}
+
+
+def collect_netlists(sources):
+    """
+    Expand batch inputs into an ordered list of parsed netlist files.
+
+    Args:
+        sources: Glob patterns, directories (all *.txt files), manifests
+                 (MANIFEST_SUFFIXES; one netlist or pattern per line, '#'
+                 comments) or single files. Relative paths are resolved
+                 against data/parsed/ (or the manifest's directory) first,
+                 then against the working directory.
+
+    Returns:
+        List of Path objects, without duplicates
+
+    Raises:
+        FileNotFoundError: If a source matches no netlist
+    """
+    parsed_dir = get_project_paths()['parsed']
+    files = []
+
+    def expand(source, base, listed=False):
+        if glob.has_magic(source):
+            matches = sorted(glob.glob(str(base / source), recursive=True)) or \
+                sorted(glob.glob(source, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No netlists match '{source}'")
+            files.extend(Path(m) for m in matches)
+            return
+        path = base / source
+        if not path.exists() and Path(source).exists():
+            path = Path(source)
+        if path.is_dir():
+            files.extend(sorted(path.glob('*.txt')))
+        elif path.suffix in MANIFEST_SUFFIXES:
+            with open(path) as f:
+                for line in f:
+                    entry = line.split('#', 1)[0].strip()
+                    if entry:
+                        expand(entry, path.parent if (path.parent / entry).exists() else parsed_dir,
+                               listed=True)
+        elif path.is_file() or listed:
+            # A missing manifest entry is reported as a failed design
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Netlist not found: {source}")
+
+    for source in sources:
+        expand(str(source), parsed_dir)
+    unique = {}
+    for f in files:
+        unique.setdefault(f.resolve(), f)
+    return list(unique.values())
+
+
+def _batch_design(path, mode, library, json_flag, store_flag, json_format):
+    """Analyze one design of a batch; never raises so failures stay per design."""
+    record = {'design': str(path), 'status': 'ok', 'error': ''}
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            run(Path(path).resolve(), f"{Path(path).stem}_scoap.txt", json_flag, mode, library,
+                store_flag, json_format, summary=record)
+    except SystemExit:
+        # read_netlist/load_netlist report unreadable files and exit
+        record['status'] = 'failed'
+        record['error'] = (log.getvalue().strip().splitlines() or ['exited'])[-1]
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = round(time.perf_counter() - start, 3)
+    record['log'] = log.getvalue()
+    return record
+
+
+def format_batch_summary(records):
+    """Fixed-width summary table of run_batch records."""
+    def cell(v):
+        return '-' if v is None or v == '' else v
+
+    width = max([len(Path(r['design']).name) for r in records] + [6])
+    lines = [f"{'design':<{width}}  {'status':<6}  {'seconds':>8}  {'gates':>8}  "
+             f"{'worst CC0':>9}  {'worst CC1':>9}  {'worst CO':>9}  {'unreach':>7}"]
+    for r in records:
+        lines.append(f"{Path(r['design']).name:<{width}}  {r['status']:<6}  {r['seconds']:>8.3f}  "
+                     f"{cell(r.get('gates')):>8}  {cell(r.get('worst_cc0')):>9}  "
+                     f"{cell(r.get('worst_cc1')):>9}  {cell(r.get('worst_co')):>9}  "
+                     f"{cell(r.get('unreachable')):>7}")
+        if r['error']:
+            lines.append(f"{'':<{width}}  {r['error']}")
+    return "\n".join(lines)
+
+
+def run_batch(sources, mode='levelized', library=None, jobs=None, json_flag=False,
+              store_flag=False, json_format='indented', summary_filename='scoap_batch_summary.csv'):
+    """
+    Run SCOAP over many designs in a process pool.
+
+    Each design is analyzed by run() in a worker process and writes
+    data/results/<design>_scoap.txt (plus JSON and store outputs as
+    requested). A failing design, including a crashed worker, is recorded
+    and does not stop the rest of the batch.
+
+    Args:
+        sources: Glob patterns, directories or manifests (see collect_netlists)
+        mode, library, json_flag, store_flag, json_format: See run()
+        jobs: Number of worker processes (default: CPU count); 1 runs in-process
+        summary_filename: Name of the CSV summary written to data/results/
+
+    Returns:
+        List of per-design records (BATCH_SUMMARY_FIELDS plus the captured
+        log), in input order
+    """
+    if mode not in SCOAP_MODES:
+        raise ValueError(f"Unknown SCOAP mode '{mode}', expected one of {SCOAP_MODES}")
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+
+    files = collect_netlists(sources)
+    jobs = min(jobs or os.cpu_count() or 1, len(files) or 1)
+    if isinstance(library, (str, Path)):
+        library = str(Path(library).resolve())
+    options = (mode, library, json_flag, store_flag, json_format)
+
+    start = time.perf_counter()
+    if jobs == 1:
+        records = [_batch_design(f, *options) for f in files]
+    else:
+        records = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_batch_design, f, *options) for f in files]
+            for f, future in zip(files, futures):
+                try:
+                    records.append(future.result())
+                except Exception as e:
+                    records.append({'design': str(f), 'status': 'failed', 'seconds': 0.0,
+                                    'error': f"{type(e).__name__}: {e}", 'log': ''})
+
+    paths = get_project_paths()
+    ensure_directory(paths['results'])
+    summary_path = paths['results'] / summary_filename
+    with open(summary_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+
+    failed = sum(r['status'] != 'ok' for r in records)
+    print(format_batch_summary(records))
+    print(f"[✓] SCOAP batch: {len(records) - failed}/{len(records)} designs "
+          f"(jobs: {jobs}) in {time.perf_counter() - start:.3f}s")
+    if failed:
+        print(f"[WARN] {failed} designs failed", file=sys.stderr)
+    print(f"[✓] Batch summary written to: {summary_path}")
+    return records
+
+
 if __name__ == "__main__":
-    # Simple CLI: python scoap.py input_parsed.txt output.txt [--json]
+    # Simple CLI: python scoap.py input_parsed.txt output.txt [--json] [--json-format=<format>] [--store] [--mode=<mode>] [--library=<file>]
+    #        or:  python scoap.py --batch <glob|dir|manifest>... [--jobs=<n>] [options]
     args = sys.argv[1:]
-    if len(args) < 2:
-        print("Usage: python scoap.py <parsed_input.txt> <output.txt> [--json]", file=sys.stderr)
+    batch = "--batch" in args
+    positional = [a for a in args if not a.startswith('--')]
+    if len(positional) < (1 if batch else 2):
+        print("Usage: python scoap.py <parsed_input.txt> <output.txt> [--json] [--json-format=<format>] [--store] [--mode=<mode>] [--library=<file>]", file=sys.stderr)
+        print("       python scoap.py --batch <glob|dir|manifest>... [--jobs=<n>] [--json] [--json-format=<format>] [--store] [--mode=<mode>] [--library=<file>]", file=sys.stderr)
         sys.exit(1)
     
-    inp, outp = args[0], args[1]
     json_flag = "--json" in args
+    store_flag = "--store" in args
+    mode = next((a.split('=', 1)[1] for a in args if a.startswith('--mode=')), 'levelized')
+    library = next((a.split('=', 1)[1] for a in args if a.startswith('--library=')), None)
+    json_format = next((a.split('=', 1)[1] for a in args if a.startswith('--json-format=')), 'indented')
+    
+    jobs = next((int(a.split('=', 1)[1]) for a in args if a.startswith('--jobs=')), None)
     
     try:
-        result = run(inp, outp, json_flag)
+        if batch:
+            records = run_batch(positional, mode, library, jobs, json_flag, store_flag, json_format)
+            sys.exit(0 if all(r['status'] == 'ok' for r in records) else 1)
+        result = run(positional[0], positional[1], json_flag, mode, library, store_flag, json_format)
         sys.exit(0)
     except Exception as e:
         print(f"[✗] Error: {e}", file=sys.stderr)
@@ -0,0 +1,346 @@
+"""
+Top-K and predicate queries over SCOAP metrics.
+
+A MetricTable wraps per-net CC0, CC1 and CO columns as int64 NumPy arrays
+(unreachable metrics hold scoap_store.INF) from in-memory results, a text
+or JSON result file, or a memory-mapped .scoap store. Queries scan the
+columns in fixed-size chunks: a `where` predicate is evaluated on each
+chunk with array operations, and a bounded heap keeps the K best rows, so
+neither the table nor the matching rows are ever sorted or copied as a
+whole. Net names are only resolved for the rows that are returned.
+
+Example:
+    table = MetricTable.load('data/results/design.scoap')
+    rows, matched = table.top_k(100, by='co', where='cc1 > 50')
+    for row in rows:
+        print(row.net, row.co)
+"""
+
+import ast
+import heapq
+import json
+import math
+import operator
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from .scoap_store import INF, ScoapStore, _encode, _decode
+
+METRICS = ('cc0', 'cc1', 'co', 'cc')
+CHUNK_SIZE = 1 << 16
+
+MetricRow = namedtuple('MetricRow', 'net cc0 cc1 co')
+
+_COMPARE = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+
+
+def compile_predicate(expr):
+    """
+    Compile a `where` expression into a vectorized predicate.
+
+    Expressions compare metrics (cc0, cc1, co, and cc = max(cc0, cc1)) with
+    integers or `inf`, and combine comparisons with and/or/not and
+    parentheses, e.g. "cc1 > 50 and co < inf" or "10 <= co <= 20".
+
+    Args:
+        expr: Predicate string
+
+    Returns:
+        Tuple of (predicate, metrics): a function mapping a dictionary of
+        metric arrays to a boolean mask, and the set of metric names the
+        expression reads (the only keys the dictionary needs)
+
+    Raises:
+        ValueError: If the expression uses anything else
+    """
+    try:
+        tree = ast.parse(expr.strip(), mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid predicate '{expr}': {e.msg}") from None
+    metrics = set()
+
+    def operand(node):
+        if isinstance(node, ast.Name):
+            if node.id in METRICS:
+                metrics.add(node.id)
+                return lambda cols: cols[node.id]
+            if node.id == 'inf':
+                return lambda cols: INF
+        elif isinstance(node, ast.Constant) and type(node.value) is int:
+            value = _encode(node.value)
+            return lambda cols: value
+        raise ValueError(f"Invalid predicate '{expr}': expected a metric "
+                         f"({', '.join(METRICS)}), an integer or inf")
+
+    def build(node):
+        if isinstance(node, ast.BoolOp):
+            parts = [build(v) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return lambda cols: combine.reduce([p(cols) for p in parts])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = build(node.operand)
+            return lambda cols: ~inner(cols)
+        if isinstance(node, ast.Compare):
+            terms = [operand(node.left)] + [operand(c) for c in node.comparators]
+            ops = []
+            for op in node.ops:
+                if type(op) not in _COMPARE:
+                    raise ValueError(f"Invalid predicate '{expr}': unsupported comparison")
+                ops.append(_COMPARE[type(op)])
+
+            def compare(cols):
+                mask = None
+                for op, left, right in zip(ops, terms, terms[1:]):
+                    m = np.asarray(op(left(cols), right(cols)))
+                    mask = m if mask is None else mask & m
+                return mask
+            return compare
+        raise ValueError(f"Invalid predicate '{expr}': expected comparisons joined by and/or/not")
+
+    return build(tree), metrics
+
+
+class _Candidate:
+    """Heap entry of top_k; ranks higher by key, then by smaller net name."""
+
+    __slots__ = ('key', 'net', 'index')
+
+    def __init__(self, key, net, index):
+        self.key = key
+        self.net = net
+        self.index = index
+
+    def __lt__(self, other):
+        if self.key != other.key:
+            return self.key < other.key
+        return self.net > other.net
+
+
+class MetricTable:
+    """
+    Column view of SCOAP metrics for querying.
+
+    Args:
+        name: Function mapping a row index to its net name
+        cc0, cc1, co: int64 arrays of equal length, INF where unreachable
+        source: Object kept alive with the table (e.g. an open ScoapStore)
+    """
+
+    def __init__(self, name, cc0, cc1, co, source=None):
+        self._name = name
+        self._columns = {'cc0': cc0, 'cc1': cc1, 'co': co}
+        self.source = source
+
+    @classmethod
+    def from_columns(cls, names, CC0, CC1, CO):
+        """Table over metric sequences aligned with names (e.g. netlist.net_names)."""
+        columns = [np.fromiter((_encode(v) for v in values), dtype=np.int64, count=len(names))
+                   for values in (CC0, CC1, CO)]
+        return cls(names.__getitem__, *columns)
+
+    @classmethod
+    def from_results(cls, ctrl, obs):
+        """Table over the ctrl/obs dictionaries returned by scoap's build functions."""
+        names = [k[3:] for k in obs]
+        return cls.from_columns(names, [ctrl[f"CC0_{n}"] for n in names],
+                                [ctrl[f"CC1_{n}"] for n in names], list(obs.values()))
+
+    @classmethod
+    def from_store(cls, store):
+        """Zero-copy table over an open ScoapStore."""
+        return cls(store.name, store.column('cc0'), store.column('cc1'), store.column('co'),
+                   source=store)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a saved result file.
+
+        .scoap stores are memory-mapped; .json and .jsonl files yield one row
+        per gate output net and per undriven net (primary inputs); anything
+        else is read as write_scoap text output.
+        """
+        path = Path(path)
+        if path.suffix == '.scoap':
+            return cls.from_store(ScoapStore(path))
+        if path.suffix in ('.json', '.jsonl'):
+            return cls._from_json(path)
+        return cls._from_text(path)
+
+    @classmethod
+    def _from_text(cls, path):
+        names = []
+        columns = []
+        prefixes = ('CC0_', 'CC1_', 'CO_')
+        with open(path) as f:
+            for line in f:
+                if line.startswith('---'):
+                    columns.append([])
+                    continue
+                key, sep, value = line.rstrip('\n').rpartition(': ')
+                if not sep:
+                    continue
+                if not columns or not key.startswith(prefixes[len(columns) - 1]):
+                    raise ValueError(f"Not a SCOAP text result file: {path}")
+                net = key[len(prefixes[len(columns) - 1]):]
+                col = columns[-1]
+                if len(columns) == 1:
+                    names.append(net)
+                elif len(col) >= len(names) or names[len(col)] != net:
+                    raise ValueError(f"SCOAP sections list different nets in {path}")
+                col.append(_encode(math.inf if value == 'inf' else int(value)))
+        if len(columns) != 3 or any(len(c) != len(names) for c in columns):
+            raise ValueError(f"Not a SCOAP text result file: {path}")
+        return cls(names.__getitem__, *(np.array(c, dtype=np.int64) for c in columns))
+
+    @classmethod
+    def _from_json(cls, path):
+        if path.suffix == '.jsonl':
+            with open(path) as f:
+                records = (json.loads(line) for line in f)
+                return cls._from_entries(r for r in records if 'output' in r or 'net' in r)
+        with open(path) as f:
+            data = json.load(f)
+        return cls._from_entries(data['metrics'] + data.get('input_metrics', []))
+
+    @classmethod
+    def _from_entries(cls, entries):
+        """Table over dumped gate ('output') and undriven net ('net') records, in file order."""
+        names = []
+        seen = set()
+        columns = ([], [], [])
+        for entry in entries:
+            net = entry['output'] if 'output' in entry else entry['net']
+            if net in seen:
+                continue
+            seen.add(net)
+            names.append(net)
+            for col, key in zip(columns, ('cc0', 'cc1', 'co')):
+                col.append(INF if entry[key] == "Infinity" else _encode(entry[key]))
+        return cls(names.__getitem__, *(np.array(c, dtype=np.int64) for c in columns))
+
+    def close(self):
+        """Close the underlying store, if any."""
+        if isinstance(self.source, ScoapStore):
+            self.source.close()
+
+    def __len__(self):
+        return len(self._columns['co'])
+
+    def column(self, metric, start=0, stop=None):
+        """int64 array of one metric (see METRICS) over rows start:stop."""
+        if metric == 'cc':
+            return np.maximum(self.column('cc0', start, stop), self.column('cc1', start, stop))
+        if metric not in self._columns:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+        return self._columns[metric][start:stop]
+
+    def row(self, i):
+        """MetricRow of row i; unreachable metrics are math.inf."""
+        cols = self._columns
+        return MetricRow(self._name(i), _decode(int(cols['cc0'][i])),
+                         _decode(int(cols['cc1'][i])), _decode(int(cols['co'][i])))
+
+    def _chunks(self, where, chunk_size):
+        """Yield (start, mask) per chunk; mask is None when there is no predicate."""
+        predicate, metrics = compile_predicate(where) if where else (None, ())
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            if predicate is None:
+                yield start, stop, None
+            else:
+                # Only the columns the predicate reads; cc is derived on demand
+                cols = {m: self.column(m, start, stop) for m in metrics}
+                yield start, stop, np.broadcast_to(predicate(cols), (stop - start,))
+
+    def select(self, where=None, chunk_size=CHUNK_SIZE):
+        """Iterate over the rows matching `where`, in table order."""
+        for start, stop, mask in self._chunks(where, chunk_size):
+            hits = range(start, stop) if mask is None else np.flatnonzero(mask) + start
+            for i in hits:
+                yield self.row(int(i))
+
+    def count(self, where=None, chunk_size=CHUNK_SIZE):
+        """Number of rows matching `where`."""
+        return sum(stop - start if mask is None else int(np.count_nonzero(mask))
+                   for start, stop, mask in self._chunks(where, chunk_size))
+
+    def top_k(self, k, by='co', where=None, largest=True, chunk_size=CHUNK_SIZE):
+        """
+        The K rows with the largest (or smallest) value of one metric.
+
+        Ties are broken by net name, so every result format ranks alike;
+        names are only resolved for rows that reach the heap. Unreachable
+        (infinite) values rank above every finite value.
+
+        Args:
+            k: Number of rows to return
+            by: Ranking metric, one of METRICS
+            where: Optional predicate (see compile_predicate)
+            largest: Rank hardest (largest) first; False ranks easiest first
+            chunk_size: Rows evaluated per vectorized step
+
+        Returns:
+            Tuple of (rows, matched): up to k MetricRows in rank order and
+            the number of rows satisfying `where`
+        """
+        if by not in METRICS:
+            raise ValueError(f"Unknown metric '{by}', expected one of {METRICS}")
+        heap = []
+        matched = 0
+        sign = 1 if largest else -1
+        for start, stop, mask in self._chunks(where, chunk_size):
+            values = self.column(by, start, stop)
+            idx = np.arange(start, stop) if mask is None else np.flatnonzero(mask) + start
+            if mask is not None:
+                values = values[mask]
+            matched += len(idx)
+            if k <= 0:
+                continue
+            if len(heap) == k:
+                # Only rows that can displace the current K-th best are pushed
+                bound = sign * heap[0].key
+                keep = values >= bound if largest else values <= bound
+                values, idx = values[keep], idx[keep]
+            for v, i in zip(values.tolist(), idx.tolist()):
+                candidate = _Candidate(sign * v, self._name(i), i)
+                if len(heap) < k:
+                    heapq.heappush(heap, candidate)
+                elif heap[0] < candidate:
+                    heapq.heapreplace(heap, candidate)
+        ranked = sorted(heap, reverse=True)
+        return [self.row(c.index) for c in ranked], matched
+
+
+def format_rows(rows):
+    """Fixed-width table of MetricRows for terminal output."""
+    width = max([len(r.net) for r in rows] + [3])
+    lines = [f"{'net':<{width}}  {'CC0':>10}  {'CC1':>10}  {'CO':>10}"]
+    for r in rows:
+        lines.append(f"{r.net:<{width}}  {r.cc0:>10}  {r.cc1:>10}  {r.co:>10}")
+    return "\n".join(lines)
+
+
+def query(source, k=10, by='co', where=None, largest=True):
+    """
+    Top-K query over a result file or an in-memory MetricTable.
+
+    Args:
+        source: MetricTable or path to a .scoap, .json, .jsonl or text result file
+        k, by, where, largest: See MetricTable.top_k
+
+    Returns:
+        Tuple of (rows, matched)
+    """
+    if isinstance(source, MetricTable):
+        return source.top_k(k, by, where, largest)
+    table = MetricTable.load(source)
+    try:
+        return table.top_k(k, by, where, largest)
+    finally:
+        table.close()
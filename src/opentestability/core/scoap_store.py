@@ -0,0 +1,224 @@
+"""
+Memory-mapped binary store for SCOAP results.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header      magic, version, flags, net count and section offsets
+    name index  uint64[n + 1] byte offsets into the name blob
+    name blob   UTF-8 net names, sorted, concatenated
+    columns     int64[n] CC0, CC1 and CO, in name order
+
+Nets are sorted by name, so a single net is found by binary search over
+the mapped name index without reading the rest of the file, and whole
+columns can be viewed as NumPy arrays without copying. Unreachable metrics
+(math.inf) are stored as INF; finite values beyond the int64 range are
+clamped to SATURATED and flagged in the header.
+"""
+
+import math
+import mmap
+import struct
+
+HEADER = struct.Struct('<8sIIQQQQ')
+MAGIC = b'OTSCOAP\x00'
+VERSION = 1
+FLAG_SATURATED = 1
+
+INF = 2 ** 63 - 1
+SATURATED = 2 ** 63 - 2
+COLUMNS = ('cc0', 'cc1', 'co')
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _encode(v):
+    if v == math.inf:
+        return INF
+    return min(int(v), SATURATED)
+
+
+def _decode(v):
+    return math.inf if v == INF else v
+
+
+def write_store(names, CC0, CC1, CO, filename):
+    """
+    Write per-net metrics to a binary store.
+
+    Args:
+        names: Net names
+        CC0, CC1, CO: Metric sequences aligned with names
+        filename: Output path
+    """
+    order = sorted(range(len(names)), key=names.__getitem__)
+    blob = bytearray()
+    offsets = [0]
+    for i in order:
+        blob += names[i].encode('utf-8')
+        offsets.append(len(blob))
+
+    n = len(order)
+    index_pos = _align(HEADER.size)
+    blob_pos = index_pos + 8 * (n + 1)
+    columns_pos = _align(blob_pos + len(blob))
+
+    flags = 0
+    columns = []
+    for values in (CC0, CC1, CO):
+        col = [_encode(values[i]) for i in order]
+        if any(v == SATURATED for v in col):
+            flags |= FLAG_SATURATED
+        columns.append(col)
+
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, n, index_pos, blob_pos, columns_pos))
+        f.write(bytes(index_pos - HEADER.size))
+        f.write(struct.pack(f'<{n + 1}Q', *offsets))
+        f.write(blob)
+        f.write(bytes(columns_pos - blob_pos - len(blob)))
+        for col in columns:
+            f.write(struct.pack(f'<{n}q', *col))
+    print(f"[✓] Binary SCOAP store written to: {filename}")
+    if flags & FLAG_SATURATED:
+        print(f"[WARN] Some SCOAP values exceed int64 and were clamped in {filename}")
+
+
+def write_scoap_store(ctrl, obs, filename):
+    """Write SCOAP results (as returned by the build functions) to a binary store."""
+    names = [k[3:] for k in obs]
+    CC0 = [ctrl[f"CC0_{n}"] for n in names]
+    CC1 = [ctrl[f"CC1_{n}"] for n in names]
+    CO = [obs[f"CO_{n}"] for n in names]
+    write_store(names, CC0, CC1, CO, filename)
+
+
+class ScoapStore:
+    """
+    Read-only view of a binary SCOAP store.
+
+    The file is memory-mapped; lookups touch only the pages they need.
+
+    Example:
+        with ScoapStore('design.scoap') as store:
+            cc0, cc1, co = store.metrics('n_42')
+            worst = store.column('co')
+    """
+
+    def __init__(self, filename):
+        self.filename = str(filename)
+        with open(filename, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, n, index_pos, blob_pos, columns_pos = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a SCOAP store: {filename}")
+        if version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Unsupported SCOAP store version {version}: {filename}")
+        self.saturated = bool(flags & FLAG_SATURATED)
+        self._n = n
+        self._blob_pos = blob_pos
+        self._columns_pos = columns_pos
+        self._view = memoryview(self._mm)
+        self._offsets = self._view[index_pos:blob_pos].cast('Q')
+        self._columns = [self._view[columns_pos + 8 * n * k:columns_pos + 8 * n * (k + 1)].cast('q')
+                         for k in range(len(COLUMNS))]
+
+    def close(self):
+        """Release the mapping; arrays from column() keep it alive until freed."""
+        self._offsets.release()
+        for col in self._columns:
+            col.release()
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, net):
+        return self.index(net) is not None
+
+    def name(self, i):
+        """Net name at sorted position i."""
+        start = self._blob_pos + self._offsets[i]
+        end = self._blob_pos + self._offsets[i + 1]
+        return self._mm[start:end].decode('utf-8')
+
+    def _key(self, i):
+        start = self._blob_pos + self._offsets[i]
+        return self._mm[start:self._blob_pos + self._offsets[i + 1]]
+
+    def index(self, net):
+        """Sorted position of a net, or None if it is not stored."""
+        key = net.encode('utf-8')
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n and self._key(lo) == key:
+            return lo
+        return None
+
+    def row(self, i):
+        """(CC0, CC1, CO) at sorted position i."""
+        return tuple(_decode(col[i]) for col in self._columns)
+
+    def metrics(self, net):
+        """
+        Return (CC0, CC1, CO) of a net.
+
+        Raises:
+            KeyError: If the net is not stored
+        """
+        i = self.index(net)
+        if i is None:
+            raise KeyError(net)
+        return self.row(i)
+
+    def lookup(self, nets):
+        """Bulk lookup: dictionary of net -> (CC0, CC1, CO) for the stored nets."""
+        result = {}
+        for net in nets:
+            i = self.index(net)
+            if i is not None:
+                result[net] = self.row(i)
+        return result
+
+    def names(self):
+        """Iterate over net names in sorted order."""
+        for i in range(self._n):
+            yield self.name(i)
+
+    def items(self):
+        """Iterate over (net, (CC0, CC1, CO)) in sorted order."""
+        for i in range(self._n):
+            yield self.name(i), self.row(i)
+
+    def column(self, metric):
+        """
+        Zero-copy NumPy view of one metric column in name order.
+
+        Unreachable entries hold INF.
+
+        Args:
+            metric: One of COLUMNS ('cc0', 'cc1', 'co')
+        """
+        import numpy as np
+
+        k = COLUMNS.index(metric)
+        return np.frombuffer(self._mm, dtype='<i8', count=self._n,
+                             offset=self._columns_pos + 8 * self._n * k)
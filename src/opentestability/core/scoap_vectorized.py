@@ -0,0 +1,392 @@
+"""
+NumPy-vectorized SCOAP backend.
+
+Gates are levelized once, then every gate in a level that shares a SCOAP
+rule is evaluated together with array gathers and segment reductions over
+the CSR fan-in of a CompactNetlist. Metrics are int64 arrays where
+UNREACHABLE stands in for math.inf; results are identical to the
+pure-Python engines in scoap.py. Deep reconvergent logic can push exact
+SCOAP values past int64; such values saturate at OVERFLOW and the compute
+functions raise OverflowError so callers can fall back to the exact
+engines.
+"""
+
+import math
+
+import numpy as np
+
+from .netlist import CompactNetlist
+from .cell_library import (
+    get_library, OP_BUF, OP_INV, OP_AND, OP_NAND, OP_OR, OP_NOR, OP_XOR, OP_XNOR,
+    OP_UNKNOWN, OP_TIE0, OP_TIE1,
+)
+from .scoap import _gate_controllability, _gate_observability
+
+
+UNREACHABLE = np.iinfo(np.int64).max
+OVERFLOW = 2 ** 61
+
+# Rule kinds evaluated one gate at a time with the scalar rules in scoap.py
+SCALAR = 15
+
+# Controllability rule kinds, mirroring scoap.CC_RULES
+CC_AND = 0         # CC0 from the min of CC0, CC1 from the sum of CC1
+CC_NAND = 1
+CC_OR = 2
+CC_NOR = 3
+CC_BUF = 4         # First input, passed through
+CC_INV = 5         # First input, swapped
+CC_XOR2 = 6        # Two-input parity
+CC_XNOR2 = 7
+
+# Observability rule kinds, mirroring scoap.CO_RULES
+CO_FIRST = 0       # Only the first input is observed, at no side cost
+CO_SIDE1 = 1       # Other inputs held at 1 (AND, NAND)
+CO_SIDE0 = 2       # Other inputs held at 0 (OR, NOR)
+CO_SIDE_ANY = 3    # Other inputs set to any value (XOR, XNOR, unknown cells)
+CO_NONE = 4        # No inputs observed (tie cells)
+
+CC_KINDS = {
+    OP_AND: CC_AND, OP_NAND: CC_NAND, OP_OR: CC_OR, OP_NOR: CC_NOR,
+    OP_BUF: CC_BUF, OP_INV: CC_INV,
+}
+CO_KINDS = {
+    OP_BUF: CO_FIRST, OP_INV: CO_FIRST, OP_AND: CO_SIDE1, OP_NAND: CO_SIDE1,
+    OP_OR: CO_SIDE0, OP_NOR: CO_SIDE0, OP_XOR: CO_SIDE_ANY, OP_XNOR: CO_SIDE_ANY,
+    OP_UNKNOWN: CO_SIDE_ANY, OP_TIE0: CO_NONE, OP_TIE1: CO_NONE,
+}
+
+
+def classify_controllability(model, arity):
+    """Map a compiled gate model to its CC rule kind."""
+    if model.opcode in (OP_XOR, OP_XNOR) and arity == 2:
+        return CC_XOR2 if model.opcode == OP_XOR else CC_XNOR2
+    return CC_KINDS.get(model.opcode, SCALAR)
+
+
+def classify_observability(model, arity):
+    """Map a compiled gate model to its CO rule kind."""
+    return CO_KINDS.get(model.opcode, SCALAR)
+
+
+def _saturate(x, unreachable):
+    """Clamp finite values to OVERFLOW and mark unreachable ones."""
+    return np.where(unreachable, UNREACHABLE, np.minimum(x, OVERFLOW))
+
+
+def _plus(x, k=1):
+    """Saturating x + k: UNREACHABLE stays UNREACHABLE."""
+    return _saturate(x + k, x == UNREACHABLE)
+
+
+def _sat_add(a, b):
+    """Saturating elementwise a + b."""
+    return _saturate(a + b, (a == UNREACHABLE) | (b == UNREACHABLE))
+
+
+def _segment_min(values, starts):
+    return np.minimum.reduceat(values, starts)
+
+
+def _segment_sum(values, starts):
+    unreachable = np.maximum.reduceat(values, starts) == UNREACHABLE
+    finite = np.where(values == UNREACHABLE, 0, values)
+    total = np.add.reduceat(finite, starts)
+    # Wide segments of saturated values can wrap int64; the float sum can't
+    approx = np.add.reduceat(finite.astype(np.float64), starts)
+    total = np.where(approx >= OVERFLOW, OVERFLOW, total)
+    return _saturate(total, unreachable)
+
+
+def _check_overflow(*arrays):
+    for values in arrays:
+        if np.any(values == OVERFLOW):
+            raise OverflowError("SCOAP metric exceeds the int64 range of the vectorized backend")
+
+
+class VectorNetlist:
+    """
+    NumPy view of a CompactNetlist with per-gate rule kinds and levels.
+
+    Attributes:
+        netlist: Source CompactNetlist
+        models: Compiled GateModel per gate
+        offsets, fanin: CSR gate -> input net IDs
+        output: Output net ID per gate
+        arity: Number of inputs per gate
+        first, second: First and second input net IDs (0 if absent)
+        cc_kind, co_kind: SCOAP rule kind per gate
+        order, feedback: Levelized and feedback gate IDs
+        level: Logic level per gate in order
+    """
+
+    def __init__(self, netlist: CompactNetlist, models=None):
+        self.netlist = netlist
+        self.models = models if models is not None else get_library().bind_netlist(netlist)
+        self.offsets = np.frombuffer(netlist.fanin_offsets, dtype=np.int32).astype(np.int64)
+        self.fanin = np.frombuffer(netlist.fanin_nets, dtype=np.int32)
+        self.output = np.frombuffer(netlist.gate_output, dtype=np.int32)
+        self.arity = np.diff(self.offsets)
+
+        has_first = self.arity >= 1
+        has_second = self.arity >= 2
+        padded = np.append(self.fanin, [0, 0])
+        self.first = np.where(has_first, padded[self.offsets[:-1]], 0)
+        self.second = np.where(has_second, padded[self.offsets[:-1] + 1], 0)
+
+        arity = self.arity.tolist()
+        self.cc_kind = np.array([classify_controllability(m, a) for m, a in zip(self.models, arity)],
+                                dtype=np.int64)
+        self.co_kind = np.array([classify_observability(m, a) for m, a in zip(self.models, arity)],
+                                dtype=np.int64)
+
+        order, feedback = netlist.levelize()
+        self.order = np.frombuffer(order, dtype=np.int32)
+        self.feedback = np.frombuffer(feedback, dtype=np.int32)
+        self.level = self._levels(order)
+
+    def _levels(self, order):
+        """Logic level of every gate in order: 1 + deepest driver of its inputs."""
+        netlist = self.netlist
+        offsets, fanin, output = netlist.fanin_offsets, netlist.fanin_nets, netlist.gate_output
+        net_level = [0] * netlist.num_nets
+        levels = []
+        for g in order:
+            lvl = 1
+            for k in range(offsets[g], offsets[g + 1]):
+                if net_level[fanin[k]] >= lvl:
+                    lvl = net_level[fanin[k]] + 1
+            levels.append(lvl)
+            o = output[g]
+            if net_level[o] < lvl:
+                net_level[o] = lvl
+        return np.array(levels, dtype=np.int64)
+
+    def segments(self, gates):
+        """
+        Gather the fan-in of a set of gates for segment reductions.
+
+        Returns:
+            Tuple of (input net IDs, segment start offsets)
+        """
+        starts = self.offsets[gates]
+        lens = self.arity[gates]
+        seg = np.zeros(len(gates), dtype=np.int64)
+        np.cumsum(lens[:-1], out=seg[1:])
+        idx = np.arange(lens.sum()) - np.repeat(seg, lens) + np.repeat(starts, lens)
+        return self.fanin[idx], seg
+
+    def groups(self, gates, kinds, levels=None):
+        """
+        Split gates into same-kind groups, ordered by level when given.
+
+        Gates without inputs are dropped unless their rule is scalar (tie
+        cells): no other SCOAP rule applies to them.
+        """
+        keep = (self.arity[gates] > 0) | (kinds == SCALAR)
+        gates, kinds = gates[keep], kinds[keep]
+        if levels is None:
+            keys = kinds.astype(np.int64)
+        else:
+            keys = levels[keep] * (SCALAR + 1) + kinds
+        perm = np.argsort(keys, kind='stable')
+        gates, keys = gates[perm], keys[perm]
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        for chunk in np.split(gates, bounds):
+            if len(chunk):
+                yield chunk
+
+
+def _to_metric(v):
+    v = int(v)
+    return math.inf if v == UNREACHABLE else v
+
+
+def _from_metric(v):
+    return UNREACHABLE if v == math.inf else min(v, OVERFLOW)
+
+
+def _scalar_controllability(vn, gates, CC0, CC1):
+    """Evaluate gates one at a time with scoap's scalar rules."""
+    changed = False
+    offsets, fanin = vn.offsets, vn.fanin
+    for g in gates.tolist():
+        ins = fanin[offsets[g]:offsets[g + 1]]
+        new = _gate_controllability(vn.models[g], [_to_metric(v) for v in CC0[ins].tolist()],
+                                    [_to_metric(v) for v in CC1[ins].tolist()])
+        if new is None:
+            continue
+        o = vn.output[g]
+        new0, new1 = _from_metric(new[0]), _from_metric(new[1])
+        if new0 < CC0[o]:
+            CC0[o] = new0
+            changed = True
+        if new1 < CC1[o]:
+            CC1[o] = new1
+            changed = True
+    return changed
+
+
+def _scalar_observability(vn, gates, CO, CC0, CC1):
+    """Evaluate gates one at a time with scoap's scalar rules."""
+    changed = False
+    offsets, fanin = vn.offsets, vn.fanin
+    for g in gates.tolist():
+        ins = fanin[offsets[g]:offsets[g + 1]].tolist()
+        c0 = {i: _to_metric(CC0[i]) for i in ins}
+        c1 = {i: _to_metric(CC1[i]) for i in ins}
+        coo = _to_metric(CO[vn.output[g]])
+        for i, v in _gate_observability(vn.models[g], ins, coo, c0, c1):
+            v = _from_metric(v)
+            if v < CO[i]:
+                CO[i] = v
+                changed = True
+    return changed
+
+
+def _controllability_step(vn, gates, CC0, CC1):
+    """Evaluate one group of same-kind gates; return True if any CC improved."""
+    kind = vn.cc_kind[gates[0]]
+    if kind == SCALAR:
+        return _scalar_controllability(vn, gates, CC0, CC1)
+    if kind == CC_INV or kind == CC_BUF:
+        a = vn.first[gates]
+        new0, new1 = (CC1[a], CC0[a]) if kind == CC_INV else (CC0[a], CC1[a])
+    elif kind == CC_XOR2 or kind == CC_XNOR2:
+        a, b = vn.first[gates], vn.second[gates]
+        even = np.minimum(_sat_add(CC0[a], CC0[b]), _sat_add(CC1[a], CC1[b]))
+        odd = np.minimum(_sat_add(CC0[a], CC1[b]), _sat_add(CC1[a], CC0[b]))
+        new0, new1 = (even, odd) if kind == CC_XOR2 else (odd, even)
+    else:
+        nets, starts = vn.segments(gates)
+        c0, c1 = CC0[nets], CC1[nets]
+        if kind == CC_AND:
+            new0, new1 = _segment_min(c0, starts), _segment_sum(c1, starts)
+        elif kind == CC_NAND:
+            new0, new1 = _segment_sum(c1, starts), _segment_min(c0, starts)
+        elif kind == CC_OR:
+            new0, new1 = _segment_sum(c0, starts), _segment_min(c1, starts)
+        else:
+            new0, new1 = _segment_min(c1, starts), _segment_sum(c0, starts)
+    new0, new1 = _plus(new0), _plus(new1)
+
+    outs = vn.output[gates]
+    changed = bool(np.any(new0 < CC0[outs]) or np.any(new1 < CC1[outs]))
+    np.minimum.at(CC0, outs, new0)
+    np.minimum.at(CC1, outs, new1)
+    return changed
+
+
+def _segment_others(values, starts, lens):
+    """For every entry, the saturating sum of the other entries of its segment."""
+    unreachable = values == UNREACHABLE
+    finite = np.where(unreachable, 0, values)
+    total = _segment_sum(finite, starts)
+    inf_count = np.add.reduceat(unreachable.astype(np.int64), starts)
+    total, inf_count = np.repeat(total, lens), np.repeat(inf_count, lens)
+    others = np.where(total >= OVERFLOW, OVERFLOW, total - finite)
+    return np.where(inf_count - unreachable > 0, UNREACHABLE, others)
+
+
+def _observability_step(vn, gates, CO, CC0, CC1):
+    """Evaluate one group of same-kind gates; return True if any CO improved."""
+    kind = vn.co_kind[gates[0]]
+    if kind == SCALAR:
+        return _scalar_observability(vn, gates, CO, CC0, CC1)
+    if kind == CO_NONE:
+        return False
+    coo = CO[vn.output[gates]]
+    if kind == CO_FIRST:
+        targets, values = vn.first[gates], _plus(coo)
+    else:
+        targets, starts = vn.segments(gates)
+        if kind == CO_SIDE1:
+            side = CC1[targets]
+        elif kind == CO_SIDE0:
+            side = CC0[targets]
+        else:
+            side = np.minimum(CC0[targets], CC1[targets])
+        lens = vn.arity[gates]
+        values = _plus(_sat_add(np.repeat(coo, lens), _segment_others(side, starts, lens)))
+
+    changed = bool(np.any(values < CO[targets]))
+    np.minimum.at(CO, targets, values)
+    return changed
+
+
+def _fixed_point(step, vn, groups, *tables):
+    """Re-run a set of gate groups until no metric improves."""
+    changed = True
+    while changed:
+        changed = False
+        for gates in groups:
+            if step(vn, gates, *tables):
+                changed = True
+
+
+def compute_controllability(netlist, vn=None):
+    """
+    Compute CC0/CC1 with level-by-level vectorized evaluation.
+
+    Args:
+        netlist: CompactNetlist
+        vn: Optional VectorNetlist to reuse
+
+    Returns:
+        Tuple of (CC0, CC1) int64 arrays indexed by net ID
+
+    Raises:
+        OverflowError: If a finite metric does not fit the int64 range
+    """
+    vn = vn or VectorNetlist(netlist)
+    CC0 = np.full(netlist.num_nets, UNREACHABLE, dtype=np.int64)
+    CC1 = np.full(netlist.num_nets, UNREACHABLE, dtype=np.int64)
+    inputs = np.frombuffer(netlist.inputs, dtype=np.int32)
+    CC0[inputs] = 1
+    CC1[inputs] = 1
+
+    for gates in vn.groups(vn.order, vn.cc_kind[vn.order], vn.level):
+        _controllability_step(vn, gates, CC0, CC1)
+    if len(vn.feedback):
+        groups = list(vn.groups(vn.feedback, vn.cc_kind[vn.feedback]))
+        _fixed_point(_controllability_step, vn, groups, CC0, CC1)
+    _check_overflow(CC0, CC1)
+    return CC0, CC1
+
+
+def compute_observability(netlist, CC0, CC1, vn=None):
+    """
+    Compute CO with reverse level-by-level vectorized evaluation.
+
+    The feedback part is iterated to a fixed point first, as in
+    scoap.compute_observability.
+
+    Args:
+        netlist: CompactNetlist
+        CC0: Final CC0 int64 array
+        CC1: Final CC1 int64 array
+        vn: Optional VectorNetlist to reuse
+
+    Returns:
+        CO int64 array indexed by net ID
+
+    Raises:
+        OverflowError: If a finite metric does not fit the int64 range
+    """
+    vn = vn or VectorNetlist(netlist)
+    CO = np.full(netlist.num_nets, UNREACHABLE, dtype=np.int64)
+    CO[np.frombuffer(netlist.outputs, dtype=np.int32)] = 1
+
+    if len(vn.feedback):
+        groups = list(vn.groups(vn.feedback, vn.co_kind[vn.feedback]))
+        _fixed_point(_observability_step, vn, groups, CO, CC0, CC1)
+    groups = list(vn.groups(vn.order, vn.co_kind[vn.order], vn.level))
+    for gates in reversed(groups):
+        _observability_step(vn, gates, CO, CC0, CC1)
+    _check_overflow(CO)
+    return CO
+
+
+def to_metric_list(values):
+    """Convert a metric array to Python ints with math.inf for UNREACHABLE."""
+    return [math.inf if v == UNREACHABLE else v for v in values.tolist()]
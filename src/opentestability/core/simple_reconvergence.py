@@ -13,6 +13,19 @@ Features:
 - Distinct path detection between fanout branches
 - Comprehensive reconvergence site mapping
 - Optimized for both simple and complex circuits
+
+Two path modes are available (SIMPLE_MODES): 'paths' (the default) enumerates
+simple paths of up to 10 edges from every fanout source and looks for a
+distinct pair, and 'flow' decides whether two paths with disjoint
+intermediate nodes exist with a unit-capacity max flow on the node-split
+graph (Menger's theorem). The flow check has no depth cutoff and its cost is
+polynomial in the size of the site's input cone, so it also finds
+reconvergences over paths longer than 10 edges and never enumerates the
+exponentially many paths of XOR-heavy logic; it reports one witness pair per
+fanout pair, which may differ from the pair the enumeration finds first.
+
+The JSON results keep the first 50 records; the 'lines' output format
+streams every record to a .jsonl file instead (see stream_results).
 """
 
 import json
@@ -23,6 +36,11 @@ import networkx as nx
 from pathlib import Path
 
 from ..utils.file_utils import get_project_paths, ensure_directory
+from ..utils import profiling
+from .netlist import CompactGraph
+from .dominator_reconvergence import immediate_dominators, vertex_disjoint_paths
+
+SIMPLE_MODES = ('paths', 'flow')
 
 
 class SimpleReconvergenceDetector:
@@ -34,20 +52,25 @@ class SimpleReconvergenceDetector:
     production applications.
     """
     
-    def __init__(self, dag_data: dict):
+    def __init__(self, dag_data: dict, compact: CompactGraph = None, mode: str = 'paths'):
+        if mode not in SIMPLE_MODES:
+            raise ValueError(f"Unknown path mode '{mode}', expected one of {SIMPLE_MODES}")
         self.dag_data = dag_data
+        self.mode = mode
+        self.compact = compact or CompactGraph.from_dag_data(dag_data)
         self.graph = self._build_graph()
         self.fanout_points = self._find_fanout_points()
+        self._fanout_ids = self.compact.fanout_points()
+        self._fanout_order = [self.compact.node_names[n] for n in self._fanout_ids]
         
     def _build_graph(self) -> nx.DiGraph:
-        """Build NetworkX graph from DAG data."""
-        G = nx.DiGraph()
-        G.add_edges_from(self.dag_data['edges'])
-        return G
+        """Build NetworkX graph from the compact graph."""
+        return self.compact.to_networkx()
     
     def _find_fanout_points(self) -> Set[str]:
         """Find all fanout points (nodes with out-degree > 1)."""
-        return {n for n in self.graph.nodes if self.graph.out_degree(n) > 1}
+        names = self.compact.node_names
+        return {names[n] for n in self.compact.fanout_points()}
     
     def find_fanout_branches_feeding_node(self, target_node: str) -> Dict[str, List[str]]:
         """
@@ -55,17 +78,22 @@ class SimpleReconvergenceDetector:
         Returns a dictionary mapping fanout_source -> [list of paths]
         """
         fanout_branches = {}
+        enumerated = 0
         
-        for fanout_source in self.fanout_points:
+        # Graph order, not set order: the result must not depend on string hashing
+        for fanout_source in self._fanout_order:
             if nx.has_path(self.graph, fanout_source, target_node):
                 # Find all simple paths from fanout to target
                 try:
                     paths = list(nx.all_simple_paths(self.graph, fanout_source, target_node, cutoff=10))
+                    enumerated += len(paths)
                     if paths:
                         fanout_branches[fanout_source] = paths
                 except nx.NetworkXNoPath:
                     continue
         
+        profiling.add('simple.reachability_queries', len(self.fanout_points))
+        profiling.add('simple.paths_enumerated', enumerated)
         return fanout_branches
     
     def detect_reconvergence_at_node(self, node: str) -> List[Dict]:
@@ -78,6 +106,7 @@ class SimpleReconvergenceDetector:
         
         # Check all pairs of fanout sources
         fanout_sources = list(fanout_branches.keys())
+        profiling.add('simple.source_pairs', len(fanout_sources) * (len(fanout_sources) - 1) // 2)
         for i in range(len(fanout_sources)):
             for j in range(i + 1, len(fanout_sources)):
                 source1, source2 = fanout_sources[i], fanout_sources[j]
@@ -107,6 +136,136 @@ class SimpleReconvergenceDetector:
         
         return reconvergences
     
+    def _input_cone(self, site: int) -> Dict[int, int]:
+        """
+        Reverse breadth-first search from site.
+
+        Returns:
+            Dictionary mapping every node ID with a path to site to the next
+            node on one of its shortest paths (None for the site itself)
+        """
+        toward = {site: None}
+        queue = deque([site])
+        while queue:
+            v = queue.popleft()
+            for u in self.compact.predecessors(v):
+                if u not in toward:
+                    toward[u] = v
+                    queue.append(u)
+        return toward
+
+    @staticmethod
+    def _cone_path(source: int, toward: Dict[int, int]) -> List[int]:
+        """Shortest path from source to the cone's site."""
+        path = [source]
+        while toward[path[-1]] is not None:
+            path.append(toward[path[-1]])
+        return path
+
+    def _cone_cut_vertices(self, toward: Dict[int, int], sources: List[int]) -> Dict[int, Set[int]]:
+        """
+        Nodes other than the site that every path from a source to the site passes.
+
+        These are the source's proper dominators in the reversed input cone
+        rooted at the site, minus the site itself.
+        """
+        g = self.compact
+        nodes = list(toward)
+        local = {n: i for i, n in enumerate(nodes)}
+        idom = immediate_dominators(
+            len(nodes),
+            lambda i: [local[u] for u in g.predecessors(nodes[i]) if u in local],
+            lambda i: [local[w] for w in g.successors(nodes[i]) if w in local],
+            [0])
+        cuts = {}
+        for source in sources:
+            chain = set()
+            i = idom[local[source]]
+            while i > 0:
+                chain.add(nodes[i])
+                i = idom[i]
+            cuts[source] = chain
+        return cuts
+
+    def _distinct_path_pair(self, source1: int, source2: int, site: int, toward: Dict[int, int],
+                            cuts: Dict[int, Set[int]]):
+        """
+        Witness paths from source1 and source2 to site with no common intermediate node.
+
+        Decided by Menger's theorem on the node-split input cone, with a
+        virtual source feeding both fanout sources and the fanout sources
+        themselves uncapacitated (one may lie on the other's path, as in
+        _are_paths_distinct). The shortest paths of both sources are tried
+        first; this also covers a direct edge into the site, the one case in
+        which distinct paths share an edge. Otherwise the pair fails exactly
+        when a single vertex cuts both sources from the site, and a two-unit
+        max flow, seeded with the shortest path of source1, finds the witness
+        when none does.
+
+        Returns:
+            Tuple of (path1, path2) as node ID lists, or None if no such pair exists
+        """
+        path1 = self._cone_path(source1, toward)
+        path2 = self._cone_path(source2, toward)
+        if self._are_paths_distinct(path1, path2):
+            return path1, path2
+        if not cuts[source1].isdisjoint(cuts[source2]):
+            return None
+        profiling.add('simple.flow_checks')
+
+        g = self.compact
+        virtual = g.num_nodes
+        pair = (source1, source2)
+
+        def successors(n):
+            return pair if n == virtual else g.successors(n)
+
+        def predecessors(n):
+            return [*g.predecessors(n), virtual] if n in pair else g.predecessors(n)
+
+        # The shortest path of source1 is a valid first flow unit
+        paths = vertex_disjoint_paths(successors, predecessors, virtual, site,
+                                      toward.__contains__, k=2, shared=pair,
+                                      initial=[[virtual] + path1])
+        if len(paths) < 2:
+            return None
+        by_source = {path[1]: path[1:] for path in paths}
+        return by_source[source1], by_source[source2]
+
+    def detect_reconvergence_by_flow(self, node: str) -> List[Dict]:
+        """
+        Detect reconvergent fanout pairs at a node with the max-flow check.
+
+        Every pair of fanout points in the node's input cone is tested for
+        two paths with disjoint intermediate nodes, without a depth cutoff.
+        """
+        g = self.compact
+        names = g.node_names
+        site = g.node_ids[node]
+        toward = self._input_cone(site)
+        sources = [f for f in self._fanout_ids if f in toward and f != site]
+        cuts = self._cone_cut_vertices(toward, sources)
+        profiling.add('simple.source_pairs', len(sources) * (len(sources) - 1) // 2)
+
+        reconvergences = []
+        for i in range(len(sources)):
+            for j in range(i + 1, len(sources)):
+                witness = self._distinct_path_pair(sources[i], sources[j], site, toward, cuts)
+                if witness is None:
+                    continue
+                path1 = [names[n] for n in witness[0]]
+                path2 = [names[n] for n in witness[1]]
+                reconvergences.append({
+                    'site': node,
+                    'fanout1': names[sources[i]],
+                    'fanout2': names[sources[j]],
+                    'path1': path1,
+                    'path2': path2,
+                    'path1_length': len(path1),
+                    'path2_length': len(path2)
+                })
+        return reconvergences
+
     def _are_paths_distinct(self, path1: List[str], path2: List[str]) -> bool:
         """
         Check if two paths are distinct (share no intermediate nodes).
@@ -118,52 +277,107 @@ class SimpleReconvergenceDetector:
         
         return intermediate1.isdisjoint(intermediate2)
     
-    def run_complete_algorithm(self) -> Dict:
+    def candidate_sites(self) -> List[str]:
+        """Nodes with multiple inputs, the only possible reconvergence sites, in graph order."""
+        return [node for node in self.graph.nodes if self.graph.in_degree(node) >= 2]
+
+    def iter_reconvergences(self, jobs: int = 1):
+        """
+        Yield reconvergence records site by site as they are found.
+
+        Args:
+            jobs: Worker processes the candidate sites are sharded over
+                  (0: CPU count); the result does not depend on it
+        """
+        from .parallel_reconvergence import detect_sharded
+
+        sites = self.candidate_sites()
+        for reconvergences in detect_sharded(_detect_at_site, self, sites, jobs):
+            yield from reconvergences
+        profiling.add('simple.sites_checked', len(sites))
+
+    def _summary(self) -> Dict:
+        """Result fields that do not depend on the reconvergences found."""
+        return {
+            'algorithm': 'Simplified Paper Algorithm (Xu & Edirisuriya 2004)',
+            'mode': self.mode,
+            'total_nodes': len(self.graph.nodes),
+            'total_edges': len(self.graph.edges),
+            'fanout_points': len(self.fanout_points),
+            'processed_nodes': len(self.candidate_sites()),
+        }
+
+    def run_complete_algorithm(self, jobs: int = 1) -> Dict:
         """
         Run the complete simplified paper algorithm.
+
+        Args:
+            jobs: Worker processes the candidate sites are sharded over
+                  (0: CPU count); the result does not depend on it
         """
         print("[🔬] Running Simplified Paper Algorithm...")
         
-        all_reconvergences = []
-        processed_nodes = 0
-        
-        # Check each node for reconvergence
-        for node in self.graph.nodes:
-            if self.graph.in_degree(node) >= 2:  # Only nodes with multiple inputs can be reconvergence sites
-                reconvergences = self.detect_reconvergence_at_node(node)
-                all_reconvergences.extend(reconvergences)
-                processed_nodes += 1
-        
-        # Group by site for summary
+        # Keep the first 50 records and the per-site summary, not every path
+        first_reconvergences = []
+        total = 0
         sites = {}
-        for reconv in all_reconvergences:
-            site = reconv['site']
-            if site not in sites:
-                sites[site] = []
-            sites[site].append({
+        for reconv in self.iter_reconvergences(jobs):
+            if total < 50:
+                first_reconvergences.append(reconv)
+            total += 1
+            sites.setdefault(reconv['site'], []).append({
                 'fanout_pair': [reconv['fanout1'], reconv['fanout2']],
                 'path_lengths': [reconv['path1_length'], reconv['path2_length']]
             })
         
-        results = {
-            'algorithm': 'Simplified Paper Algorithm (Xu & Edirisuriya 2004)',
-            'total_nodes': len(self.graph.nodes),
-            'total_edges': len(self.graph.edges),
-            'fanout_points': len(self.fanout_points),
-            'processed_nodes': processed_nodes,
+        results = self._summary()
+        results.update({
             'reconvergent_sites': len(sites),
-            'total_reconvergences': len(all_reconvergences),
-            'reconvergences': all_reconvergences[:50],  # Limit output size
+            'total_reconvergences': total,
+            'reconvergences': first_reconvergences,  # Limit output size
             'sites_summary': sites
-        }
+        })
         
-        print(f"[✅] Found {len(all_reconvergences)} total reconvergences at {len(sites)} sites")
-        print(f"[📊] Fanout points: {len(self.fanout_points)}, Processed nodes: {processed_nodes}")
+        print(f"[✅] Found {total} total reconvergences at {len(sites)} sites")
+        print(f"[📊] Fanout points: {len(self.fanout_points)}, Processed nodes: {results['processed_nodes']}")
         
         return results
 
+    def stream_results(self, output_path, jobs: int = 1) -> Dict:
+        """
+        Run the algorithm and stream every record to a JSON Lines file.
+
+        Records are written as they are found, followed by a summary line
+        (see write_reconvergence_lines), so memory use does not grow with
+        the number of reconvergences.
 
-def analyze_with_simple_reconvergence(dag_filename: str, output_filename: str = None, output_directory: Path = None) -> str:
+        Args:
+            output_path: Path of the .jsonl file
+            jobs: Worker processes the candidate sites are sharded over
+
+        Returns:
+            The summary dictionary
+        """
+        from .reconvergence import write_reconvergence_lines
+
+        print("[🔬] Running Simplified Paper Algorithm...")
+        summary = write_reconvergence_lines(self.iter_reconvergences(jobs), output_path,
+                                            self._summary())
+        print(f"[✅] Found {summary['total_reconvergences']} total reconvergences "
+              f"at {summary['reconvergent_sites']} sites")
+        print(f"[📊] Fanout points: {len(self.fanout_points)}, Processed nodes: {summary['processed_nodes']}")
+        return summary
+
+
+def _detect_at_site(detector: SimpleReconvergenceDetector, node: str) -> List[Dict]:
+    """Reconvergences at one site with the detector's path mode (a worker task)."""
+    if detector.mode == 'flow':
+        return detector.detect_reconvergence_by_flow(node)
+    return detector.detect_reconvergence_at_node(node)
+
+
+def analyze_with_simple_reconvergence(dag_filename: str, output_filename: str = None, output_directory: Path = None,
+                                      mode: str = 'paths', jobs: int = 1, output_format: str = 'json') -> str:
     """
     Perform reconvergence analysis using the practical detector.
     
@@ -173,31 +387,50 @@ def analyze_with_simple_reconvergence(dag_filename: str, output_filename: str =
     
     Args:
         dag_filename: Name of DAG JSON file in data/dag_output/
+        mode: Path mode, one of SIMPLE_MODES
+        jobs: Worker processes for the site loop (0: CPU count)
+        output_format: One of RECONV_FORMATS; 'lines' streams every record
+                       to <design>_simple_reconv.jsonl
         
     Returns:
         Path to the generated results file
     """
-    from .reconvergence import load_dag_json
+    from .reconvergence import RECONV_FORMATS, load_dag_json
     
-    # Load DAG data
-    dag_data = load_dag_json(dag_filename)
+    if output_format not in RECONV_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {RECONV_FORMATS}")
     
-    # Create detector and run algorithm
-    detector = SimpleReconvergenceDetector(dag_data)
-    results = detector.run_complete_algorithm()
-    
-    # Save results
-    paths = get_project_paths()
-    output_dir = output_directory or paths['reconvergence_output']
-    ensure_directory(output_dir)
-    
-    if output_filename is None:
-        base = Path(dag_filename).stem
-        output_filename = f"{base}_simple_reconv.json"
-    output_path = output_dir / output_filename
-    
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    with profiling.span('reconvergence.simple'):
+        # Load DAG data
+        with profiling.span('simple.load'):
+            dag_data = load_dag_json(dag_filename)
+            detector = SimpleReconvergenceDetector(dag_data, mode=mode)
+        
+        paths = get_project_paths()
+        output_dir = output_directory or paths['reconvergence_output']
+        ensure_directory(output_dir)
+        
+        if output_filename is None:
+            base = Path(dag_filename).stem
+            suffix = 'jsonl' if output_format == 'lines' else 'json'
+            output_filename = f"{base}_simple_reconv.{suffix}"
+        output_path = output_dir / output_filename
+        
+        if output_format == 'lines':
+            # Detection and writing interleave, so they share one span
+            with profiling.span('simple.stream'):
+                detector.stream_results(output_path, jobs)
+            print(f"[✓] Simple reconvergence results streamed to {output_path}")
+            return str(output_path)
+        
+        # Run algorithm
+        with profiling.span('simple.detect'):
+            results = detector.run_complete_algorithm(jobs)
+        
+        # Save results
+        with profiling.span('simple.save'):
+            with open(output_path, 'w') as f:
+                json.dump(results, f, indent=2)
     
     print(f"[✓] Simple reconvergence results saved to {output_path}")
     return str(output_path)
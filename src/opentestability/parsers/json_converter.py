@@ -12,6 +12,7 @@ import sys
 from pathlib import Path
 
 from ..utils.file_utils import get_project_paths
+from ..utils.artifact_cache import cached_stage
 
 
 def parse_netlist_txt(txt_path):
@@ -46,17 +47,20 @@ def parse_netlist_txt(txt_path):
                 continue
 
             # Match gates
-            match = re.match(r'(\w+)\s+out\((\S+)\)\s+in\((.*?)\)', line)
+            match = re.match(r'(\w+)\s+out\((\S+)\)\s+in\((.*?)\)(?:\s+pin\((\w+)\))?', line)
             if match:
                 gate_type = match.group(1)
                 output = match.group(2)
                 inputs = match.group(3).split()
 
-                gates.append({
+                gate = {
                     "type": gate_type,
                     "output": output,
                     "inputs": inputs
-                })
+                }
+                if match.group(4):
+                    gate["pin"] = match.group(4)
+                gates.append(gate)
 
     return {
         "primary_inputs": primary_inputs,
@@ -69,6 +73,8 @@ def convert_txt_to_json(input_filename):
     """
     Convert a parsed text netlist to JSON format.
     
+    Unchanged inputs are restored from the artifact cache.
+    
     Args:
         input_filename: Name of the text file in data/parsed/
         
@@ -88,12 +94,13 @@ def convert_txt_to_json(input_filename):
     output_filename = input_filename.replace('.txt', '.json')
     output_path = paths['parsed'] / output_filename
     
-    data = parse_netlist_txt(input_path)
-    
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=4)
+    def build():
+        data = parse_netlist_txt(input_path)
+        with open(output_path, 'w') as f:
+            json.dump(data, f, indent=4)
+        print(f"[+] Converted '{input_filename}' to JSON: '{output_filename}'")
     
-    print(f"[+] Converted '{input_filename}' to JSON: '{output_filename}'")
+    cached_stage('json', [input_path], [output_path], build)
     return str(output_path)
 
 
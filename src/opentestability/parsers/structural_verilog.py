@@ -0,0 +1,386 @@
+"""
+Fast native reader for structural (gate-level) Verilog netlists.
+
+Synthesized netlists only use a small subset of Verilog: non-ANSI module
+headers, input/output/wire declarations, cell instances with named port
+connections and simple `assign` aliases. This reader tokenizes that subset
+line by line and streams each cell instance straight to the parsed netlist
+format, without building a full AST. Anything outside the subset raises
+UnsupportedConstruct so callers can fall back to pyverilog.
+"""
+
+import re
+
+from .verilog_parser import write_header, write_instance, write_footer
+
+
+# Pseudo-cell used for `assign lhs = rhs;` aliases in the parsed format
+ASSIGN_CELL = 'ASSIGN_BUF'
+
+TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//.*)
+  | (?P<escaped>\\\S+)
+  | (?P<number>\d*\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-F_xXzZ?]+|\d+)
+  | (?P<ident>[A-Za-z_][\w$]*)
+  | (?P<punct>[()\[\],;.:=])
+""", re.VERBOSE)
+
+# Lines without escaped identifiers or block comments are split in one call
+FAST_TOKEN_RE = re.compile(r"\d*\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-F_xXzZ?]+|[A-Za-z_][\w$]*|\d+|[()\[\],;.:=]")
+FAST_INVALID_RE = re.compile(r"[^\w\s$()\[\],;.:=']")
+
+# Keywords that only appear in behavioural or parameterized code
+UNSUPPORTED_KEYWORDS = {
+    'always', 'initial', 'reg', 'integer', 'real', 'time', 'parameter',
+    'localparam', 'defparam', 'generate', 'genvar', 'function', 'task',
+    'specify', 'primitive', 'supply0', 'supply1', 'tri', 'wand', 'wor',
+    'signed', 'macromodule', 'interface', 'package', 'logic',
+}
+
+
+class UnsupportedConstruct(Exception):
+    """Raised when a netlist uses Verilog outside the structural subset."""
+
+
+def _scan_line(line, lineno):
+    """
+    Tokenize one line character by character.
+
+    Returns:
+        Tuple of (tokens, in_block) where in_block is True if the line opens
+        a block comment that is not closed on the same line
+    """
+    tokens = []
+    pos = 0
+    while pos < len(line):
+        if line.startswith('/*', pos):
+            end = line.find('*/', pos + 2)
+            if end < 0:
+                return tokens, True
+            pos = end + 2
+            continue
+        m = TOKEN_RE.match(line, pos)
+        if m is None:
+            raise UnsupportedConstruct(f"unsupported syntax {line[pos:pos + 10]!r} on line {lineno}")
+        kind = m.lastgroup
+        if kind == 'escaped':
+            tokens.append(m.group())
+        elif kind == 'number':
+            tokens.append(re.sub(r'\s', '', m.group()))
+        elif kind not in ('ws', 'comment'):
+            tokens.append(m.group())
+        pos = m.end()
+    return tokens, False
+
+
+def tokenize(lines):
+    """
+    Split Verilog source into tokens, dropping whitespace and comments.
+
+    Args:
+        lines: Iterable of source lines
+
+    Yields:
+        Tuple of (line_number, tokens) for every line with tokens
+
+    Raises:
+        UnsupportedConstruct: On characters outside the structural subset
+    """
+    in_block = False
+    for lineno, line in enumerate(lines, 1):
+        if in_block:
+            end = line.find('*/')
+            if end < 0:
+                continue
+            line = line[end + 2:]
+            in_block = False
+
+        if '\\' in line or '/*' in line:
+            tokens, in_block = _scan_line(line, lineno)
+        else:
+            cut = line.find('//')
+            if cut >= 0:
+                line = line[:cut]
+            if line.lstrip().startswith('`timescale'):
+                continue
+            if FAST_INVALID_RE.search(line):
+                tokens, _ = _scan_line(line, lineno)
+            else:
+                tokens = FAST_TOKEN_RE.findall(line)
+                if "'" in line:
+                    tokens = [re.sub(r'\s', '', t) for t in tokens]
+        if tokens:
+            yield lineno, tokens
+
+
+class _Tokens:
+    """Token stream with one token of lookahead."""
+
+    def __init__(self, lines):
+        self._lines = tokenize(lines)
+        self._buf = []
+        self.lineno = 0
+        self.tok = None
+        self._next()
+
+    def _next(self):
+        buf = self._buf
+        while not buf:
+            line = next(self._lines, None)
+            if line is None:
+                self.tok = None
+                return
+            self.lineno, tokens = line
+            tokens.reverse()
+            buf.extend(tokens)
+        self.tok = buf.pop()
+
+    def peek(self):
+        return self.tok
+
+    def take(self):
+        tok = self.tok
+        if tok is None:
+            raise UnsupportedConstruct("unexpected end of file")
+        self._next()
+        return tok
+
+    def expect(self, tok):
+        if self.tok != tok:
+            self.fail(f"expected '{tok}'")
+        self._next()
+
+    def accept(self, tok):
+        if self.tok == tok:
+            self._next()
+            return True
+        return False
+
+    def fail(self, what):
+        raise UnsupportedConstruct(f"{what}, found {self.tok!r} on line {self.lineno}")
+
+
+def _is_identifier(tok):
+    return tok is not None and (tok[0].isalpha() or tok[0] in '_\\')
+
+
+def _identifier(ts):
+    tok = ts.peek()
+    if not _is_identifier(tok) or tok in UNSUPPORTED_KEYWORDS:
+        ts.fail("expected identifier")
+    return ts.take()
+
+
+def _number(ts):
+    tok = ts.peek()
+    if tok is None or not tok.isdigit():
+        ts.fail("expected integer")
+    return ts.take()
+
+
+def _range(ts):
+    """Parse an optional `[msb:lsb]` range; returns '[msb:lsb]' or ''."""
+    if not ts.accept('['):
+        return ''
+    msb = _number(ts)
+    ts.expect(':')
+    lsb = _number(ts)
+    ts.expect(']')
+    return f'[{msb}:{lsb}]'
+
+
+def _net_ref(ts):
+    """Parse a net, bit-select or constant; part-selects are unsupported."""
+    tok = ts.peek()
+    if tok is not None and tok[0].isdigit():
+        return ts.take()
+    name = _identifier(ts)
+    if ts.accept('['):
+        bit = _number(ts)
+        if ts.peek() != ']':
+            ts.fail("part-select")
+        ts.take()
+        return f'{name}[{bit}]'
+    return name
+
+
+def _name_list(ts):
+    names = [_identifier(ts)]
+    while ts.accept(','):
+        names.append(_identifier(ts))
+    ts.expect(';')
+    return names
+
+
+def _connections(ts):
+    """Parse `( .PIN(net), ... )` into an ordered pin -> net mapping."""
+    ts.expect('(')
+    conns = {}
+    if ts.accept(')'):
+        return conns
+    while True:
+        if ts.peek() != '.':
+            ts.fail("positional port connection")
+        ts.take()
+        pin = _identifier(ts)
+        ts.expect('(')
+        if not ts.accept(')'):
+            conns[pin] = _net_ref(ts)
+            ts.expect(')')
+        if not ts.accept(','):
+            break
+    ts.expect(')')
+    return conns
+
+
+def iter_structural_netlist(lines):
+    """
+    Stream the items of a structural Verilog netlist.
+
+    Args:
+        lines: Iterable of source lines
+
+    Yields:
+        ('module', name), ('input', port), ('output', port), ('wire', name),
+        ('assign', (lhs, rhs)), ('instance', (cell, name, conns)) and
+        ('endmodule', name) events, in source order. Vector ports are
+        reported as name[msb:lsb] like verilog_parser.parse_verilog_netlist.
+
+    Raises:
+        UnsupportedConstruct: On any construct outside the structural subset
+    """
+    ts = _Tokens(lines)
+    while ts.peek() is not None:
+        ts.expect('module')
+        module = _identifier(ts)
+        yield 'module', module
+
+        if ts.accept('('):
+            if ts.peek() in ('input', 'output', 'inout'):
+                ts.fail("ANSI-style port declaration")
+            if not ts.accept(')'):
+                while True:
+                    _identifier(ts)
+                    if not ts.accept(','):
+                        break
+                ts.expect(')')
+        ts.expect(';')
+
+        while not ts.accept('endmodule'):
+            tok = ts.peek()
+            if tok in ('input', 'output', 'inout'):
+                ts.take()
+                ts.accept('wire')
+                width = _range(ts)
+                for name in _name_list(ts):
+                    if tok != 'inout':
+                        yield tok, name + width
+            elif tok == 'wire':
+                ts.take()
+                _range(ts)
+                for name in _name_list(ts):
+                    yield 'wire', name
+            elif tok == 'assign':
+                ts.take()
+                while True:
+                    lhs = _net_ref(ts)
+                    ts.expect('=')
+                    rhs = _net_ref(ts)
+                    yield 'assign', (lhs, rhs)
+                    if not ts.accept(','):
+                        break
+                ts.expect(';')
+            elif _is_identifier(tok) and tok not in UNSUPPORTED_KEYWORDS and tok != 'module':
+                cell = ts.take()
+                if ts.peek() == '#':
+                    ts.fail("parameterized instance")
+                while True:
+                    name = _identifier(ts)
+                    if ts.peek() == '[':
+                        ts.fail("instance array")
+                    yield 'instance', (cell, name, _connections(ts))
+                    if not ts.accept(','):
+                        break
+                ts.expect(';')
+            else:
+                ts.fail("unsupported module item")
+        yield 'endmodule', module
+
+
+def _assign_instance(lhs, rhs):
+    """Represent `assign lhs = rhs;` as an ASSIGN_CELL buffer instance."""
+    return ASSIGN_CELL, 'assign', {'A': rhs, 'Y': lhs}
+
+
+def read_structural_netlist(input_path):
+    """
+    Parse a structural Verilog netlist into module tables.
+
+    Args:
+        input_path: Path to the Verilog netlist
+
+    Returns:
+        Dictionary in the format of verilog_parser.parse_verilog_netlist
+
+    Raises:
+        UnsupportedConstruct: If the netlist is not purely structural
+    """
+    modules = {}
+    with open(input_path) as src:
+        for kind, item in iter_structural_netlist(src):
+            if kind == 'module':
+                info = {'pi': [], 'po': [], 'wires': [], 'instances': []}
+                modules[item] = info
+            elif kind == 'input':
+                info['pi'].append(item)
+            elif kind == 'output':
+                info['po'].append(item)
+            elif kind == 'wire':
+                info['wires'].append(item)
+            elif kind == 'instance':
+                info['instances'].append(item)
+            elif kind == 'assign':
+                info['instances'].append(_assign_instance(*item))
+    return modules
+
+
+def write_structural_netlist(input_path, output_path):
+    """
+    Convert a structural Verilog netlist to the parsed netlist format.
+
+    Instances are written as they are read, so memory use is bounded by the
+    port lists rather than the instance count. The output matches
+    verilog_parser's pyverilog path; `assign` aliases become ASSIGN_CELL
+    buffers.
+
+    Args:
+        input_path: Path to the Verilog netlist
+        output_path: Path of the parsed file to write
+
+    Raises:
+        UnsupportedConstruct: If the netlist is not purely structural
+    """
+    with open(input_path) as src, open(output_path, 'w') as out:
+        pi, po = [], []
+        header = False
+        cnt = 0
+        for kind, item in iter_structural_netlist(src):
+            if kind == 'module':
+                pi, po = [], []
+                header = False
+                cnt = 0
+            elif kind in ('input', 'output'):
+                if header:
+                    raise UnsupportedConstruct(f"port '{item}' declared after the first instance")
+                (pi if kind == 'input' else po).append(item)
+            elif kind in ('instance', 'assign'):
+                if not header:
+                    write_header(out, pi, po)
+                    header = True
+                cell, _, conns = item if kind == 'instance' else _assign_instance(*item)
+                cnt = write_instance(out, cell, conns, cnt)
+            elif kind == 'endmodule':
+                if not header:
+                    write_header(out, pi, po)
+                write_footer(out, pi, po)
@@ -6,15 +6,21 @@ like Cadence Genus and Synopsys Design Compiler.
 """
 
 import os
+import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from pyverilog.vparser.parser import parse as v_parse
-from pyverilog.vparser.ast import ModuleDef, InstanceList, Decl, Input, Output, Wire
 
 from ..utils.file_utils import get_project_paths, ensure_directory
+from ..utils.artifact_cache import cached_stage
 
 
 OUTPUT_PORT_NAMES = {'Z', 'ZN', 'Q', 'QN', 'Y', 'S', 'CO'}
+READERS = ('fast', 'pyverilog')
+VERILOG_SUFFIXES = ('.v', '.vg')
+FILE_LIST_SUFFIXES = ('.f', '.lst')
 
 
 def get_argname_name(arg):
@@ -26,6 +32,25 @@ def get_argname_name(arg):
     return str(arg)
 
 
+def assign_net_name(node):
+    """
+    Net name of one side of a continuous assignment.
+
+    Returns:
+        The name for an identifier, bit-select or constant, or None for any
+        other expression
+    """
+    from pyverilog.vparser.ast import Identifier, Pointer, IntConst
+
+    if isinstance(node, Identifier):
+        return node.name
+    if isinstance(node, Pointer) and isinstance(node.var, Identifier) and isinstance(node.ptr, IntConst):
+        return f"{node.var.name}[{node.ptr.value}]"
+    if isinstance(node, IntConst):
+        return node.value
+    return None
+
+
 def format_port(port):
     """Format port with width information if available."""
     if getattr(port, 'width', None):
@@ -39,13 +64,23 @@ def parse_verilog_netlist(file_path):
     """
     Parse Verilog netlist using pyverilog.
     
+    Continuous assignments between nets (`assign y = a;`) become ASSIGN_BUF
+    instances, as in the fast reader; other assign expressions are skipped
+    with a warning.
+    
     Args:
         file_path: Path to the Verilog netlist file
         
     Returns:
         Dictionary containing parsed module information
     """
-    ast, _ = v_parse([file_path])
+    from pyverilog.vparser.parser import parse as v_parse
+    from pyverilog.vparser.ast import ModuleDef, InstanceList, Decl, Input, Output, Wire, Assign
+    from .structural_verilog import _assign_instance
+    
+    # Keep PLY's parser tables out of the working directory
+    tables = ensure_directory(get_project_paths()['cache'] / 'pyverilog')
+    ast, _ = v_parse([file_path], outputdir=str(tables), debug=False)
     modules = {}
     
     for module in ast.description.definitions:
@@ -67,6 +102,15 @@ def parse_verilog_netlist(file_path):
                 for inst in item.instances:
                     conns = {p.portname: get_argname_name(p.argname) for p in inst.portlist}
                     instances.append((item.module, inst.name, conns))
+            elif isinstance(item, Assign):
+                # Net aliases become buffers, as in the fast reader
+                lhs = assign_net_name(item.left.var)
+                rhs = assign_net_name(item.right.var)
+                if lhs is None or rhs is None:
+                    print(f"[WARN] {file_path}: assign in module {module.name} is not a net alias; skipped",
+                          file=sys.stderr)
+                else:
+                    instances.append(_assign_instance(lhs, rhs))
         
         modules[module.name] = {
             'pi': pi,
@@ -78,13 +122,234 @@ def parse_verilog_netlist(file_path):
     return modules
 
 
-def parse(input_filename: str, output_filename: str) -> str:
+def write_header(out, pi, po):
+    """Write the primary I/O sections that open a module in the parsed format."""
+    out.write('# Primary Inputs\n')
+    out.write(' '.join(pi) + '\n\n')
+
+    out.write('# Primary Outputs\n')
+    out.write(' '.join(po) + '\n\n')
+
+    out.write('# Complete Paths\n')
+
+
+def write_instance(out, typ, conns, cnt):
+    """
+    Write one cell instance as gate lines, one per output pin.
+
+    Each line ends with the name of the output pin it was written for,
+    e.g. `DFFX1 out(qn) in(d clk) pin(QN)`, so multi-output cells can be
+    bound to the right pin model.
+    
+    Args:
+        out: Output file handle
+        typ: Cell type
+        conns: Ordered mapping of pin name -> net name
+        cnt: Running count of gate lines in the module
+        
+    Returns:
+        Updated gate line count
+    """
+    outputs = [(p, n) for p, n in conns.items() if p in OUTPUT_PORT_NAMES]
+    inputs = [n for p, n in conns.items() if p not in OUTPUT_PORT_NAMES]
+    
+    if not outputs:
+        out.write(f"{typ} out(UNCONNECTED{cnt}) in({' '.join(inputs)})\n")
+        cnt += 1
+    else:
+        for p, n in outputs:
+            out.write(f"{typ} out({n}) in({' '.join(inputs)}) pin({p})\n")
+            cnt += 1
+    return cnt
+
+
+def write_footer(out, pi, po):
+    """Write the INPUT/OUTPUT summary lines that close a module."""
+    if pi:
+        out.write('\nINPUT ' + ' '.join(pi) + '\n')
+    if po:
+        out.write('OUTPUT ' + ' '.join(po) + '\n')
+
+
+def write_modules(out, modules):
+    """Write module tables from parse_verilog_netlist in the parsed format."""
+    for mod, info in modules.items():
+        write_header(out, info['pi'], info['po'])
+        cnt = 0
+        for typ, inst_name, conns in info['instances']:
+            cnt = write_instance(out, typ, conns, cnt)
+        write_footer(out, info['pi'], info['po'])
+
+
+def write_pyverilog_netlist(input_path, output_path):
+    """Parse with pyverilog and write every module in the parsed format."""
+    data = parse_verilog_netlist(str(input_path))
+
+    with open(output_path, 'w') as out:
+        write_modules(out, data)
+
+
+def parse_verilog_file(input_path, output_path, reader: str = 'fast') -> str:
+    """
+    Parse a Verilog netlist file and write the internal parsed format.
+    
+    Args:
+        input_path: Path to the Verilog netlist
+        output_path: Path of the parsed file to write
+        reader: 'fast' streams the gate-level subset with the native
+                tokenizer and falls back to pyverilog on anything else;
+                'pyverilog' always builds the full pyverilog AST
+        
+    Returns:
+        Full path of the generated parsed file
+    """
+    if reader not in READERS:
+        raise ValueError(f"Unknown reader '{reader}', expected one of {READERS}")
+    
+    if reader == 'fast':
+        from .structural_verilog import write_structural_netlist, UnsupportedConstruct
+        try:
+            write_structural_netlist(input_path, output_path)
+            return str(output_path)
+        except UnsupportedConstruct as e:
+            print(f"[WARN] {e}; falling back to pyverilog", file=sys.stderr)
+    
+    write_pyverilog_netlist(input_path, output_path)
+    return str(output_path)
+
+
+def read_verilog_file(input_path, reader: str = 'fast'):
+    """
+    Parse one Verilog file into module tables.
+    
+    Args:
+        input_path: Path to the Verilog netlist
+        reader: Netlist reader, one of READERS (see parse_verilog_file)
+        
+    Returns:
+        Tuple of (modules, reader_used, seconds)
+    """
+    start = time.perf_counter()
+    if reader == 'fast':
+        from .structural_verilog import read_structural_netlist, UnsupportedConstruct
+        try:
+            modules = read_structural_netlist(input_path)
+            return modules, 'fast', time.perf_counter() - start
+        except UnsupportedConstruct as e:
+            print(f"[WARN] {input_path}: {e}; falling back to pyverilog", file=sys.stderr)
+    
+    modules = parse_verilog_netlist(str(input_path))
+    return modules, 'pyverilog', time.perf_counter() - start
+
+
+def collect_verilog_files(sources):
+    """
+    Expand parse inputs into an ordered list of Verilog files.
+    
+    Args:
+        sources: A path or list of paths; each is a Verilog file, a
+                 directory (searched recursively for VERILOG_SUFFIXES) or a
+                 file list (FILE_LIST_SUFFIXES, one path per line, relative
+                 to the list, '#' and '//' comments allowed)
+        
+    Returns:
+        List of Path objects in input order
+        
+    Raises:
+        FileNotFoundError: If a source does not exist
+    """
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+    
+    files = []
+    for source in map(Path, sources):
+        if source.is_dir():
+            files.extend(sorted(p for p in source.rglob('*')
+                                if p.suffix in VERILOG_SUFFIXES and p.is_file()))
+        elif source.suffix in FILE_LIST_SUFFIXES and source.is_file():
+            with open(source) as f:
+                entries = [line.strip() for line in f]
+            entries = [e for e in entries if e and not e.startswith(('#', '//'))]
+            files.extend(collect_verilog_files([source.parent / e for e in entries]))
+        elif source.is_file():
+            files.append(source)
+        else:
+            raise FileNotFoundError(f"Could not find input netlist: {source}")
+    return files
+
+
+def parse_verilog_files(sources, output_path, reader: str = 'fast', jobs: int = None):
+    """
+    Parse many Verilog files in parallel into a single parsed file.
+    
+    Files are parsed in a process pool and their module tables are merged
+    in input order, so the output does not depend on worker scheduling.
+    
+    Args:
+        sources: Files, directories or file lists (see collect_verilog_files)
+        output_path: Path of the parsed file to write
+        reader: Netlist reader, one of READERS (see parse_verilog_file)
+        jobs: Number of worker processes (default: CPU count)
+        
+    Returns:
+        List of per-file timing records with keys file, reader, modules,
+        instances and seconds, in input order
+        
+    Raises:
+        ValueError: If a module is defined in more than one file
+    """
+    if reader not in READERS:
+        raise ValueError(f"Unknown reader '{reader}', expected one of {READERS}")
+    
+    files = collect_verilog_files(sources)
+    jobs = min(jobs or os.cpu_count() or 1, len(files) or 1)
+    
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [read_verilog_file(f, reader) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(read_verilog_file, files, repeat(reader)))
+    
+    merged = {}
+    origin = {}
+    report = []
+    for path, (modules, used, seconds) in zip(files, results):
+        for name, info in modules.items():
+            if name in merged:
+                raise ValueError(f"Module '{name}' defined in both {origin[name]} and {path}")
+            merged[name] = info
+            origin[name] = path
+        report.append({
+            'file': str(path),
+            'reader': used,
+            'modules': len(modules),
+            'instances': sum(len(info['instances']) for info in modules.values()),
+            'seconds': seconds,
+        })
+    
+    with open(output_path, 'w') as out:
+        write_modules(out, merged)
+    
+    print(f"[✓] Parsed {len(files)} files ({len(merged)} modules, jobs: {jobs}) "
+          f"in {time.perf_counter() - start:.3f}s")
+    for rec in sorted(report, key=lambda r: r['seconds'], reverse=True):
+        print(f"    {rec['seconds']:8.3f}s  {rec['modules']:4d} modules  "
+              f"{rec['instances']:8d} instances  [{rec['reader']}]  {rec['file']}")
+    return report
+
+
+def parse(input_filename: str, output_filename: str, reader: str = 'fast', jobs: int = None) -> str:
     """
     Parse a Verilog netlist and convert to internal format.
     
     Args:
-        input_filename: Name of input Verilog file in data/input/
+        input_filename: Name of input Verilog file in data/input/; a
+                        directory or file list is parsed with
+                        parse_verilog_files
         output_filename: Name of output parsed file in data/parsed/
+        reader: Netlist reader, one of READERS (see parse_verilog_file)
+        jobs: Worker processes for directory and file-list inputs
         
     Returns:
         Full path of the generated parsed file
@@ -96,37 +361,35 @@ def parse(input_filename: str, output_filename: str) -> str:
     input_path = paths['input'] / input_filename
     output_path = paths['parsed'] / output_filename
 
-    if not input_path.is_file():
+    if not input_path.exists():
         raise FileNotFoundError(f"Could not find input netlist: {input_path}")
 
     ensure_directory(paths['parsed'])
-    data = parse_verilog_netlist(str(input_path))
+    return parse_path(input_path, output_path, reader, jobs)
 
-    with open(output_path, 'w') as out:
-        for mod, info in data.items():
-            out.write('# Primary Inputs\n')
-            out.write(' '.join(info['pi']) + '\n\n')
-
-            out.write('# Primary Outputs\n')
-            out.write(' '.join(info['po']) + '\n\n')
-
-            out.write('# Complete Paths\n')
-            cnt = 0
-            for typ, inst_name, conns in info['instances']:
-                outputs = [(p, n) for p, n in conns.items() if p in OUTPUT_PORT_NAMES]
-                inputs = [n for p, n in conns.items() if p not in OUTPUT_PORT_NAMES]
-                
-                if not outputs:
-                    out.write(f"{typ} out(UNCONNECTED{cnt}) in({' '.join(inputs)})\n")
-                    cnt += 1
-                else:
-                    for p, n in outputs:
-                        out.write(f"{typ} out({n}) in({' '.join(inputs)})\n")
-                        cnt += 1
-
-            if info['pi']:
-                out.write('\nINPUT ' + ' '.join(info['pi']) + '\n')
-            if info['po']:
-                out.write('OUTPUT ' + ' '.join(info['po']) + '\n')
 
-    return str(output_path)
\ No newline at end of file
+def parse_path(input_path, output_path, reader: str = 'fast', jobs: int = None) -> str:
+    """
+    Parse a Verilog file, directory or file list to a parsed netlist file.
+    
+    Unchanged inputs are restored from the artifact cache; the key covers
+    the content of every Verilog file and the reader.
+    
+    Args:
+        input_path: Verilog file, directory or .f/.lst file list
+        output_path: Path of the parsed file to write
+        reader: Netlist reader, one of READERS (see parse_verilog_file)
+        jobs: Worker processes for directory and file-list inputs
+        
+    Returns:
+        Full path of the generated parsed file
+    """
+    input_path = Path(input_path)
+    if input_path.is_dir() or input_path.suffix in FILE_LIST_SUFFIXES:
+        files = collect_verilog_files(input_path)
+        build = lambda: parse_verilog_files(files, output_path, reader, jobs)
+    else:
+        files = [input_path]
+        build = lambda: parse_verilog_file(input_path, output_path, reader)
+    cached_stage('parse', files, [output_path], build, {'reader': reader})
+    return str(output_path)
@@ -0,0 +1,418 @@
+"""
+Persistent analysis server and thin client.
+
+`opentest serve` keeps one Python process alive on a local Unix socket so
+that imports are paid once and designs stay resident between requests.
+
+Protocol: newline-delimited JSON. Each request is one object
+    {"id": <any>, "method": <name>, "params": {...}}
+and is answered by one line
+    {"id": <same>, "ok": true, "result": ..., "output": <captured stdout>}
+or  {"id": <same>, "ok": false, "error": <message>, "output": ...}.
+A connection may carry any number of requests. Requests from concurrent
+connections are executed one at a time. Unreachable metrics are encoded
+as "Infinity", as in the JSON result files.
+
+Methods:
+    ping                                      Server version and uptime
+    load       {netlist, name?, mode?, library?}   Parse and solve a design
+    unload     {name}                         Drop a resident design
+    designs                                   Resident designs
+    metrics    {name, nets}                   (CC0, CC1, CO) of nets
+    query      {name | file, k?, by?, where?, smallest?}  Top-K query
+    fanin      {name, net}                    Gates driving a net
+    fanout     {name, net}                    Gates reading a net
+    reconvergence {name, algorithm?, full?}   Reconvergence on the resident DAG
+    command    {argv}                         Run an opentest command
+    shutdown                                  Stop the server
+
+This module only imports the analysis code when a request needs it, so
+the client side stays cheap to start.
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .utils.file_utils import get_project_paths
+
+RECONVERGENCE_ALGORITHMS = ('simple', 'advanced', 'dominator', 'baseline')
+
+
+def default_socket_path():
+    """$OPENTEST_SOCKET, or data/opentest.sock in the project."""
+    return os.environ.get('OPENTEST_SOCKET') or str(get_project_paths()['data'] / 'opentest.sock')
+
+
+def _json_value(v):
+    if isinstance(v, float) and math.isinf(v):
+        return "Infinity"
+    return v
+
+
+class ServerError(Exception):
+    """Raised by the client when the server reports a failed request."""
+
+
+class ResidentDesign:
+    """
+    A parsed netlist kept in memory with its SCOAP metrics.
+
+    The DAG and reconvergence results are built on first use and kept.
+    """
+
+    def __init__(self, name, path, mode='levelized', library=None):
+        from .core.netlist import CompactNetlist
+        from .core.scoap import solve_netlist
+        from .core.scoap_query import MetricTable
+
+        start = time.perf_counter()
+        self.name = name
+        self.path = str(path)
+        self.netlist = CompactNetlist.from_parsed_file(path)
+        self.CC0, self.CC1, self.CO = solve_netlist(self.netlist, mode, library)
+        self.table = MetricTable.from_columns(self.netlist.net_names, self.CC0, self.CC1, self.CO)
+        self.load_seconds = time.perf_counter() - start
+        self._dag = None
+        self._reconvergence = {}
+
+    def info(self):
+        return {'name': self.name, 'netlist': self.path, 'gates': self.netlist.num_gates,
+                'nets': self.netlist.num_nets, 'load_seconds': round(self.load_seconds, 4),
+                'dag': self._dag is not None, 'reconvergence': sorted(self._reconvergence)}
+
+    def net_id(self, net):
+        nid = self.netlist.net_ids.get(net)
+        if nid is None:
+            raise KeyError(f"Unknown net '{net}' in design '{self.name}'")
+        return nid
+
+    def metrics(self, net):
+        nid = self.net_id(net)
+        return [_json_value(self.CC0[nid]), _json_value(self.CC1[nid]), _json_value(self.CO[nid])]
+
+    def _gate_records(self, gates):
+        netlist = self.netlist
+        return [{'gate': g, 'type': netlist.gate_type(g),
+                 'output': netlist.net_names[netlist.gate_output[g]],
+                 'inputs': [netlist.net_names[i] for i in netlist.fanin(g)]}
+                for g in gates]
+
+    def fanin(self, net):
+        return self._gate_records(self.netlist.drivers(self.net_id(net)))
+
+    def fanout(self, net):
+        return self._gate_records(sorted(set(self.netlist.fanout(self.net_id(net)))))
+
+    def dag(self):
+        """DAG data in the dag_builder JSON layout, built from the resident netlist."""
+        if self._dag is None:
+            from .core.dag_builder import build_dag_from_netlist, flatten_signal
+            from .parsers.json_converter import parse_netlist_txt
+
+            edges, labels = build_dag_from_netlist(self.netlist)
+            # Port lists as create_dag_from_netlist reads them from the JSON netlist
+            data = parse_netlist_txt(self.path)
+            self._dag = {
+                'edges': edges,
+                'labels': labels,
+                'primary_inputs': [s for sig in data['primary_inputs'] for s in flatten_signal(sig)],
+                'primary_outputs': [s for sig in data['primary_outputs'] for s in flatten_signal(sig)],
+            }
+        return self._dag
+
+    def reconvergence(self, algorithm):
+        """Reconvergence results of one algorithm on the resident DAG (memoized)."""
+        if algorithm not in RECONVERGENCE_ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {RECONVERGENCE_ALGORITHMS}")
+        if algorithm not in self._reconvergence:
+            dag = self.dag()
+            if algorithm == 'simple':
+                from .core.simple_reconvergence import SimpleReconvergenceDetector
+                results = SimpleReconvergenceDetector(dag).run_complete_algorithm()
+            elif algorithm == 'advanced':
+                from .core.advanced_reconvergence import create_detector
+                results = create_detector(dag).run_complete_algorithm()
+            elif algorithm == 'dominator':
+                from .core.dominator_reconvergence import DominatorReconvergenceDetector
+                results = DominatorReconvergenceDetector(dag).run_complete_algorithm()
+            else:
+                from .core.reconvergence import build_dag_graph, break_cycles, find_reconvergences
+                G = build_dag_graph(dag)
+                break_cycles(G)
+                found = find_reconvergences(G)
+                results = {'algorithm': 'baseline', 'total_nodes': G.number_of_nodes(),
+                           'total_edges': G.number_of_edges(),
+                           'reconvergent_sites': len({r['site'] for r in found}),
+                           'total_reconvergences': len(found), 'reconvergences': found}
+            self._reconvergence[algorithm] = results
+        return self._reconvergence[algorithm]
+
+
+class OpenTestServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix-socket JSON server holding resident designs.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on
+        command_handler: Optional function(argv) -> bool running an opentest
+                         command line in this process (used by `command`)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path=None, command_handler=None):
+        self.socket_path = str(socket_path or default_socket_path())
+        self.command_handler = command_handler
+        self.designs = {}
+        self.tables = {}
+        self.started = time.time()
+        self.requests = 0
+        self.stopping = False
+        self.lock = threading.Lock()
+        _remove_stale_socket(self.socket_path)
+        super().__init__(self.socket_path, _RequestHandler)
+
+    # Resident data
+
+    def load(self, netlist, name=None, mode='levelized', library=None):
+        path = Path(netlist)
+        if not path.exists():
+            path = get_project_paths()['parsed'] / netlist
+        if not path.exists():
+            raise FileNotFoundError(f"Parsed netlist not found: {netlist}")
+        design = ResidentDesign(name or path.stem, path, mode, library)
+        self.designs[design.name] = design
+        return design.info()
+
+    def design(self, name):
+        try:
+            return self.designs[name]
+        except KeyError:
+            raise KeyError(f"Design '{name}' is not loaded") from None
+
+    def table(self, source):
+        """
+        MetricTable of a resident design, or of a result file.
+
+        Result files stay open and are reused until their size or
+        modification time changes.
+        """
+        if source in self.designs:
+            return self.designs[source].table
+        from .core.scoap_query import MetricTable
+
+        path = Path(source)
+        if not path.exists():
+            path = get_project_paths()['results'] / source
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self.tables.get(str(path))
+        if cached is None or cached[0] != stamp:
+            if cached is not None:
+                cached[1].close()
+            cached = (stamp, MetricTable.load(path))
+            self.tables[str(path)] = cached
+        return cached[1]
+
+    # Request dispatch
+
+    def dispatch(self, method, params):
+        handler = getattr(self, f"_do_{method}", None)
+        if handler is None:
+            raise ValueError(f"Unknown method '{method}'")
+        return handler(**params)
+
+    def _do_ping(self):
+        from . import __version__
+        return {'version': __version__, 'pid': os.getpid(), 'requests': self.requests,
+                'uptime': round(time.time() - self.started, 3)}
+
+    def _do_load(self, netlist, name=None, mode='levelized', library=None):
+        return self.load(netlist, name, mode, library)
+
+    def _do_unload(self, name):
+        self.design(name)
+        del self.designs[name]
+        return {'unloaded': name}
+
+    def _do_designs(self):
+        return [d.info() for d in self.designs.values()]
+
+    def _do_metrics(self, name, nets):
+        design = self.design(name)
+        return {net: design.metrics(net) for net in nets}
+
+    def _do_query(self, name=None, file=None, k=10, by='co', where=None, smallest=False):
+        table = self.table(name if name is not None else file)
+        rows, matched = table.top_k(k, by, where, largest=not smallest)
+        return {'matched': matched,
+                'rows': [[r.net] + [_json_value(v) for v in r[1:]] for r in rows]}
+
+    def _do_fanin(self, name, net):
+        return self.design(name).fanin(net)
+
+    def _do_fanout(self, name, net):
+        return self.design(name).fanout(net)
+
+    def _do_reconvergence(self, name, algorithm='simple', full=False):
+        results = self.design(name).reconvergence(algorithm)
+        if full:
+            return results
+        return {k: v for k, v in results.items() if not isinstance(v, (list, dict))}
+
+    def _do_command(self, argv):
+        if self.command_handler is None:
+            raise ValueError("This server does not accept CLI commands")
+        return {'success': bool(self.command_handler(list(argv)))}
+
+    def _do_shutdown(self):
+        # The handler stops the server once this response has been written
+        self.stopping = True
+        return {'stopping': True}
+
+    def handle_request_line(self, line):
+        """Execute one protocol line and return the response object."""
+        try:
+            request = json.loads(line)
+            rid = request.get('id')
+            method = request['method']
+            params = request.get('params') or {}
+        except (ValueError, KeyError, AttributeError) as e:
+            return {'id': None, 'ok': False, 'error': f"Malformed request: {e}", 'output': ''}
+
+        out = io.StringIO()
+        with self.lock:
+            self.requests += 1
+            try:
+                with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+                    result = self.dispatch(method, params)
+                return {'id': rid, 'ok': True, 'result': result, 'output': out.getvalue()}
+            except Exception as e:
+                message = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+                return {'id': rid, 'ok': False, 'error': f"{type(e).__name__}: {message}",
+                        'output': out.getvalue()}
+
+    def serve(self):
+        """Serve until a shutdown request or Ctrl-C, then remove the socket."""
+        print(f"[✓] OpenTestability server listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+            print("[✓] Server stopped")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.handle_request_line(line)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            if self.server.stopping:
+                self.server.shutdown()
+                return
+
+
+def _remove_stale_socket(path):
+    """Remove a socket file left by a dead server; refuse if one is running."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"A server is already listening on {path}")
+
+
+class Client:
+    """
+    Connection to a running server; reusable for many requests.
+
+    Example:
+        with Client() as client:
+            client.call('load', netlist='priority_enc.txt')
+            rows = client.call('query', name='priority_enc', k=5)['rows']
+    """
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = str(socket_path or default_socket_path())
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.socket_path)
+        self._rfile = self._sock.makefile('rb')
+        self._next_id = 0
+
+    def close(self):
+        self._rfile.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, method, **params):
+        """Send one request and return the full response object."""
+        self._next_id += 1
+        message = {'id': self._next_id, 'method': method, 'params': params}
+        self._sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        line = self._rfile.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return json.loads(line)
+
+    def call(self, method, **params):
+        """
+        Send one request and return its result.
+
+        Raises:
+            ServerError: If the server reports an error
+        """
+        response = self.request(method, **params)
+        if not response['ok']:
+            raise ServerError(response['error'])
+        return response['result']
+
+
+def forward_command(argv, socket_path=None):
+    """
+    Thin-client entry point: run an opentest command line on the server.
+
+    Prints the command output and returns a process exit status.
+    """
+    try:
+        with Client(socket_path) as client:
+            response = client.request('command', argv=list(argv))
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"[✗] No OpenTestability server on {socket_path or default_socket_path()} "
+              f"(start one with 'opentest serve')", file=sys.stderr)
+        return 2
+    except OSError as e:
+        # ConnectionError included: the server went away mid-request
+        print(f"[✗] Lost connection to the server: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response.get('output', ''))
+    if not response['ok']:
+        print(f"[✗] {response['error']}", file=sys.stderr)
+        return 1
+    return 0 if response['result']['success'] else 1
@@ -4,12 +4,28 @@ Utility functions and common operations.
 This module contains:
 - File handling utilities
 - Path management
+- Content-addressed artifact cache
+- Synthetic scalable circuit generator
+- Startup and per-stage benchmarks
+- Profiling spans, counters and Chrome trace export
 - Common helper functions
+
+artifact_cache is imported on first access; file_utils stays eager because
+every command needs the project paths.
 """
 
 from .file_utils import ensure_directory, get_project_paths
 
 __all__ = [
     'ensure_directory',
-    'get_project_paths'
-]
\ No newline at end of file
+    'get_project_paths',
+    'ArtifactCache',
+    'cached_stage'
+]
+
+
+def __getattr__(name):
+    if name in ('ArtifactCache', 'cached_stage'):
+        from . import artifact_cache
+        return getattr(artifact_cache, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
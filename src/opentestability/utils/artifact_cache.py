@@ -0,0 +1,299 @@
+"""
+Content-addressed cache for pipeline artifacts.
+
+Each stage (parse, json, dag, scoap) keys its outputs by a SHA-256 over the
+stage name, the tool fingerprint (package version plus a digest of the
+package sources), the stage options and the content of every input file.
+Entries live in data/cache/<key[:2]>/<key>/ as copies of the output files
+plus a meta.json; the mtime of meta.json is the last access time used for
+LRU eviction once the cache grows beyond its size bound.
+
+What a stage prints while it runs (warnings, timing reports, progress
+lines) is recorded with the entry and replayed on a hit, so a cached run
+reports the same diagnostics as the run that produced it.
+
+Set OPENTEST_CACHE=0 to bypass the cache and OPENTEST_CACHE_SIZE to change
+the bound (bytes, or with a K/M/G suffix; default 512M).
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from . import profiling
+from .file_utils import get_project_paths, ensure_directory
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_SIZE_SUFFIXES = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+# State key holding the stage's recorded [stream, text] output chunks
+_OUTPUT_KEY = '_output'
+_fingerprint = None
+
+
+def parse_size(text):
+    """Parse a byte count such as '1048576', '64M' or '2G'."""
+    text = str(text).strip().upper().rstrip('B')
+    if text and text[-1] in _SIZE_SUFFIXES:
+        return int(float(text[:-1]) * _SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def format_size(n):
+    """Human-readable byte count."""
+    for unit in ('B', 'K', 'M'):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}G"
+
+
+def tool_fingerprint():
+    """Package version plus a digest of the package sources, computed once per process."""
+    global _fingerprint
+    if _fingerprint is None:
+        from .. import __version__
+
+        package = Path(__file__).resolve().parent.parent
+        h = hashlib.sha256()
+        for path in sorted(package.rglob('*.py')):
+            h.update(str(path.relative_to(package)).encode())
+            h.update(path.read_bytes())
+        _fingerprint = f"{__version__}+{h.hexdigest()[:16]}"
+    return _fingerprint
+
+
+def file_digest(path):
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_enabled():
+    """False when OPENTEST_CACHE is set to 0/off/no/false."""
+    return os.environ.get('OPENTEST_CACHE', '1').lower() not in ('0', 'off', 'no', 'false')
+
+
+class _TeeStream:
+    """Text stream that forwards writes and records them as output chunks."""
+
+    def __init__(self, stream, name, chunks):
+        self.stream = stream
+        self.name = name
+        self.chunks = chunks
+
+    def write(self, text):
+        self.stream.write(text)
+        if text:
+            if self.chunks and self.chunks[-1][0] == self.name:
+                self.chunks[-1][1] += text
+            else:
+                self.chunks.append([self.name, text])
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
+
+
+def _run_recorded(build):
+    """Run build while echoing and recording its stdout/stderr; returns the chunks."""
+    chunks = []
+    with contextlib.redirect_stdout(_TeeStream(sys.stdout, 'stdout', chunks)), \
+            contextlib.redirect_stderr(_TeeStream(sys.stderr, 'stderr', chunks)):
+        build()
+    return chunks
+
+
+def _replay(chunks):
+    """Write recorded output chunks back to stdout/stderr in their original order."""
+    for name, text in chunks:
+        getattr(sys, name).write(text)
+
+
+class ArtifactCache:
+    """
+    Size-bounded LRU store of stage outputs addressed by input content.
+
+    Entries are written to a temporary directory and renamed into place, so
+    concurrent writers (e.g. batch workers) never expose partial entries.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path(root) if root else get_project_paths()['cache']
+        if max_bytes is None:
+            env = os.environ.get('OPENTEST_CACHE_SIZE')
+            max_bytes = parse_size(env) if env else DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+
+    def key(self, stage, inputs, options=None):
+        """
+        Cache key of a stage run.
+
+        Args:
+            stage: Stage name
+            inputs: Input file paths; their content, not their names, is hashed
+            options: JSON-serializable options that affect the outputs
+        """
+        h = hashlib.sha256()
+        h.update(json.dumps([stage, tool_fingerprint(), options or {}], sort_keys=True,
+                            default=str).encode())
+        for path in inputs:
+            h.update(file_digest(path).encode())
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return self.root / key[:2] / key
+
+    def fetch(self, key, outputs):
+        """
+        Restore a cached entry to the given output paths.
+
+        Returns:
+            The state dictionary stored with the entry, or None on a miss
+        """
+        entry = self._entry(key)
+        try:
+            with open(entry / 'meta.json') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if len(meta['files']) != len(outputs):
+            return None
+        try:
+            for name, out in zip(meta['files'], outputs):
+                ensure_directory(Path(out).parent)
+                shutil.copyfile(entry / name, out)
+            os.utime(entry / 'meta.json')
+        except OSError:
+            return None
+        return meta.get('state', {})
+
+    def store(self, key, stage, outputs, state=None):
+        """Copy stage outputs into the cache, then evict down to the size bound."""
+        entry = self._entry(key)
+        if entry.exists():
+            return
+        ensure_directory(entry.parent)
+        tmp = Path(tempfile.mkdtemp(prefix='.tmp-', dir=entry.parent))
+        try:
+            files = []
+            size = 0
+            for k, out in enumerate(outputs):
+                name = f"{k}{Path(out).suffix}"
+                shutil.copyfile(out, tmp / name)
+                size += (tmp / name).stat().st_size
+                files.append(name)
+            meta = {'stage': stage, 'files': files, 'size': size,
+                    'source': [str(o) for o in outputs], 'created': time.time(),
+                    'state': state or {}}
+            with open(tmp / 'meta.json', 'w') as f:
+                json.dump(meta, f)
+            os.rename(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def entries(self):
+        """Entry records (key, stage, size, last_access), least recently used first."""
+        records = []
+        if not self.root.exists():
+            return records
+        for meta_path in self.root.glob('??/*/meta.json'):
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                atime = meta_path.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            records.append({'key': meta_path.parent.name, 'stage': meta['stage'],
+                            'size': meta['size'], 'last_access': atime})
+        records.sort(key=lambda r: r['last_access'])
+        return records
+
+    def evict(self, max_bytes=None):
+        """Drop least recently used entries until the cache fits max_bytes; returns the count."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        records = self.entries()
+        total = sum(r['size'] for r in records)
+        evicted = 0
+        for r in records:
+            if total <= limit:
+                break
+            shutil.rmtree(self._entry(r['key']), ignore_errors=True)
+            total -= r['size']
+            evicted += 1
+        return evicted
+
+    def clear(self, stage=None):
+        """Remove every entry, or only those of one stage; returns the count."""
+        records = [r for r in self.entries() if stage is None or r['stage'] == stage]
+        for r in records:
+            shutil.rmtree(self._entry(r['key']), ignore_errors=True)
+        return len(records)
+
+    def status(self):
+        """Entry count and bytes in total and per stage."""
+        records = self.entries()
+        stages = {}
+        for r in records:
+            s = stages.setdefault(r['stage'], {'entries': 0, 'bytes': 0})
+            s['entries'] += 1
+            s['bytes'] += r['size']
+        return {'root': str(self.root), 'entries': len(records),
+                'bytes': sum(r['size'] for r in records), 'max_bytes': self.max_bytes,
+                'stages': stages}
+
+
+def cached_stage(stage, inputs, outputs, build, options=None, state=None):
+    """
+    Run a pipeline stage unless an identical run is cached.
+
+    Args:
+        stage: Stage name
+        inputs: Input file paths
+        outputs: Output file paths the stage writes
+        build: Function producing the outputs
+        options: Options that affect the outputs (see ArtifactCache.key)
+        state: Optional dictionary filled by build; saved with the entry
+               and restored on a hit
+
+    The stdout/stderr of build is saved with the entry as well and replayed
+    after the cache hit message.
+
+    Returns:
+        True on a cache hit, False if build ran
+    """
+    with profiling.span(stage):
+        if not cache_enabled() or not all(Path(p).is_file() for p in inputs):
+            # Missing inputs are left to the stage to report
+            build()
+            return False
+        cache = ArtifactCache()
+        with profiling.span('cache.lookup'):
+            key = cache.key(stage, inputs, options)
+            restored = cache.fetch(key, outputs)
+        if restored is not None:
+            profiling.add('cache.hits')
+            chunks = restored.pop(_OUTPUT_KEY, [])
+            if state is not None:
+                state.update(restored)
+            print(f"[✓] Cache hit ({stage}): {outputs[0]}")
+            _replay(chunks)
+            return True
+        profiling.add('cache.misses')
+        chunks = _run_recorded(build)
+        with profiling.span('cache.store'):
+            cache.store(key, stage, outputs, {**(state or {}), _OUTPUT_KEY: chunks})
+        return False
@@ -0,0 +1,453 @@
+"""
+Benchmarks for the opentest tool.
+
+The startup benchmark runs `opentest <command>` (default: help) in fresh
+interpreters and reports the wall time, plus the module import time
+measured with `python -X importtime`. It also lists any heavy analysis
+dependency that the command imported, so a regression in the lazy-import
+structure of the CLI shows up as a named module rather than a slower
+number.
+
+The stage benchmark generates synthetic circuits of one shape over a size
+sweep (see circuit_generator) and times every pipeline stage on each:
+
+    parse     Verilog -> parsed netlist (fast reader)
+    json      parsed netlist -> JSON
+    dag       JSON -> DAG JSON
+    scoap     load the parsed netlist and solve CC0/CC1/CO
+    baseline  reconvergence.find_reconvergences on the DAG
+    simple    SimpleReconvergenceDetector
+    advanced  advanced_reconvergence.create_detector (bitset FOBLs)
+    dominator DominatorReconvergenceDetector
+
+Each stage runs in a child process that reads its input from the files
+the previous stages wrote to a temporary directory (the project data
+directories are left untouched); loading that input is not timed. A stage
+that exceeds the time budget is stopped and skipped at every larger size,
+so detectors with exponential worst cases cannot stall a sweep.
+"""
+
+import contextlib
+import csv
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .file_utils import get_project_paths, ensure_directory
+
+HEAVY_MODULES = ('networkx', 'numpy', 'pygraphviz', 'pyverilog', 'matplotlib')
+STAGES = ('parse', 'json', 'dag', 'scoap', 'baseline', 'simple', 'advanced', 'dominator')
+BENCH_FIELDS = ('shape', 'size', 'gates', 'stage', 'status', 'seconds', 'cpu_seconds',
+                'result', 'error')
+
+# Stages whose output a later stage reads
+_PREREQUISITES = {'dag': 'json', 'baseline': 'dag', 'simple': 'dag', 'advanced': 'dag',
+                  'dominator': 'dag'}
+
+# Modules imported before a stage is timed
+_STAGE_MODULES = {
+    'parse': ('..parsers.verilog_parser', '..parsers.structural_verilog'),
+    'json': ('..parsers.json_converter',),
+    'dag': ('..core.dag_builder',),
+    'scoap': ('..core.scoap', '..core.scoap_vectorized'),
+    'baseline': ('..core.reconvergence',),
+    'simple': ('..core.simple_reconvergence',),
+    'advanced': ('..core.advanced_reconvergence',),
+    'dominator': ('..core.dominator_reconvergence',),
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output.
+
+    Args:
+        stderr: Text written by the interpreter to stderr
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order;
+        depth 0 marks a top-level import
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def _opentest_argv(command, importtime=False):
+    script = get_project_paths()['root'] / 'opentest'
+    argv = [sys.executable]
+    if importtime:
+        argv += ['-X', 'importtime']
+    return argv + [str(script)] + list(command)
+
+
+def measure_startup(command=('help',), runs=5):
+    """
+    Measure the startup cost of one opentest command.
+
+    Args:
+        command: opentest arguments
+        runs: Number of timed runs
+
+    Returns:
+        Dictionary with wall times (ms), the import time total (ms), the
+        slowest top-level imports and the heavy modules that were loaded
+    """
+    env = dict(os.environ, OPENTEST_CACHE='0')
+    walls = []
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        subprocess.run(_opentest_argv(command), stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, env=env, check=False)
+        walls.append((time.perf_counter() - start) * 1000)
+
+    proc = subprocess.run(_opentest_argv(command, importtime=True), stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True, env=env, check=False)
+    records = parse_importtime(proc.stderr)
+    top_level = sorted((r for r in records if r[3] == 0), key=lambda r: -r[2])
+    heavy = sorted({r[0].split('.')[0] for r in records} & set(HEAVY_MODULES))
+    return {
+        'command': ' '.join(command),
+        'runs': len(walls),
+        'wall_ms': {'min': round(min(walls), 1), 'median': round(statistics.median(walls), 1),
+                    'max': round(max(walls), 1)},
+        'import_ms': round(sum(r[1] for r in records) / 1000, 1),
+        'modules': len(records),
+        'slowest_imports': [{'module': r[0], 'cumulative_ms': round(r[2] / 1000, 1)}
+                            for r in top_level[:5]],
+        'heavy_modules': heavy,
+    }
+
+
+def run_startup_benchmark(commands=(('help',),), runs=5, output_filename=None):
+    """
+    Run the startup benchmark and print a report.
+
+    Args:
+        commands: opentest argument lists to measure
+        runs: Timed runs per command
+        output_filename: Optional JSON report, written to data/results
+
+    Returns:
+        List of measure_startup results
+    """
+    results = []
+    for command in commands:
+        r = measure_startup(command, runs)
+        results.append(r)
+        wall = r['wall_ms']
+        print(f"\nopentest {r['command']}:")
+        print(f"  wall time:   {wall['median']} ms median "
+              f"({wall['min']}-{wall['max']} ms over {r['runs']} runs)")
+        print(f"  import time: {r['import_ms']} ms across {r['modules']} modules")
+        for imp in r['slowest_imports']:
+            print(f"    {imp['module']:<32} {imp['cumulative_ms']:>8} ms")
+        if r['heavy_modules']:
+            print(f"[WARN] heavy modules imported: {', '.join(r['heavy_modules'])}",
+                  file=sys.stderr)
+
+    if output_filename:
+        results_dir = get_project_paths()['results']
+        ensure_directory(results_dir)
+        output_path = Path(output_filename)
+        if not output_path.is_absolute():
+            output_path = results_dir / output_path
+        with open(output_path, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+        print(f"[✓] Startup benchmark written to {output_path}")
+    return results
+
+
+def _stage_parse(ctx):
+    from ..parsers.verilog_parser import parse_verilog_file
+
+    parse_verilog_file(ctx['verilog'], ctx['dir'] / 'parsed.txt', 'fast')
+    with open(ctx['dir'] / 'parsed.txt') as f:
+        return sum(1 for line in f if ' out(' in line)
+
+
+def _stage_json(ctx):
+    from ..parsers.json_converter import parse_netlist_txt
+
+    ctx['netlist'] = parse_netlist_txt(ctx['parsed'])
+    with open(ctx['dir'] / 'netlist.json', 'w') as f:
+        json.dump(ctx['netlist'], f, indent=4)
+    return len(ctx['netlist']['gates'])
+
+
+def _stage_dag(ctx):
+    from ..core.dag_builder import build_dag_data
+
+    ctx['dag'] = build_dag_data(ctx['netlist'])
+    with open(ctx['dir'] / 'dag.json', 'w') as f:
+        json.dump(ctx['dag'], f, indent=2)
+    return len(ctx['dag']['edges'])
+
+
+def _stage_scoap(ctx):
+    from ..core.scoap import load_netlist, solve_netlist
+
+    netlist = load_netlist(ctx['parsed'])
+    solve_netlist(netlist, ctx['mode'])
+    return netlist.num_nets
+
+
+def _stage_baseline(ctx):
+    from ..core.reconvergence import build_dag_graph, break_cycles, find_reconvergences
+
+    G = build_dag_graph(ctx['dag'])
+    break_cycles(G)
+    return len(find_reconvergences(G))
+
+
+def _stage_simple(ctx):
+    from ..core.simple_reconvergence import SimpleReconvergenceDetector
+
+    return SimpleReconvergenceDetector(ctx['dag']).run_complete_algorithm()['total_reconvergences']
+
+
+def _stage_advanced(ctx):
+    from ..core.advanced_reconvergence import create_detector
+
+    return len(create_detector(ctx['dag']).run_complete_algorithm()['reconvergences'])
+
+
+def _stage_dominator(ctx):
+    from ..core.dominator_reconvergence import DominatorReconvergenceDetector
+
+    return DominatorReconvergenceDetector(ctx['dag']).run_complete_algorithm()['total_reconvergences']
+
+
+def _load_stage_inputs(stage, ctx):
+    for module in _STAGE_MODULES[stage]:
+        importlib.import_module(module, __package__)
+    if stage == 'dag':
+        with open(ctx['dir'] / 'netlist.json') as f:
+            ctx['netlist'] = json.load(f)
+    elif _PREREQUISITES.get(stage) == 'dag':
+        with open(ctx['dir'] / 'dag.json') as f:
+            ctx['dag'] = json.load(f)
+
+
+def _stage_worker(stage, ctx, conn, verbose):
+    """Child process body: load the stage input, then time the stage."""
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                log = io.StringIO()
+                stack.enter_context(contextlib.redirect_stdout(log))
+                stack.enter_context(contextlib.redirect_stderr(log))
+            _load_stage_inputs(stage, ctx)
+            wall, cpu = time.perf_counter(), time.process_time()
+            result = _STAGE_RUNNERS[stage](ctx)
+            conn.send(('ok', result, time.perf_counter() - wall, time.process_time() - cpu, ''))
+    except (Exception, SystemExit) as e:
+        # load_netlist reports unreadable files with sys.exit
+        conn.send(('error', '', '', '', str(e) or type(e).__name__))
+    finally:
+        conn.close()
+
+
+def _time_stage(stage, ctx, timeout, verbose):
+    """
+    Run one stage in a child process.
+
+    Returns:
+        Tuple of (status, result, seconds, cpu_seconds, error)
+    """
+    methods = multiprocessing.get_all_start_methods()
+    mp = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+    recv, send = mp.Pipe(duplex=False)
+    proc = mp.Process(target=_stage_worker, args=(stage, ctx, send, verbose))
+    proc.start()
+    send.close()
+    try:
+        if recv.poll(timeout):
+            try:
+                return recv.recv()
+            except EOFError:
+                return ('error', '', '', '', f"worker exited with code {proc.exitcode}")
+        proc.terminate()
+        return ('timeout', '', timeout, '', f"exceeded the {timeout}s budget")
+    finally:
+        proc.join()
+        recv.close()
+
+
+_STAGE_RUNNERS = {
+    'parse': _stage_parse,
+    'json': _stage_json,
+    'dag': _stage_dag,
+    'scoap': _stage_scoap,
+    'baseline': _stage_baseline,
+    'simple': _stage_simple,
+    'advanced': _stage_advanced,
+    'dominator': _stage_dominator,
+}
+
+
+def _needed_stages(stages):
+    """Selected stages plus their prerequisites, in pipeline order."""
+    needed = set(stages)
+    for stage in stages:
+        while stage in _PREREQUISITES:
+            stage = _PREREQUISITES[stage]
+            needed.add(stage)
+    return [s for s in STAGES if s in needed]
+
+
+def benchmark_size(shape, size, stages=STAGES, mode='levelized', skip=(), budget=None,
+                   options=None, verbose=False):
+    """
+    Generate one circuit and time the pipeline stages on it.
+
+    Args:
+        shape, size, options: Circuit to generate (see circuit_generator.generate)
+        stages: Stages to report, a subset of STAGES
+        mode: SCOAP engine for the scoap stage
+        skip: Stages to report as skipped (prerequisites of other stages still run)
+        budget: Seconds after which a stage is stopped (None: no limit)
+        verbose: Show the output of the stages
+
+    Returns:
+        List of records with the BENCH_FIELDS keys, one per reported stage
+    """
+    from .circuit_generator import generate, write_parsed, write_verilog
+
+    circuit = generate(shape, size, **(options or {}))
+    records = []
+    with tempfile.TemporaryDirectory(prefix='opentest-bench-') as tmp:
+        tmp = Path(tmp)
+        ctx = {'dir': tmp, 'mode': mode,
+               'verilog': write_verilog(circuit, tmp / f"{circuit.name}.v"),
+               'parsed': write_parsed(circuit, tmp / f"{circuit.name}.txt")}
+        run = _needed_stages([s for s in stages if s not in skip])
+        failed = set()
+        for stage in STAGES:
+            if stage not in run and stage not in stages:
+                continue
+            record = dict.fromkeys(BENCH_FIELDS, '')
+            record.update(shape=shape, size=size, gates=len(circuit.gates), stage=stage)
+            if stage not in run:
+                record['status'] = 'skipped'
+                record['error'] = 'over budget at a smaller size'
+            elif _PREREQUISITES.get(stage) in failed:
+                record['status'] = 'skipped'
+                record['error'] = f"{_PREREQUISITES[stage]} failed"
+                failed.add(stage)
+            else:
+                status, result, seconds, cpu, error = _time_stage(stage, ctx, budget, verbose)
+                record.update(status=status, result=result, error=error,
+                              seconds=round(seconds, 4) if seconds != '' else '',
+                              cpu_seconds=round(cpu, 4) if cpu != '' else '')
+                if status != 'ok':
+                    failed.add(stage)
+            if stage in stages:
+                records.append(record)
+    return records
+
+
+def format_stage_table(records):
+    """Stage x size table of wall times for terminal output."""
+    sizes = sorted({r['size'] for r in records})
+    stages = [s for s in STAGES if any(r['stage'] == s for r in records)]
+    cell = {(r['stage'], r['size']): r for r in records}
+    gates = {r['size']: r['gates'] for r in records}
+    lines = [f"{'stage':<10}" + ''.join(f"{f'n={n}':>12}" for n in sizes),
+             f"{'gates':<10}" + ''.join(f"{gates[n]:>12}" for n in sizes)]
+    for stage in stages:
+        row = []
+        for n in sizes:
+            r = cell.get((stage, n))
+            if r is None:
+                row.append('')
+            elif r['status'] == 'ok':
+                row.append(f"{r['seconds']:.4f}s")
+            else:
+                row.append(r['status'])
+        lines.append(f"{stage:<10}" + ''.join(f"{v:>12}" for v in row))
+    return "\n".join(lines)
+
+
+def run_stage_benchmark(shape, sizes, stages=STAGES, budget=60.0, mode='levelized',
+                        options=None, output_filename=None, verbose=False):
+    """
+    Time every pipeline stage over a size sweep of synthetic circuits.
+
+    Args:
+        shape: Circuit shape (see circuit_generator.SHAPES)
+        sizes: Shape sizes to generate
+        stages: Stages to time, a subset of STAGES (default: all)
+        budget: Seconds after which a stage is stopped and skipped at
+                larger sizes (None: no limit)
+        mode: SCOAP engine for the scoap stage
+        options: Shape options passed to the generator
+        output_filename: Report base name in data/results (default:
+                         bench_<shape>); a .json and a .csv report are written
+        verbose: Show the output of the stages
+
+    Returns:
+        List of stage records (see BENCH_FIELDS)
+    """
+    stages = stages or STAGES
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {', '.join(unknown)}, expected {STAGES}")
+    records = []
+    over_budget = set()
+    for size in sorted(sizes):
+        size_records = benchmark_size(shape, size, stages, mode, over_budget, budget, options,
+                                      verbose)
+        over_budget.update(r['stage'] for r in size_records if r['status'] == 'timeout')
+        gates = size_records[0]['gates'] if size_records else 0
+        print(f"[✓] {shape} n={size} ({gates} gates): " + ', '.join(
+            f"{r['stage']} {r['seconds']}s" if r['status'] == 'ok' else f"{r['stage']} {r['status']}"
+            for r in size_records))
+        records.extend(size_records)
+
+    print()
+    print(format_stage_table(records))
+    failures = [r for r in records if r['status'] == 'error']
+    if failures:
+        print(f"[WARN] {len(failures)} stage runs failed", file=sys.stderr)
+
+    results_dir = get_project_paths()['results']
+    ensure_directory(results_dir)
+    base = Path(output_filename or f"bench_{shape}")
+    if base.suffix in ('.json', '.csv'):
+        base = base.with_suffix('')
+    if not base.is_absolute():
+        base = results_dir / base
+    report = {
+        'python': sys.version.split()[0],
+        'shape': shape,
+        'sizes': sorted(sizes),
+        'options': options or {},
+        'scoap_mode': mode,
+        'budget_seconds': budget,
+        'records': records,
+    }
+    with open(f"{base}.json", 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(f"{base}.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=BENCH_FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    print(f"[✓] Stage benchmark written to {base}.json and {base}.csv")
+    return records
@@ -0,0 +1,342 @@
+"""
+Synthetic gate-level circuit generator.
+
+Builds scalable designs for exercising SCOAP and the reconvergence
+detectors at sizes well beyond the example circuits, and writes them as
+parsed-format netlists (data/parsed/) and structural Verilog (data/input/):
+
+    multiplier  Array multiplier: AND partial products summed by rows of
+                ripple-carry adders (size = operand width; ~6*n^2 gates)
+    xor_tree    Parity tree over n inputs (size = n; no reconvergence)
+    random      Random DAG of n gates with tunable fan-out and locality of
+                input choice, which controls how much fanout reconverges
+    pipeline    n-bit sequential pipeline: stages of mixing logic separated
+                by flip-flop register banks (size = width)
+
+Cells use standard-cell names the cell library infers (AND2X1, XOR2X1,
+DFFX1, ...), and the parsed netlist is written with the same functions as
+the Verilog parser, so parsing the generated Verilog reproduces it.
+Generation is deterministic for a given shape, size, options and seed.
+
+Example:
+    circuit = generate('multiplier', 16)
+    write_parsed(circuit, 'data/parsed/multiplier_16.txt')
+"""
+
+import inspect
+import random
+
+from .file_utils import get_project_paths, ensure_directory
+
+GENERATOR_FORMATS = ('parsed', 'verilog', 'both')
+
+_RANDOM_CELLS = {
+    1: ('INV', 'BUF'),
+    2: ('AND', 'NAND', 'OR', 'NOR', 'XOR', 'XNOR'),
+    3: ('AND', 'NAND', 'OR', 'NOR'),
+}
+
+
+class Circuit:
+    """
+    Gate-level netlist under construction.
+
+    Args:
+        name: Module name
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.inputs = []
+        self.outputs = []
+        self.gates = []
+        self._wires = 0
+
+    def add_input(self, name, width=None):
+        """Declare an input port; returns its bit nets (LSB first)."""
+        self.inputs.append((name, width))
+        return _bits(name, width)
+
+    def add_output(self, name, width=None):
+        """Declare an output port; returns its bit nets (LSB first)."""
+        self.outputs.append((name, width))
+        return _bits(name, width)
+
+    def wire(self):
+        """A fresh internal net name."""
+        name = f"n_{self._wires}"
+        self._wires += 1
+        return name
+
+    def gate(self, function, inputs, output=None):
+        """
+        Add a cell driving `output` (a fresh wire by default).
+
+        Args:
+            function: Cell function, e.g. 'AND', 'XOR', 'INV' or 'DFF'
+                      (flip-flop inputs are clock, data)
+            inputs: Input nets in pin order
+            output: Output net
+
+        Returns:
+            The output net
+        """
+        output = output or self.wire()
+        if function == 'DFF':
+            cell = 'DFFX1'
+        elif len(inputs) == 1:
+            cell = f"{function}X1"
+        else:
+            cell = f"{function}{len(inputs)}X1"
+        self.gates.append((cell, output, list(inputs)))
+        return output
+
+    def rename(self, mapping):
+        """Rename nets everywhere (used to bind results to output ports)."""
+        self.gates = [(cell, mapping.get(out, out), [mapping.get(n, n) for n in ins])
+                      for cell, out, ins in self.gates]
+
+    def wires(self):
+        """Internal nets, in creation order."""
+        ports = {n for name, width in self.inputs + self.outputs for n in _bits(name, width)}
+        return [out for _, out, _ in self.gates if out not in ports]
+
+
+def _bits(name, width):
+    return [name] if width is None else [f"{name}[{i}]" for i in range(width)]
+
+
+def _port(name, width):
+    return name if width is None else f"{name}[{width - 1}:0]"
+
+
+def _pins(cell, count):
+    if cell.startswith('DFF'):
+        return ('CK', 'D'), 'Q'
+    return tuple('ABCDEFGH'[:count]), 'Y'
+
+
+def multiplier(width):
+    """Unsigned width x width array multiplier with a 2*width-bit product."""
+    if width < 2:
+        raise ValueError("multiplier width must be at least 2")
+    c = Circuit(f"multiplier_{width}")
+    a = c.add_input('A', width)
+    b = c.add_input('B', width)
+    product = c.add_output('P', 2 * width)
+
+    # acc maps a bit position to the net holding the running sum there
+    acc = {j: c.gate('AND', [a[j], b[0]]) for j in range(width)}
+    for i in range(1, width):
+        carry = None
+        for j in range(width):
+            pos = i + j
+            pp = c.gate('AND', [a[j], b[i]])
+            terms = [t for t in (acc.get(pos), pp, carry) if t is not None]
+            if len(terms) == 1:
+                acc[pos], carry = terms[0], None
+            elif len(terms) == 2:
+                acc[pos] = c.gate('XOR', terms)
+                carry = c.gate('AND', terms)
+            else:
+                x, y, z = terms
+                t = c.gate('XOR', [x, y])
+                acc[pos] = c.gate('XOR', [t, z])
+                carry = c.gate('OR', [c.gate('AND', [x, y]), c.gate('AND', [t, z])])
+        if carry is not None:
+            acc[i + width] = carry
+    c.rename({acc[pos]: product[pos] for pos in range(2 * width)})
+    return c
+
+
+def xor_tree(width, arity=2):
+    """Parity of width inputs through a balanced tree of XOR cells."""
+    if width < 2 or arity < 2:
+        raise ValueError("xor_tree needs at least 2 inputs and arity >= 2")
+    c = Circuit(f"xor_tree_{width}")
+    level = c.add_input('D', width)
+    parity = c.add_output('parity')[0]
+    while len(level) > 1:
+        groups = [level[k:k + arity] for k in range(0, len(level), arity)]
+        level = [g[0] if len(g) == 1 else c.gate('XOR', g) for g in groups]
+    c.rename({level[0]: parity})
+    return c
+
+
+def random_dag(gates, inputs=None, fanout=4, reconvergence=0.5, window=16, seed=1):
+    """
+    Random combinational DAG.
+
+    Args:
+        gates: Number of gates
+        inputs: Number of primary inputs (default: gates / 8, at least 4)
+        fanout: Maximum fan-out per net for non-local input choices
+        reconvergence: Probability (0-1) that a gate input is taken from the
+                       `window` most recent nets; recent nets share ancestors,
+                       so higher values create more, shorter reconvergent paths
+        window: Size of the recent-net window
+        seed: Random seed
+
+    Every net left without fan-out becomes a bit of the output port Y.
+    """
+    if gates < 1:
+        raise ValueError("random DAG needs at least one gate")
+    if not 0 <= reconvergence <= 1:
+        raise ValueError("reconvergence must be between 0 and 1")
+    rng = random.Random(seed)
+    c = Circuit(f"random_{gates}")
+    nets = c.add_input('X', inputs or max(4, gates // 8))
+    uses = dict.fromkeys(nets, 0)
+
+    for _ in range(gates):
+        arity = min(rng.choice((1, 2, 2, 2, 3)), len(nets))
+        chosen = []
+        while len(chosen) < arity:
+            if rng.random() < reconvergence:
+                net = rng.choice(nets[-window:])
+            else:
+                net = rng.choice(nets)
+                for _ in range(4):
+                    if uses[net] < fanout:
+                        break
+                    net = rng.choice(nets)
+            if net not in chosen:
+                chosen.append(net)
+        for net in chosen:
+            uses[net] += 1
+        out = c.gate(rng.choice(_RANDOM_CELLS[arity]), chosen)
+        nets.append(out)
+        uses[out] = 0
+
+    sinks = [n for n in c.wires() if uses[n] == 0]
+    outputs = c.add_output('Y', len(sinks))
+    c.rename(dict(zip(sinks, outputs)))
+    return c
+
+
+def pipeline(width, stages=3, depth=2):
+    """
+    Sequential pipeline over a width-bit data path.
+
+    Each stage applies `depth` levels of two-input logic mixing neighbouring
+    bits, then registers every bit in a DFFX1 clocked by clk.
+    """
+    if width < 2 or stages < 1 or depth < 1:
+        raise ValueError("pipeline needs width >= 2, stages >= 1 and depth >= 1")
+    functions = ('XOR', 'AND', 'OR', 'NAND')
+    c = Circuit(f"pipeline_{width}")
+    clk = c.add_input('clk')[0]
+    bits = c.add_input('D', width)
+    q = c.add_output('Q', width)
+    for s in range(stages):
+        for d in range(depth):
+            bits = [c.gate(functions[(i + d + s) % 4], [bits[i], bits[(i + 1 + d) % width]])
+                    for i in range(width)]
+        bits = [c.gate('DFF', [clk, b]) for b in bits]
+    c.rename(dict(zip(bits, q)))
+    return c
+
+
+SHAPES = {
+    'multiplier': multiplier,
+    'xor_tree': xor_tree,
+    'random': random_dag,
+    'pipeline': pipeline,
+}
+
+
+def generate(shape, size, **options):
+    """
+    Build a synthetic circuit.
+
+    Args:
+        shape: One of SHAPES
+        size: Shape size parameter (operand width, input count, gate count
+              or data-path width)
+        **options: Shape options, e.g. seed/fanout/reconvergence for random,
+                   stages/depth for pipeline, arity for xor_tree
+
+    Returns:
+        Circuit
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}', expected one of {tuple(SHAPES)}")
+    build = SHAPES[shape]
+    params = inspect.signature(build).parameters
+    for key in options:
+        if key not in params or key == next(iter(params)):
+            raise ValueError(f"Option '{key}' does not apply to shape '{shape}'")
+    return build(size, **options)
+
+
+def write_parsed(circuit, path):
+    """Write a circuit in the parsed netlist format."""
+    from ..parsers.verilog_parser import write_header, write_instance, write_footer
+
+    pi = [_port(n, w) for n, w in circuit.inputs]
+    po = [_port(n, w) for n, w in circuit.outputs]
+    with open(path, 'w') as out:
+        write_header(out, pi, po)
+        cnt = 0
+        for cell, output, inputs in circuit.gates:
+            pins, out_pin = _pins(cell, len(inputs))
+            conns = dict(zip(pins, inputs))
+            conns[out_pin] = output
+            cnt = write_instance(out, cell, conns, cnt)
+        write_footer(out, pi, po)
+    return str(path)
+
+
+def write_verilog(circuit, path):
+    """Write a circuit as a structural Verilog module."""
+    ports = circuit.inputs + circuit.outputs
+    with open(path, 'w') as out:
+        out.write(f"// Synthetic circuit written by opentestability circuit_generator\n\n")
+        out.write(f"module {circuit.name}({', '.join(n for n, _ in ports)});\n")
+        for direction, decls in (('input', circuit.inputs), ('output', circuit.outputs)):
+            for name, width in decls:
+                vector = f" [{width - 1}:0]" if width is not None else ""
+                out.write(f"  {direction}{vector} {name};\n")
+        wires = circuit.wires()
+        for k in range(0, len(wires), 8):
+            out.write(f"  wire {', '.join(wires[k:k + 8])};\n")
+        for k, (cell, output, inputs) in enumerate(circuit.gates):
+            pins, out_pin = _pins(cell, len(inputs))
+            conns = [f".{p}({n})" for p, n in zip(pins, inputs)] + [f".{out_pin}({output})"]
+            out.write(f"  {cell} g_{k} ({', '.join(conns)});\n")
+        out.write("endmodule\n")
+    return str(path)
+
+
+def generate_design(shape, size, name=None, output_format='both', **options):
+    """
+    Generate a circuit and write it to the project data directories.
+
+    Args:
+        shape, size, **options: See generate
+        name: Design name (default: <shape>_<size>)
+        output_format: 'parsed' (data/parsed/<name>.txt), 'verilog'
+                       (data/input/<name>.v) or 'both'
+
+    Returns:
+        Dictionary of written paths by format
+    """
+    if output_format not in GENERATOR_FORMATS:
+        raise ValueError(f"Unknown format '{output_format}', expected one of {GENERATOR_FORMATS}")
+    circuit = generate(shape, size, **options)
+    name = name or f"{shape}_{size}"
+    circuit.name = name
+    paths = get_project_paths()
+    written = {}
+    if output_format in ('parsed', 'both'):
+        ensure_directory(paths['parsed'])
+        written['parsed'] = write_parsed(circuit, paths['parsed'] / f"{name}.txt")
+    if output_format in ('verilog', 'both'):
+        ensure_directory(paths['input'])
+        written['verilog'] = write_verilog(circuit, paths['input'] / f"{name}.v")
+    print(f"[✓] Generated {shape} circuit '{name}': {len(circuit.gates)} gates, "
+          f"{sum(len(_bits(n, w)) for n, w in circuit.inputs)} inputs, "
+          f"{sum(len(_bits(n, w)) for n, w in circuit.outputs)} outputs")
+    for path in written.values():
+        print(f"    {path}")
+    return written
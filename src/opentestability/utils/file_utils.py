@@ -23,6 +23,7 @@ def get_project_paths():
         'graphs': root / 'data' / 'graphs',
         'dag_output': root / 'data' / 'dag_output',
         'reconvergence_output': root / 'data' / 'reconvergence_output',
+        'cache': root / 'data' / 'cache',
         'src': root / 'src',
         'examples': root / 'examples'
     }
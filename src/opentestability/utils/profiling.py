@@ -0,0 +1,199 @@
+"""
+Profiling and hot-path instrumentation.
+
+Pipeline stages open named spans and hot loops report counters:
+
+    with profiling.span('scoap.controllability'):
+        ...
+    profiling.add('simple.paths', len(paths))
+
+Nothing is recorded until start() installs a process-wide Profiler
+(`opentest --profile`); until then span() returns a shared no-op context
+manager and add() returns after one global check, so the hooks cost next
+to nothing. Hot loops count locally and report once per call rather than
+once per iteration.
+
+An active profiler records per-span wall and CPU time and, with memory
+tracking, the tracemalloc high-water mark inside each span (peak traced
+memory above the level at which the span started). Its trace can be written
+as Chrome trace-event JSON (chrome://tracing, Perfetto): spans become
+complete ("X") events and counters become counter ("C") events.
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+_profiler = None
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Profiler:
+    """
+    Collector of spans and counters.
+
+    Args:
+        memory: Track the tracemalloc peak of every span (slows down
+                allocation-heavy code noticeably)
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.events = []
+        self.counters = defaultdict(int)
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        if memory:
+            # tracemalloc pulls in fnmatch/re/linecache; only load it when used
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """Record the wall time, CPU time and memory peak of a block."""
+        stack = self._stack()
+        frame = {'carry': 0, 'base': 0}
+        tracemalloc = self._tracemalloc if self.memory else None
+        if self.memory:
+            frame['base'], peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['carry'] = max(stack[-1]['carry'], peak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        stack.append(frame)
+        start_us, cpu = self._now_us(), time.thread_time()
+        try:
+            yield
+        finally:
+            duration = self._now_us() - start_us
+            args = dict(args, cpu_ms=round((time.thread_time() - cpu) * 1000, 3))
+            stack.pop()
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(frame['carry'], peak)
+                if stack:
+                    stack[-1]['carry'] = max(stack[-1]['carry'], peak)
+                args['peak_kb'] = round((peak - frame['base']) / 1024, 1)
+            event = {'name': name, 'cat': name.split('.')[0], 'ph': 'X',
+                     'ts': round(start_us, 1), 'dur': round(duration, 1),
+                     'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args}
+            with self._lock:
+                self.events.append(event)
+
+    def add(self, counter, n=1):
+        """Add n to a counter."""
+        with self._lock:
+            self.counters[counter] += n
+            self.events.append({'name': counter, 'cat': 'counter', 'ph': 'C',
+                                'ts': round(self._now_us(), 1), 'pid': os.getpid(),
+                                'args': {'value': self.counters[counter]}})
+
+    def close(self):
+        """Stop memory tracking started by this profiler."""
+        if self._started_tracemalloc:
+            self._tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def summary(self):
+        """
+        Aggregate spans by name.
+
+        Returns:
+            Tuple of (spans, counters): spans maps a name to calls, wall_ms,
+            cpu_ms and peak_kb (the largest peak of any call, if tracked)
+        """
+        spans = {}
+        for e in self.events:
+            if e['ph'] != 'X':
+                continue
+            s = spans.setdefault(e['name'], {'calls': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0})
+            s['calls'] += 1
+            s['wall_ms'] += e['dur'] / 1000
+            s['cpu_ms'] += e['args']['cpu_ms']
+            if 'peak_kb' in e['args']:
+                s['peak_kb'] = max(s.get('peak_kb', 0), e['args']['peak_kb'])
+        return spans, dict(self.counters)
+
+    def format_summary(self):
+        """Span and counter tables for terminal output."""
+        spans, counters = self.summary()
+        width = max([len(n) for n in list(spans) + list(counters)] + [4])
+        lines = [f"{'span':<{width}}  {'calls':>6}  {'wall ms':>10}  {'cpu ms':>10}  {'peak KB':>10}"]
+        for name, s in sorted(spans.items(), key=lambda kv: -kv[1]['wall_ms']):
+            peak = f"{s['peak_kb']:.1f}" if 'peak_kb' in s else '-'
+            lines.append(f"{name:<{width}}  {s['calls']:>6}  {s['wall_ms']:>10.2f}  "
+                         f"{s['cpu_ms']:>10.2f}  {peak:>10}")
+        if counters:
+            lines.append("")
+            lines.append(f"{'counter':<{width}}  {'value':>10}")
+            for name, value in sorted(counters.items()):
+                lines.append(f"{name:<{width}}  {value:>10}")
+        return "\n".join(lines)
+
+    def trace(self):
+        """The recording as a Chrome trace-event JSON object."""
+        meta = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                 'args': {'name': 'opentest'}}]
+        return {'traceEvents': meta + self.events, 'displayTimeUnit': 'ms',
+                'otherData': {'python': sys.version.split()[0], 'counters': dict(self.counters),
+                              'memory': self.memory}}
+
+    def write_trace(self, path):
+        """Write the Chrome trace-event JSON file."""
+        import json
+
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
+        return str(path)
+
+
+def start(memory=True):
+    """Install a process-wide profiler; returns it."""
+    global _profiler
+    _profiler = Profiler(memory)
+    return _profiler
+
+
+def stop():
+    """Remove the process-wide profiler; returns it (None if none was active)."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.close()
+    return profiler
+
+
+def enabled():
+    """True while a profiler is installed."""
+    return _profiler is not None
+
+
+def span(name, **args):
+    """Context manager timing a block under `name`; a no-op when profiling is off."""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _profiler.span(name, **args)
+
+
+def add(counter, n=1):
+    """Add n to a counter; a no-op when profiling is off."""
+    if _profiler is not None:
+        _profiler.add(counter, n)
@@ -5,10 +5,17 @@ This module provides:
 - DAG visualization
 - Graph rendering with Graphviz
 - Result plotting capabilities
-"""
 
-from .graph_renderer import visualize_gate_graph
+graph_renderer (pygraphviz) is imported on first access.
+"""
 
 __all__ = [
     'visualize_gate_graph'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name == 'visualize_gate_graph':
+        from .graph_renderer import visualize_gate_graph
+        return visualize_gate_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")